@@ -0,0 +1,134 @@
+"""
+Micro-benchmark of path searches on the pathfinding matrices of the farm and
+the town, comparing the in-tree PathFinder with the AStarFinder of the
+pathfinding package that was used before. Searches either go between two
+random tiles of the map, or to a tile at most 5 tiles away from the start,
+like the ones of pf_wander.
+
+The matrices are taken from the actual maps, so the game is started
+(without a visible window) to create them.
+
+Run from the repository root with:
+    python -m benchmarks.astar
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from pathfinding.core.diagonal_movement import DiagonalMovement as LegacyDiagonal
+from pathfinding.core.grid import Grid
+from pathfinding.finder.a_star import AStarFinder
+
+from src.enums import Map
+from src.npc.pathfinding import DiagonalMovement, PathFinder, PathfindingGrid
+from src.npc.setup import AIData
+
+MAPS = (Map.NEW_FARM, Map.TOWN)
+DIAGONAL_MODES = (
+    (DiagonalMovement.NEVER, LegacyDiagonal.never),
+    (DiagonalMovement.ONLY_WHEN_NO_OBSTACLE, LegacyDiagonal.only_when_no_obstacle),
+)
+# name and maximum distance between start and end tile of each kind of search
+QUERY_KINDS = (("random", None), ("wander", 5))
+
+
+def load_matrices() -> dict[Map, list[list[int]]]:
+    # resource paths are resolved relative to the script that has been started
+    sys.argv[0] = os.path.join(os.getcwd(), "main.py")
+    import main
+
+    game = main.Game()
+    matrices = {}
+    for game_map in MAPS:
+        game.level.switch_to_map(game_map)
+        matrices[game_map] = [row.copy() for row in AIData.Matrix]
+    return matrices
+
+
+def random_queries(
+    matrix: list[list[int]], count: int, seed: int, radius: int | None = None
+) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    rng = random.Random(seed)
+    walkable = [
+        (x, y) for y, row in enumerate(matrix) for x, value in enumerate(row) if value
+    ]
+    walkable_set = set(walkable)
+    queries = []
+    while len(queries) < count:
+        start = rng.choice(walkable)
+        if radius is None:
+            end = rng.choice(walkable)
+        else:
+            end = (
+                start[0] + rng.randint(-radius, radius),
+                start[1] + rng.randint(-radius, radius),
+            )
+            if end not in walkable_set:
+                continue
+        queries.append((start, end))
+    return queries
+
+
+def measure_legacy(matrix, queries, diagonal) -> tuple[float, list]:
+    grid = Grid(matrix=matrix)
+    finder = AStarFinder(diagonal_movement=diagonal)
+    paths = []
+    start_time = time.perf_counter()
+    for start, end in queries:
+        # the Grid has to be reset before every search
+        grid.cleanup()
+        path, _ = finder.find_path(grid.node(*start), grid.node(*end), grid)
+        paths.append(path)
+    elapsed = time.perf_counter() - start_time
+    return elapsed, [[(node.x, node.y) for node in path] for path in paths]
+
+
+def measure(matrix, queries, diagonal) -> tuple[float, list]:
+    grid = PathfindingGrid(matrix)
+    finder = PathFinder(diagonal)
+    paths = []
+    start_time = time.perf_counter()
+    for start, end in queries:
+        paths.append(finder.find_path(start, end, grid))
+    return time.perf_counter() - start_time, paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    matrices = load_matrices()
+
+    print(
+        f"{'map':>10} {'search':>7} {'diagonal':>22} {'package (ms)':>13} "
+        f"{'in-tree (ms)':>13} {'speedup':>8}"
+    )
+    for game_map, matrix in matrices.items():
+        for kind, radius in QUERY_KINDS:
+            queries = random_queries(matrix, args.queries, args.seed, radius)
+            for diagonal, legacy_diagonal in DIAGONAL_MODES:
+                legacy, legacy_paths = measure_legacy(matrix, queries, legacy_diagonal)
+                current, paths = measure(matrix, queries, diagonal)
+                if paths != legacy_paths:
+                    raise AssertionError(
+                        f"Paths differ on {game_map} ({kind}, {diagonal.name})"
+                    )
+                legacy_ms = legacy / len(queries) * 1000
+                current_ms = current / len(queries) * 1000
+                print(
+                    f"{game_map:>10} {kind:>7} {diagonal.name:>22} "
+                    f"{legacy_ms:>13.3f} {current_ms:>13.3f} "
+                    f"{legacy / current:>7.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
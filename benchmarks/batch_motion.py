@@ -0,0 +1,121 @@
+"""
+Per-frame cost of moving a growing number of AI-controlled Entities along
+their paths, comparing AIBehaviour.update_moving with a BatchMotion.
+
+Run from the repository root with:
+    python -m benchmarks.batch_motion
+"""
+
+import argparse
+import random
+import time
+
+import pygame
+
+from src.groups import CollisionSpriteGroup
+from src.npc.bases.ai_behaviour import AIBehaviour
+from src.npc.bases.ai_behaviour_base import AIState
+from src.npc.batch_motion import BatchMotion
+from src.settings import SCALED_TILE_SIZE
+from src.sprites.base import Sprite
+
+ENTITY_COUNTS = (10, 100, 1000)
+# size of the map (in tiles), similar to farm_new
+MAP_SIZE = (80, 40)
+# number of waypoints of each path, enough to never complete it while measuring
+PATH_LENGTH = 200
+
+
+class BenchEntity(AIBehaviour):
+    """AI-controlled Entity that only has what moving along a path needs."""
+
+    def __init__(self, pos: tuple[int, int], collision_sprites: pygame.sprite.Group):
+        Sprite.__init__(self, pos, pygame.Surface((48, 48)))
+        AIBehaviour.__init__(self, None)
+        self._current_hitbox = pygame.FRect(4, 20, 40, 24)
+        self.hitbox_rect = self._current_hitbox.move(pos)
+        self.last_hitbox_rect = self.hitbox_rect.copy()
+        self.collision_sprites = collision_sprites
+        self.is_colliding = False
+        self.direction = pygame.Vector2()
+        self.speed = 150
+
+    def animate(self, dt: float):
+        pass
+
+
+def random_path(rng: random.Random, start: tuple[int, int]):
+    """:return: Path of random steps to neighbouring tiles"""
+    width, height = MAP_SIZE
+    x, y = start
+    path = []
+    while len(path) < PATH_LENGTH:
+        dx, dy = rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1)))
+        if 0 < x + dx < width - 1 and 0 < y + dy < height - 1:
+            x, y = x + dx, y + dy
+            path.append((x + 0.5, y + 0.5))
+    return path
+
+
+def populate(entity_count: int, seed: int) -> list[BenchEntity]:
+    rng = random.Random(seed)
+    width, height = MAP_SIZE
+    # no obstacles, so that no Entity ever aborts its path
+    collision_sprites = CollisionSpriteGroup()
+
+    entities = []
+    for _ in range(entity_count):
+        tile = (rng.randrange(1, width - 1), rng.randrange(1, height - 1))
+        entity = BenchEntity((0, 0), collision_sprites)
+        entity.hitbox_rect.center = (
+            (tile[0] + 0.5) * SCALED_TILE_SIZE,
+            (tile[1] + 0.5) * SCALED_TILE_SIZE,
+        )
+        entity.rect.topleft = entity.hitbox_rect.move(
+            -entity._current_hitbox.x, -entity._current_hitbox.y
+        ).topleft
+        entity.pf_path = random_path(rng, tile)
+        entity.pf_state = AIState.MOVING
+        entities.append(entity)
+    return entities
+
+
+def measure(
+    motion: BatchMotion | None, entity_count: int, frames: int, seed: int
+) -> tuple[float, list[tuple[float, float]]]:
+    """
+    :return: Average movement cost per frame (in milliseconds) and the final
+             positions of all Entities
+    """
+    entities = populate(entity_count, seed)
+    BenchEntity.pf_motion = motion
+
+    total = 0.0
+    for _ in range(frames):
+        start = time.perf_counter()
+        for entity in entities:
+            entity.move(1 / 60)
+        if motion is not None:
+            motion.update()
+        total += time.perf_counter() - start
+
+    BenchEntity.pf_motion = None
+    return total / frames * 1000, [entity.hitbox_rect.center for entity in entities]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'entities':>8} {'single (ms)':>12} {'batch (ms)':>11} {'speedup':>8}")
+    for count in ENTITY_COUNTS:
+        single, expected = measure(None, count, args.frames, args.seed)
+        batch, positions = measure(BatchMotion(), count, args.frames, args.seed)
+        assert positions == expected, "BatchMotion moved the Entities differently"
+        print(f"{count:>8} {single:>12.3f} {batch:>11.3f} {single / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Per-frame cost of Entity.check_collision for a growing number of moving
+entities, comparing the spatial hash broad phase of CollisionSpriteGroup
+with checking every Sprite of a plain group.
+
+Run from the repository root with:
+    python -m benchmarks.collision
+"""
+
+import argparse
+import random
+import time
+
+import pygame
+
+from src.groups import CollisionSpriteGroup, PersistentSpriteGroup
+from src.settings import SCALED_TILE_SIZE
+from src.sprites.base import Sprite
+from src.sprites.entities.entity import Entity
+
+ENTITY_COUNTS = (50, 100, 200, 400)
+# size of the map (in tiles), similar to farm_new
+MAP_SIZE = (80, 40)
+# number of trees, bushes and other collision rects on the map
+OBSTACLE_COUNT = 600
+
+
+class BenchEntity(Entity):
+    """Entity that only has what check_collision needs."""
+
+    def __init__(self, pos: tuple[int, int], collision_sprites: pygame.sprite.Group):
+        Sprite.__init__(self, pos, pygame.Surface((48, 48)), (collision_sprites,))
+        self.hitbox_rect = pygame.FRect(pos, (40, 24))
+        self.last_hitbox_rect = self.hitbox_rect.copy()
+        self.collision_sprites = collision_sprites
+        self.direction = pygame.Vector2(1, 0)
+
+    def move(self, dt: float):
+        self.last_hitbox_rect.update(self.hitbox_rect)
+        self.hitbox_rect.topleft += self.direction * 100 * dt
+        self.check_collision()
+
+    def animate(self, dt: float):
+        pass
+
+
+def populate(group: pygame.sprite.Group, entity_count: int, seed: int):
+    rng = random.Random(seed)
+    width, height = MAP_SIZE
+    surf = pygame.Surface((SCALED_TILE_SIZE, SCALED_TILE_SIZE))
+
+    # border tiles around the whole map
+    for x in range(width):
+        for y in (0, height - 1):
+            Sprite((x * SCALED_TILE_SIZE, y * SCALED_TILE_SIZE), surf, (group,))
+    for y in range(1, height - 1):
+        for x in (0, width - 1):
+            Sprite((x * SCALED_TILE_SIZE, y * SCALED_TILE_SIZE), surf, (group,))
+
+    for _ in range(OBSTACLE_COUNT):
+        pos = (
+            rng.randrange(2, width - 2) * SCALED_TILE_SIZE,
+            rng.randrange(2, height - 2) * SCALED_TILE_SIZE,
+        )
+        Sprite(pos, surf, (group,))
+
+    entities = []
+    for _ in range(entity_count):
+        pos = (
+            rng.randrange(SCALED_TILE_SIZE, (width - 2) * SCALED_TILE_SIZE),
+            rng.randrange(SCALED_TILE_SIZE, (height - 2) * SCALED_TILE_SIZE),
+        )
+        entity = BenchEntity(pos, group)
+        entity.direction.rotate_ip(rng.uniform(0, 360))
+        entities.append(entity)
+    return entities
+
+
+def measure(group_type: type, entity_count: int, frames: int, seed: int) -> float:
+    """:return: Average collision cost per frame (in milliseconds)"""
+    group = group_type()
+    entities = populate(group, entity_count, seed)
+
+    total = 0.0
+    for _ in range(frames):
+        start = time.perf_counter()
+        if isinstance(group, CollisionSpriteGroup):
+            group.update_moving_sprites()
+        for entity in entities:
+            entity.move(1 / 60)
+        total += time.perf_counter() - start
+    return total / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'entities':>8} {'all (ms)':>10} {'hash (ms)':>10} {'speedup':>8}")
+    for count in ENTITY_COUNTS:
+        legacy = measure(PersistentSpriteGroup, count, args.frames, args.seed)
+        hashed = measure(CollisionSpriteGroup, count, args.frames, args.seed)
+        print(f"{count:>8} {legacy:>10.2f} {hashed:>10.2f} {legacy / hashed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Cost of a single flee decision, i.e. creating the sorted flight vectors
+around a position to flee from, comparing the NumPy implementation of
+get_sorted_flight_vectors with the pure Python one it replaced. The NumPy
+version is measured both with an empty cache and once every position to flee
+from has been seen before.
+
+Run from the repository root with:
+    python -m benchmarks.flight_matrix
+"""
+
+import argparse
+import math
+import random
+import time
+from collections.abc import Callable, Generator
+
+from src.support import (
+    WeightedCoordinate,
+    _get_flight_field,
+    distance,
+    get_sorted_flight_vectors,
+)
+
+RADIUS = 5
+# Cows and chickens flee from the Player once it is this close (in tiles),
+# so positions to flee from are drawn from this range
+THREAT_RANGE = 8
+# number of flight vectors looked at per decision, like Cow.flee_from_pos
+# does when the first few targets are not walkable
+VECTORS_PER_DECISION = 4
+
+
+def legacy_flight_matrix(
+    pos: tuple[int, int], radius: int
+) -> list[list[WeightedCoordinate]]:
+    """get_flight_matrix, as it was before using NumPy."""
+    diameter = radius * 2 + 1
+
+    p1 = (radius, radius)
+    p2 = (pos[0] + radius, pos[1] + radius)
+
+    matrix = [
+        [WeightedCoordinate(x, y) for x in range(diameter)] for y in range(diameter)
+    ]
+
+    dangerous_angle = math.atan2((p1[0] - p2[0]), (p1[1] - p2[1]))
+
+    for y in range(len(matrix)):
+        for x in range(len(matrix[0])):
+            current_angle = math.atan2((p1[0] - x), (p1[1] - y))
+            distance_ = dangerous_angle - current_angle
+
+            if distance_ > math.pi:
+                distance_ = distance_ - (math.pi * 2)
+            elif distance_ < -math.pi:
+                distance_ = distance_ + (math.pi * 2)
+
+            matrix[y][x].weight = distance(p2, (x, y))
+            matrix[y][x].weight *= abs(distance_ / math.pi)
+
+    matrix[radius][radius].weight = float("inf")
+
+    return matrix
+
+
+def legacy_sorted_flight_vectors(
+    pos: tuple[int, int], radius: int
+) -> Generator[WeightedCoordinate, None, None]:
+    """get_sorted_flight_vectors, as it was before using NumPy."""
+    flight_matrix = legacy_flight_matrix(pos, radius)
+
+    x = []
+    for row in flight_matrix:
+        for col in row:
+            x.append(col)
+
+    for coord in sorted(x, key=lambda i: i.weight):
+        yield coord
+
+
+def measure(
+    get_vectors: Callable[[tuple[int, int], int], Generator],
+    positions: list[tuple[int, int]],
+    clear_cache: bool = False,
+) -> float:
+    """:return: Average time per flee decision (in microseconds)"""
+    start_time = time.perf_counter()
+    for pos in positions:
+        if clear_cache:
+            _get_flight_field.cache_clear()
+        vectors = get_vectors(pos, RADIUS)
+        for _ in range(VECTORS_PER_DECISION):
+            next(vectors)
+    return (time.perf_counter() - start_time) / len(positions) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--decisions", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    positions = [
+        (
+            rng.randint(-THREAT_RANGE, THREAT_RANGE),
+            rng.randint(-THREAT_RANGE, THREAT_RANGE),
+        )
+        for _ in range(args.decisions)
+    ]
+
+    legacy = measure(legacy_sorted_flight_vectors, positions)
+    cold = measure(get_sorted_flight_vectors, positions, clear_cache=True)
+    # fill the cache with every position first
+    measure(get_sorted_flight_vectors, positions)
+    cached = measure(get_sorted_flight_vectors, positions)
+
+    print(f"{'implementation':>16} {'us/decision':>12} {'speedup':>8}")
+    for name, elapsed in (
+        ("pure Python", legacy),
+        ("NumPy (cold)", cold),
+        ("NumPy (cached)", cached),
+    ):
+        print(f"{name:>16} {elapsed:>12.1f} {legacy / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
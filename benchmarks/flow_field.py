@@ -0,0 +1,108 @@
+"""
+Cost of letting a growing number of cows flee from the Player on the
+pathfinding matrix of the farm, comparing searching a flight path per cow
+(like Cow.flee_from_pos) with following a shared FleeField (like Cow.flee_along).
+
+Each round, the Player enters a new tile and all cows around it decide where
+to flee to.
+
+Run from the repository root with:
+    python -m benchmarks.flow_field
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.astar import load_matrices
+from src.enums import Map
+from src.npc.flow_field import FleeField
+from src.npc.pathfinding import DiagonalMovement, PathFinder, PathfindingGrid
+from src.settings import COW_FLEE_FIELD_RADIUS
+from src.support import get_sorted_flight_vectors
+
+COW_COUNTS = (10, 100, 500)
+# cows are placed at most this far away from the Player (in tiles)
+COW_DISTANCE = 3
+FLIGHT_RADIUS = 5
+
+
+def flee_with_searches(
+    finder: PathFinder,
+    grid: PathfindingGrid,
+    player: tuple[int, int],
+    cows: list[tuple[int, int]],
+):
+    for x, y in cows:
+        # same as Cow.flee_from_pos
+        for coordinate in get_sorted_flight_vectors(
+            (x - player[0], y - player[1]), FLIGHT_RADIUS
+        ):
+            target = (
+                x + coordinate.x - FLIGHT_RADIUS,
+                y + coordinate.y - FLIGHT_RADIUS,
+            )
+            if grid.walkable(*target) and finder.find_path((x, y), target, grid):
+                break
+
+
+def flee_with_field(
+    field: FleeField, player: tuple[int, int], cows: list[tuple[int, int]]
+):
+    field.set_goals((player,))
+    for cow in cows:
+        field.path(cow, FLIGHT_RADIUS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    grid = PathfindingGrid(load_matrices()[Map.NEW_FARM])
+    rng = random.Random(args.seed)
+    walkable = [
+        (x, y)
+        for y in range(grid.height)
+        for x in range(grid.width)
+        if grid.walkable(x, y)
+    ]
+
+    print(f"{'cows':>5} {'searches (ms)':>14} {'flow field (ms)':>16} {'speedup':>8}")
+    for count in COW_COUNTS:
+        rounds = []
+        for _ in range(args.rounds):
+            player = rng.choice(walkable)
+            cows = []
+            while len(cows) < count:
+                cow = (
+                    player[0] + rng.randint(-COW_DISTANCE, COW_DISTANCE),
+                    player[1] + rng.randint(-COW_DISTANCE, COW_DISTANCE),
+                )
+                if cow != player and grid.walkable(*cow):
+                    cows.append(cow)
+            rounds.append((player, cows))
+
+        finder = PathFinder(DiagonalMovement.ONLY_WHEN_NO_OBSTACLE)
+        start_time = time.perf_counter()
+        for player, cows in rounds:
+            flee_with_searches(finder, grid, player, cows)
+        searches = (time.perf_counter() - start_time) / args.rounds * 1000
+
+        field = FleeField(
+            grid, DiagonalMovement.ONLY_WHEN_NO_OBSTACLE, radius=COW_FLEE_FIELD_RADIUS
+        )
+        start_time = time.perf_counter()
+        for player, cows in rounds:
+            flee_with_field(field, player, cows)
+        flow_field = (time.perf_counter() - start_time) / args.rounds * 1000
+
+        print(
+            f"{count:>5} {searches:>14.2f} {flow_field:>16.2f} "
+            f"{searches / flow_field:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
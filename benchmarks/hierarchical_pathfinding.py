@@ -0,0 +1,110 @@
+"""
+Micro-benchmark of long path searches on the pathfinding matrices of the farm
+and the town, comparing direct searches of the PathFinder with hierarchical
+searches of the HierarchicalPathFinder. Also reports how long building the
+ClusterGraph of a map takes, and how long rebuilding it takes after a single
+tile has changed.
+
+Run from the repository root with:
+    python -m benchmarks.hierarchical_pathfinding
+"""
+
+import argparse
+import math
+import random
+import time
+
+from benchmarks.astar import MAPS, load_matrices
+from src.npc.hierarchical_pathfinding import HierarchicalPathFinder
+from src.npc.pathfinding import DiagonalMovement, PathFinder, PathfindingGrid
+from src.settings import (
+    HIERARCHICAL_PATHFINDING_MIN_DISTANCE,
+    PATHFINDING_CLUSTER_SIZE,
+)
+
+
+def long_queries(
+    grid: PathfindingGrid, count: int, seed: int
+) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    """:return: Random pairs of connected tiles that are far apart"""
+    rng = random.Random(seed)
+    walkable = [
+        (x, y)
+        for y in range(grid.height)
+        for x in range(grid.width)
+        if grid.walkable(x, y)
+    ]
+    queries = []
+    while len(queries) < count:
+        start, end = rng.choice(walkable), rng.choice(walkable)
+        distance = abs(start[0] - end[0]) + abs(start[1] - end[1])
+        if distance >= HIERARCHICAL_PATHFINDING_MIN_DISTANCE and grid.connected(
+            start, end
+        ):
+            queries.append((start, end))
+    return queries
+
+
+def path_cost(path: list[tuple[int, int]]) -> float:
+    return sum(math.dist(path[i], path[i + 1]) for i in range(len(path) - 1))
+
+
+def measure(finder: PathFinder, grid, queries) -> tuple[float, list]:
+    paths = []
+    start_time = time.perf_counter()
+    for start, end in queries:
+        paths.append(finder.find_path(start, end, grid))
+    return time.perf_counter() - start_time, paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    matrices = load_matrices()
+
+    print(
+        f"{'map':>10} {'diagonal':>22} {'direct (ms)':>12} {'HPA* (ms)':>10} "
+        f"{'speedup':>8} {'cost':>7} {'build (ms)':>11} {'rebuild (ms)':>13}"
+    )
+    for game_map in MAPS:
+        grid = PathfindingGrid(matrices[game_map])
+        queries = long_queries(grid, args.queries, args.seed)
+        for diagonal in DiagonalMovement:
+            finder = HierarchicalPathFinder(
+                diagonal,
+                cluster_size=PATHFINDING_CLUSTER_SIZE,
+                min_distance=HIERARCHICAL_PATHFINDING_MIN_DISTANCE,
+            )
+            start_time = time.perf_counter()
+            graph = finder.prepare(grid)
+            build = time.perf_counter() - start_time
+
+            direct, direct_paths = measure(PathFinder(diagonal), grid, queries)
+            hierarchical, paths = measure(finder, grid, queries)
+            # how much longer hierarchical paths are on average
+            cost = sum(map(path_cost, paths)) / sum(map(path_cost, direct_paths))
+
+            # toggle a tile in the middle of the map, and rebuild its cluster
+            x, y = grid.width // 2, grid.height // 2
+            walkable = grid.walkable(x, y)
+            grid.set_walkable(x, y, not walkable)
+            start_time = time.perf_counter()
+            graph.refresh()
+            rebuild = time.perf_counter() - start_time
+            grid.set_walkable(x, y, walkable)
+            graph.refresh()
+
+            direct_ms = direct / len(queries) * 1000
+            hierarchical_ms = hierarchical / len(queries) * 1000
+            print(
+                f"{game_map:>10} {diagonal.name:>22} {direct_ms:>12.3f} "
+                f"{hierarchical_ms:>10.3f} {direct / hierarchical:>7.1f}x "
+                f"{cost:>6.3f}x {build * 1000:>11.1f} {rebuild * 1000:>13.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Frame-time benchmark of AllSprites.draw, comparing the render queue with the
+previous implementation, which sorted all Sprites every frame and then went
+through all of them once per layer.
+
+Run from the repository root with:
+    python -m benchmarks.render_queue
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.camera import Camera
+from src.enums import Layer
+from src.groups import AllSprites
+from src.settings import SCALED_TILE_SIZE, SCREEN_HEIGHT, SCREEN_WIDTH
+from src.sprites.base import Sprite
+
+SPRITE_COUNTS = (1_000, 10_000, 50_000)
+# Layers the stationary Sprites are spread over, similar to a loaded map
+STATIC_LAYERS = (Layer.GROUND, Layer.GROUND_OBJECTS, Layer.MAIN, Layer.BORDER)
+# Share of all Sprites that move around every frame
+DYNAMIC_RATIO = 0.02
+
+
+class MovingSprite(Sprite):
+    stationary = False
+
+    def move(self, rng: random.Random, world: pygame.Rect):
+        self.rect.move_ip(rng.randint(-4, 4), rng.randint(-4, 4))
+        self.rect.clamp_ip(world)
+        self.hitbox_rect.center = self.rect.center
+
+
+class LegacyAllSprites(pygame.sprite.Group):
+    """AllSprites.draw as it was before the render queue was introduced."""
+
+    def __init__(self, *sprites):
+        super().__init__(*sprites)
+        self.display_surface = pygame.display.get_surface()
+
+    def index_stationary_sprites(self):
+        pass
+
+    def draw(self, camera: Camera):
+        sorted_sprites = sorted(self.sprites(), key=lambda spr: spr.hitbox_rect.bottom)
+
+        for layer in Layer:
+            for sprite in sorted_sprites:
+                if sprite.z == layer:
+                    sprite.draw(self.display_surface, camera.apply(sprite), camera)
+
+
+def populate(group: pygame.sprite.Group, count: int, seed: int):
+    rng = random.Random(seed)
+    # three Sprites per tile, like the ground, decoration and object layers
+    side = max(int((count / 3) ** 0.5), SCREEN_WIDTH // SCALED_TILE_SIZE + 1)
+    world = pygame.Rect(0, 0, side * SCALED_TILE_SIZE, side * SCALED_TILE_SIZE)
+    surf = pygame.Surface((SCALED_TILE_SIZE, SCALED_TILE_SIZE))
+
+    moving = []
+    for _ in range(count):
+        pos = (
+            rng.randrange(side) * SCALED_TILE_SIZE,
+            rng.randrange(side) * SCALED_TILE_SIZE,
+        )
+        if rng.random() < DYNAMIC_RATIO:
+            moving.append(MovingSprite(pos, surf, (group,), Layer.MAIN))
+        else:
+            Sprite(pos, surf, (group,), rng.choice(STATIC_LAYERS))
+    group.index_stationary_sprites()
+    return world, moving
+
+
+def measure(group_type: type, count: int, frames: int, seed: int) -> float:
+    """:return: Average time per frame (in milliseconds)"""
+    group = group_type()
+    world, moving = populate(group, count, seed)
+    camera = Camera(world.width, world.height)
+    rng = random.Random(seed)
+    target = moving[0] if moving else next(iter(group))
+
+    total = 0.0
+    for _ in range(frames):
+        for sprite in moving:
+            sprite.move(rng, world)
+        camera.update(target)
+
+        start = time.perf_counter()
+        group.draw(camera)
+        total += time.perf_counter() - start
+    return total / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    print(f"{'sprites':>8} {'legacy (ms)':>12} {'queue (ms)':>12} {'speedup':>8}")
+    for count in SPRITE_COUNTS:
+        legacy = measure(LegacyAllSprites, count, args.frames, args.seed)
+        queue = measure(AllSprites, count, args.frames, args.seed)
+        print(f"{count:>8} {legacy:>12.2f} {queue:>12.2f} {legacy / queue:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Day transition time of a fully planted and watered farm of growing size,
+which should grow linearly with the number of tiles.
+
+Run from the repository root with:
+    python -m benchmarks.soil_rollover
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.enums import FarmingTool
+from src.groups import AllSprites
+from src.overlay.soil import SoilArea
+from src.settings import SCREEN_HEIGHT, SCREEN_WIDTH
+
+# side lengths (in tiles) of the square farms
+FARM_SIZES = (16, 32, 64, 128)
+SOIL_TYPES = (
+    "o", "b", "l", "bl", "t", "tb", "tl", "tbr",
+    "r", "br", "lr", "lrb", "tr", "tbl", "lrt", "x",
+)  # fmt: skip
+
+
+class TileLayer:
+    def __init__(self, size: int):
+        self.size = size
+
+    def tiles(self):
+        for y in range(self.size):
+            for x in range(self.size):
+                yield x, y, None
+
+
+def create_farm(size: int) -> SoilArea:
+    surf = pygame.Surface((1, 1))
+    frames = {
+        "soil": dict.fromkeys(SOIL_TYPES, surf),
+        "soil water": {"0": surf},
+        "corn": [surf] * 4,
+        "tomato": [surf] * 4,
+    }
+    area = SoilArea(AllSprites(), frames)
+    area.create_soil_tiles(TileLayer(size))
+    for pos in area.positions(area.farmable):
+        area.hoe(pos)
+        area.plant(pos, FarmingTool.CORN_SEED, lambda resource, amount: True)
+        area.water(pos)
+    return area
+
+
+def measure(size: int, days: int) -> float:
+    """:return: Average time per day transition (in milliseconds)"""
+    area = create_farm(size)
+    total = 0.0
+    for _ in range(days):
+        start = time.perf_counter()
+        area.advance_day()
+        total += time.perf_counter() - start
+        area.water_all()
+    return total / days * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=3)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    print(f"{'tiles':>8} {'day (ms)':>10} {'per tile (us)':>14}")
+    for size in FARM_SIZES:
+        tiles = size * size
+        elapsed = measure(size, args.days)
+        print(f"{tiles:>8} {elapsed:>10.2f} {elapsed / tiles * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 # /// script
 # dependencies = [
+#  "numpy",
 #  "pygame-ce",
 #  "pytmx",
-#  "pathfinding",
 # ]
 # ///
 
@@ -18,6 +18,7 @@ from src.events import DIALOG_ADVANCE, DIALOG_SHOW, OPEN_INVENTORY
 from src.groups import AllSprites
 from src.gui.interface.dialog import DialogueManager
 from src.gui.setup import setup_gui
+from src.npc.setup import AIData
 from src.overlay.fast_forward import FastForward
 from src.savefile import SaveFile
 from src.screens.inventory import InventoryMenu, prepare_checkmark_for_buttons
@@ -31,14 +32,18 @@ from src.screens.shop import ShopMenu
 from src.screens.switch_to_outgroup_menu import OutgroupMenu
 from src.settings import (
     EMOTE_SIZE,
+    FRAME_RATE_CAP,
+    MAX_FRAME_TIME,
     RANDOM_SEED,
     SCREEN_HEIGHT,
     SCREEN_WIDTH,
+    UPDATE_DT,
     AniFrames,
     MapDict,
     SoundDict,
 )
 from src.sprites.setup import setup_entity_assets
+from src.timer import SimulatedClock, use_clock
 
 # set random seed. It has to be set first before any other random function is called.
 random.seed(RANDOM_SEED)
@@ -81,6 +86,10 @@ class Game:
         # main setup
         self.running = True
         self.clock = pygame.time.Clock()
+        # Timers and the in-game clock follow the fixed steps of the world
+        # instead of the real time, so that they keep in sync with it
+        self.world_clock = SimulatedClock(pygame.time.get_ticks())
+        use_clock(self.world_clock)
         self.load_assets()
 
         # level info
@@ -213,11 +222,13 @@ class Game:
 
         setup_gui()
 
-        # sounds
-        self.sounds = support.sound_importer("audio", default_volume=0.25)
+        self.load_sounds()
 
         self.font = support.import_font(30, "font/LycheeSoda.ttf")
 
+    def load_sounds(self):
+        self.sounds = support.sound_importer("audio", default_volume=0.25)
+
     def game_paused(self):
         return self.current_state != GameState.PLAY
 
@@ -243,6 +254,7 @@ class Game:
 
     def handle_event(self, event: pygame.event.Event) -> bool:
         if event.type == pygame.QUIT:
+            AIData.shutdown()
             pygame.quit()
             sys.exit()
         if event.type == OPEN_INVENTORY:
@@ -264,32 +276,56 @@ class Game:
             return True
         return False
 
+    def update_world(self, dt: float):
+        """
+        Advance the game world by one fixed step.
+
+        :param dt: Length of the step (in seconds)
+        """
+        self.world_clock.advance(dt)
+        level_dt = dt
+        if self.level.cutscene_animation.active:
+            if pygame.key.get_pressed()[pygame.K_RSHIFT]:
+                level_dt *= 5
+        # positions before the step are needed to interpolate drawn frames
+        self.level.all_sprites.begin_step()
+        self.level.update(level_dt, self.current_state == GameState.PLAY)
+
+        if not self.game_paused():
+            self.round_end_timer += dt
+            if self.round_end_timer > self.ROUND_END_TIME_IN_MINUTES * 60:
+                self.round_end_timer = 0
+                self.switch_state(GameState.ROUND_END)
+
     async def run(self):
         pygame.mouse.set_visible(False)
         mouse = pygame.image.load(support.resource_path("images/ui/Cursor.png"))
         is_first_frame = True
+        # time that has passed but has not been simulated yet. The first
+        # frame is only drawn after the world has been stepped once
+        accumulator = UPDATE_DT
         while self.running:
-            dt = self.clock.tick() / 1000
+            dt = self.clock.tick(FRAME_RATE_CAP) / 1000
 
             self.event_loop()
             if not self.game_paused() or is_first_frame:
-                if self.level.cutscene_animation.active:
-                    event = pygame.key.get_pressed()
-                    if event[pygame.K_RSHIFT]:
-                        self.level.update(dt * 5, self.current_state == GameState.PLAY)
-                    else:
-                        self.level.update(dt, self.current_state == GameState.PLAY)
-                else:
-                    self.level.update(dt, self.current_state == GameState.PLAY)
+                # The world is updated in fixed steps, so that it behaves the
+                # same at any frame rate. After very long frames, the game
+                # slows down instead of catching up on all the lost time.
+                accumulator += min(dt, MAX_FRAME_TIME)
+                while accumulator >= UPDATE_DT:
+                    accumulator -= UPDATE_DT
+                    self.update_world(UPDATE_DT)
+                # the drawn frame lies in between the last two steps
+                self.level.draw(
+                    dt,
+                    self.current_state == GameState.PLAY,
+                    accumulator / UPDATE_DT,
+                )
 
             if self.game_paused() and not is_first_frame:
                 self.display_surface.blit(self.previous_frame, (0, 0))
                 self.menus[self.current_state].update(dt)
-            else:
-                self.round_end_timer += dt
-                if self.round_end_timer > self.ROUND_END_TIME_IN_MINUTES * 60:
-                    self.round_end_timer = 0
-                    self.switch_state(GameState.ROUND_END)
 
             if self.level.cutscene_animation.active:
                 self.all_sprites.update_blocked(dt)
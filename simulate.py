@@ -0,0 +1,221 @@
+# /// script
+# dependencies = [
+#  "numpy",
+#  "pygame-ce",
+#  "pytmx",
+# ]
+# ///
+
+"""
+Headless simulation of the farming world, for running many in-game days of
+NPC farming as fast as possible.
+
+The Level is built as usual, but nothing is drawn and no sound is played.
+The world is stepped at a fixed dt, following a SimulatedClock instead of
+the real time, and every in-game midnight, the day is rolled over as if
+the player went to sleep. At the end, the state of all soil areas and the
+inventories of all NPCs are dumped as JSON.
+
+Usage: python simulate.py [--days DAYS] [--dt DT] [--seed SEED] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+# the dummy drivers have to be selected before pygame is initialised
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from main import Game  # noqa: E402
+from src.enums import StudyGroup  # noqa: E402
+from src.npc.behaviour.npc_behaviour_tree import NPCSharedContext  # noqa: E402
+from src.npc.setup import AIData  # noqa: E402
+from src.savefile import SaveFile  # noqa: E402
+from src.screens.level import Level  # noqa: E402
+from src.settings import SCREEN_HEIGHT, SCREEN_WIDTH  # noqa: E402
+from src.timer import SimulatedClock, use_clock  # noqa: E402
+
+# the time step should stay below 0.25s, as otherwise Characters can skip the
+# animation frame in which they apply their tool
+DEFAULT_DT = 0.2
+
+
+class SilentSound:
+    """Stand-in for a pygame.mixer.Sound that does nothing."""
+
+    def play(self, *args, **kwargs):
+        pass
+
+    def stop(self):
+        pass
+
+    def set_volume(self, value: float):
+        pass
+
+
+class HeadlessLevel(Level):
+    """
+    Level that skips everything that only affects what is heard or seen.
+    Level.draw is never called while simulating.
+    """
+
+    def activate_music(self):
+        pass
+
+    def update_rain(self):
+        # rain drops are purely cosmetic, the soil is watered via
+        # SoilManager.raining
+        pass
+
+
+class HeadlessGame(Game):
+    """
+    Game that only consists of a HeadlessLevel, stepped at a fixed dt.
+
+    Attributes:
+        dt: Simulated time (in seconds) per step
+        clock: Clock that all Timers and the in-game clock follow
+        level: Level that is simulated
+    """
+
+    dt: float
+    clock: SimulatedClock
+    level: Level
+
+    def __init__(self, dt: float = DEFAULT_DT, level_of_detail: bool = False):
+        # Game.__init__ is not called, as the menus, dialogues and the
+        # display caption are not needed without a window
+        pygame.init()
+        self.display_surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.dt = dt
+        self.clock = SimulatedClock(pygame.time.get_ticks())
+        use_clock(self.clock)
+
+        self.cosmetic_frames = {}
+        self.save_file = SaveFile.load()
+        self.load_assets()
+
+        self.round = 1
+        self.level = HeadlessLevel(
+            lambda state: None,
+            (lambda: self.round, self.set_round),
+            self.tmx_maps,
+            self.frames,
+            self.sounds,
+            self.save_file,
+            pygame.time.Clock(),
+        )
+        # without a window to look through, throttling off-screen Entities
+        # would only make the simulation less accurate. It can still be
+        # enabled, to check that it does not change how the farming goes. As
+        # off-screen Entities are then updated with the dt of AI_LOD_INTERVAL
+        # steps at once, dt should be reduced accordingly
+        if not level_of_detail:
+            self.level.all_sprites.level_of_detail = None
+        self.level.all_sprites.update_cosmetic = False
+        # paths found by worker processes arrive after a varying number of
+        # steps, which would make seeded runs irreproducible
+        AIData.shutdown()
+        # targets claimed by the NPCs of a previously simulated game would
+        # keep the NPCs of this one from walking to them
+        NPCSharedContext.targets.clear()
+        # skip the introductory camera tour
+        self.level.cutscene_animation.reset()
+        self.player = self.level.player
+
+    def load_sounds(self):
+        self.sounds = defaultdict(SilentSound)
+
+    def step(self):
+        """Advance the world by dt, rolling the day over at midnight."""
+        game_time = self.level.game_time
+        hour = game_time.game_hour
+        self.clock.advance(self.dt)
+        self.level.update(self.dt)
+        if game_time.game_hour < hour:
+            self.level.reset()
+
+    def run(self, days: int) -> float:
+        """
+        :param days: Number of in-game days to simulate
+        :return: Wall-clock time (in seconds) the simulation took
+        """
+        start = time.perf_counter()
+        last_day = self.level.current_day + days
+        while self.level.current_day < last_day:
+            self.step()
+        return time.perf_counter() - start
+
+    def dump_state(self) -> dict:
+        """:return: State of all soil areas and NPC inventories"""
+        soil = {}
+        for study_group in StudyGroup:
+            area = self.level.soil_manager.get_area(study_group)
+            if not area.farmable.any():
+                continue
+            soil[study_group.name] = {
+                "tiles": int(area.farmable.sum()),
+                "hoed": int(area.hoed.sum()),
+                "watered": int(area.watered.sum()),
+                "planted": {
+                    seed_type.as_plant_name(): count
+                    for seed_type, count in area.planted_types.items()
+                },
+                "plants": len(area.plants),
+                "harvestable": int(area.harvestable.sum()),
+            }
+
+        inventories = {}
+        for i, npc in enumerate(self.level.game_map.npcs):
+            inventories[f"{npc.study_group.name} {i}"] = {
+                resource.as_serialised_string(): amount
+                for resource, amount in npc.inventory.items()
+                if amount
+            }
+        return {"soil": soil, "inventories": inventories}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulate in-game days of NPC farming without a window."
+    )
+    parser.add_argument("--days", type=int, default=1, help="in-game days")
+    parser.add_argument(
+        "--dt", type=float, default=DEFAULT_DT, help="simulated seconds per step"
+    )
+    parser.add_argument("--seed", type=int, help="random seed")
+    parser.add_argument("--output", help="file to write the final state to")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    game = HeadlessGame(args.dt)
+    start_ticks = game.clock.ticks
+    wall_time = game.run(args.days)
+    simulated_time = (game.clock.ticks - start_ticks) / 1000
+
+    print(
+        f"Simulated {args.days} days ({simulated_time:.0f}s) in {wall_time:.1f}s: "
+        f"{args.days / wall_time:.3f} days/s, "
+        f"{simulated_time / wall_time:.0f}x real time",
+        file=sys.stderr,
+    )
+
+    state = json.dumps(game.dump_state(), indent=4)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(state)
+    else:
+        print(state)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ import pygame
 
 from src.exceptions import CameraWarning
 from src.gui.scene_animation import SceneAnimation
-from src.settings import SCREEN_HEIGHT, SCREEN_WIDTH
+from src.settings import SCALED_TILE_SIZE, SCREEN_HEIGHT, SCREEN_WIDTH
 from src.sprites.base import Sprite
 
 
@@ -34,6 +34,10 @@ class Camera:
         self._width, self._height = width, height
         self._quake_vec: pygame.Vector2 | None = None
         self.state = pygame.Rect(0, 0, width, height)
+        # offset before the last update, and the offset Sprites are drawn
+        # with, which lies in between when the drawn frame is interpolated
+        self._previous_offset = pygame.Vector2()
+        self._offset = pygame.Vector2()
 
     def change_size(self, width: int, height: int):
         if width <= 0:
@@ -52,17 +56,49 @@ class Camera:
         self.state.size = width, height
 
     def update(self, target: Sprite | SceneAnimation):
+        self._previous_offset.update(self.state.topleft)
         self.state.update(self._complex_camera(target.rect))
+        self._offset.update(self.state.topleft)
+
+    def interpolate(self, alpha: float):
+        """
+        Place the camera in between its positions before and after its last
+        update, to draw a frame that lies in between two fixed update steps.
+        Jumps further than a tile (e.g. when switching maps) are not
+        interpolated.
+
+        :param alpha: How far the frame lies between the two positions
+                      (0: previous position, 1: current position)
+        """
+        current = pygame.Vector2(self.state.topleft)
+        if self._previous_offset.distance_squared_to(current) > SCALED_TILE_SIZE**2:
+            self._offset.update(current)
+        else:
+            self._offset.update(self._previous_offset.lerp(current, alpha))
 
     def set_quake_vec(self, vec: pygame.Vector2 | None):
         self._quake_vec = vec
 
     def apply(self, target: Sprite):
-        ret = target.rect.move(self.state.topleft)
+        ret = target.rect.move(self._offset)
         if self._quake_vec is not None:
             ret.move_ip(self._quake_vec)
         return ret
 
+    def get_viewport(self, margin: int = 0) -> pygame.Rect:
+        """
+        :param margin: Distance (in pixels) by which the area is extended
+                       on every side
+        :return: The area of the map that is currently visible on screen
+                 (in world coordinates)
+        """
+        return pygame.Rect(
+            -self.state.x - margin,
+            -self.state.y - margin,
+            SCREEN_WIDTH + margin * 2,
+            SCREEN_HEIGHT + margin * 2,
+        )
+
     @property
     def size(self):
         return self._width, self._height
@@ -1,7 +1,14 @@
 import pygame
 
 from src.camera import Camera
-from src.enums import Layer
+from src.level_of_detail import LevelOfDetail, mark_on_screen
+from src.render_queue import RenderQueue
+from src.settings import SCALED_TILE_SIZE
+from src.spatial_hash import SpatialHash
+
+# Sprites are still drawn if they are at most this far outside the screen,
+# e.g. so that camera quakes or sprites larger than their rect don't pop in
+_CULLING_MARGIN = 2 * SCALED_TILE_SIZE
 
 
 class PersistentSpriteGroup(pygame.sprite.Group):
@@ -36,25 +43,222 @@ class PersistentSpriteGroup(pygame.sprite.Group):
         super().empty()
 
 
+class CollisionSpriteGroup(PersistentSpriteGroup):
+    """
+    PersistentSpriteGroup that stores the hitboxes of its Sprites in a spatial
+    hash of tile-sized cells, so that only the Sprites close to a hitbox
+    need to be checked when looking for collisions with it.
+
+    Stationary Sprites are registered once, the first time the group is
+    queried after they have been added. Sprites that move around are updated
+    through update_sprite whenever they have moved, and once per frame
+    through update_moving_sprites.
+
+    Attributes:
+        _index: Spatial hash of the hitboxes of all registered Sprites
+        _order: Insertion number of each Sprite, used to return nearby Sprites
+                in the same order the group would be iterated in
+        _pending: Sprites that have not been registered in the index yet
+        _moving: All registered Sprites that are not stationary
+    """
+
+    _index: SpatialHash[pygame.sprite.Sprite]
+    _order: dict[pygame.sprite.Sprite, int]
+    _pending: dict[pygame.sprite.Sprite, None]
+    _moving: dict[pygame.sprite.Sprite, None]
+
+    def __init__(self, *sprites):
+        self._index = SpatialHash(SCALED_TILE_SIZE)
+        self._order = {}
+        self._counter = 0
+        self._pending = {}
+        self._moving = {}
+
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._order[sprite] = self._counter
+        self._counter += 1
+        # hitboxes are usually not final while Sprites are being added to
+        # their groups, so they are only registered on the next query
+        self._pending[sprite] = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self._order.pop(sprite, None)
+        self._pending.pop(sprite, None)
+        self._moving.pop(sprite, None)
+        self._index.remove(sprite)
+
+    def _clear_index(self):
+        self._index.clear()
+        self._order.clear()
+        self._pending.clear()
+        self._moving.clear()
+
+    def empty(self):
+        self._clear_index()
+        super().empty()
+
+    def empty_persistent(self):
+        self._clear_index()
+        super().empty_persistent()
+
+    def _register_pending(self):
+        for sprite in self._pending:
+            self._index.insert(sprite, sprite.hitbox_rect)
+            if not getattr(sprite, "stationary", False):
+                self._moving[sprite] = None
+        self._pending.clear()
+
+    def update_sprite(self, sprite: pygame.sprite.Sprite):
+        """Update the cells of a registered Sprite after it has moved."""
+        if sprite in self._index:
+            self._index.update(sprite, sprite.hitbox_rect)
+
+    def update_moving_sprites(self):
+        """Update the cells of all registered Sprites that are not stationary."""
+        self._register_pending()
+        for sprite in self._moving:
+            self._index.update(sprite, sprite.hitbox_rect)
+
+    def get_nearby_sprites(
+        self, rect: pygame.Rect | pygame.FRect
+    ) -> list[pygame.sprite.Sprite]:
+        """
+        :return: All Sprites whose hitbox could collide with rect, in the
+                 order they have been added to the group
+        """
+        self._register_pending()
+        # hitboxes are pushed around while collisions are being resolved,
+        # so Sprites in the neighbouring cells are included as well
+        nearby = self._index.query(rect.inflate(SCALED_TILE_SIZE, SCALED_TILE_SIZE))
+        return sorted(nearby, key=self._order.__getitem__)
+
+
 # TODO : we could replace this with pygame.sprite.LayeredUpdates, as that
 #  is a subclass of pygame.sprite.Group that natively supports layers
 
 
 class AllSprites(PersistentSpriteGroup):
+    """
+    Sprite group responsible for drawing the current map.
+
+    All Sprites are kept in a RenderQueue, which stores them by layer and in
+    drawing order. Once a map has been loaded, index_stationary_sprites should
+    be called so that all stationary Sprites are frozen in place. When
+    drawing, only the stationary Sprites close to the camera's viewport are
+    then looked at, while all other Sprites are always drawn.
+
+    If a LevelOfDetail policy is set and a camera is passed to update,
+    Sprites far away from the camera's viewport are updated less often.
+    If update_cosmetic is False, Sprites whose updates only change how they
+    look are not updated at all.
+
+    When the game is updated in fixed steps, begin_step should be called
+    before each step. Frames that lie in between two steps can then be drawn
+    with all moving Sprites placed in between their positions before and
+    after the last step.
+    """
+
+    level_of_detail: LevelOfDetail | None
+    update_cosmetic: bool
+    _render_queue: RenderQueue
+    _previous_positions: dict[pygame.sprite.Sprite, tuple[float, float]]
+
     def __init__(self, *sprites):
+        self._render_queue = RenderQueue()
+        self.level_of_detail = None
+        self.update_cosmetic = True
+        self._previous_positions = {}
+
         super().__init__(*sprites)
         self.display_surface = pygame.display.get_surface()
         self.offset = pygame.Vector2()
         self.cam_surf = pygame.Surface(self.display_surface.get_size())
 
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._render_queue.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self._render_queue.remove(sprite)
+
+    def empty(self):
+        # clearing the queue at once is much faster than removing each Sprite
+        self._render_queue.clear()
+        super().empty()
+
+    def empty_persistent(self):
+        self._render_queue.clear()
+        super().empty_persistent()
+
+    def index_stationary_sprites(self):
+        """
+        Freeze all stationary Sprites currently in the group in the render
+        queue. Should be called once all Sprites of a map have been created.
+        Sprites added afterwards will not be frozen and will always be drawn.
+        """
+        self._render_queue.freeze_stationary()
+
+    def update_sprite(self, sprite: pygame.sprite.Sprite):
+        """Update the cells of a frozen Sprite after its rect has changed."""
+        self._render_queue.update_static(sprite)
+
+    def update(self, dt: float, camera: Camera | None = None):
+        sprites = self.sprites()
+        if not self.update_cosmetic:
+            sprites = [
+                sprite for sprite in sprites if not getattr(sprite, "cosmetic", False)
+            ]
+        if self.level_of_detail is None or camera is None:
+            for sprite in sprites:
+                mark_on_screen(sprite)
+                sprite.update(dt)
+            return
+        self.level_of_detail.update(sprites, dt, camera.get_viewport())
+
+    def reset_level_of_detail(self):
+        """
+        Treat all Sprites as on screen again and drop the time pending for
+        them. Should be called when the Sprites of another map are loaded.
+        """
+        if self.level_of_detail is not None:
+            self.level_of_detail.reset()
+        for sprite in self:
+            mark_on_screen(sprite)
+
     def update_blocked(self, dt: float):
         for sprite in self:
             getattr(sprite, "update_blocked", sprite.update)(dt)
 
-    def draw(self, camera: Camera):
-        sorted_sprites = sorted(self.sprites(), key=lambda spr: spr.hitbox_rect.bottom)
+    def begin_step(self):
+        """Remember the positions of all moving Sprites before the next step."""
+        self._previous_positions = {
+            sprite: sprite.rect.topleft
+            for sprite in self._render_queue.dynamic_sprites()
+        }
 
-        for layer in Layer:
-            for sprite in sorted_sprites:
-                if sprite.z == layer:
-                    sprite.draw(self.display_surface, camera.apply(sprite), camera)
+    def draw(self, camera: Camera, alpha: float = 1):
+        """
+        :param camera: Camera to draw the Sprites with
+        :param alpha: How far the drawn frame lies between the positions of
+                      the Sprites before and after the last step
+                      (0: previous positions, 1: current positions)
+        """
+        self._render_queue.refresh()
+        previous_positions = self._previous_positions if alpha < 1 else {}
+        for sprite in self._render_queue.iter_visible(
+            camera.get_viewport(_CULLING_MARGIN)
+        ):
+            rect = camera.apply(sprite)
+            previous = previous_positions.get(sprite)
+            if previous is not None:
+                dx = previous[0] - sprite.rect.x
+                dy = previous[1] - sprite.rect.y
+                # Sprites that have been teleported are not interpolated
+                if abs(dx) + abs(dy) < SCALED_TILE_SIZE:
+                    rect.move_ip(dx * (1 - alpha), dy * (1 - alpha))
+            sprite.draw(self.display_surface, rect, camera)
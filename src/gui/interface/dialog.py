@@ -14,6 +14,9 @@ from src.timer import Timer
 class TextBox(Sprite):
     """Text box sprite that contains a part of text."""
 
+    # Text boxes are drawn in screen space, so they must never be culled
+    stationary = False
+
     _TXT_SURF_EXTREMITIES: tuple[pygame.Rect, pygame.Rect] = (
         pygame.Rect(0, 0, 14, 202),
         pygame.Rect(373, 0, 18, 202),
@@ -30,6 +30,8 @@ class EmoteBoxBase(Sprite, ABC):
         timer: Timer triggering the next animation frames
     """
 
+    stationary = False
+
     emote: list[pygame.Surface]
     _current_emote_image = pygame.Surface
 
@@ -115,6 +117,8 @@ class EmoteWheelBase(Sprite):
                  Should be a selection of keys from EmoteManagerBase.emotes
     """
 
+    stationary = False
+
     visible: bool
 
     _emote_manager: EmoteManagerBase
@@ -0,0 +1,101 @@
+import weakref
+from collections.abc import Iterable
+
+import pygame
+
+
+def mark_on_screen(sprite: pygame.sprite.Sprite):
+    """
+    Clear the off_screen flag of a Sprite that is updated without regard to
+    its distance from the camera, so that it does not keep skipping its
+    cosmetic work.
+
+    :param sprite: Sprite that is updated in full
+    """
+    if getattr(sprite, "off_screen", False):
+        sprite.off_screen = False
+
+
+class LevelOfDetail:
+    """
+    Update policy that lets Sprites far away from the camera be updated less
+    often than Sprites on screen.
+
+    Sprites opt in through their throttle_off_screen class attribute. While
+    such a Sprite is off-screen, it is only updated every interval frames,
+    with the sum of the dt of all frames since its last update, so that its
+    timers and movement keep their pace. The frames in which off-screen
+    Sprites are updated are staggered, so that not all of them are updated
+    in the same frame. A Sprite that comes on screen is updated immediately.
+
+    Sprites that have an off_screen attribute get it set to whether they are
+    currently off-screen, so that they can skip purely cosmetic work, like
+    choosing their animation frame. Whenever a Sprite is updated in full
+    instead (e.g. with an interval of 1), the attribute is cleared again.
+
+    Attributes:
+        interval: Number of frames between two updates of off-screen Sprites
+        margin: Distance (in pixels) from the edge of the screen within which
+                Sprites still count as on screen
+        _pending_dt: Time that has passed since the last update of each
+                     off-screen Sprite
+        _phases: Frame (modulo interval) in which each Sprite is updated
+                 while off-screen
+        _frame: Number of the current frame
+    """
+
+    interval: int
+    margin: int
+    _pending_dt: weakref.WeakKeyDictionary[pygame.sprite.Sprite, float]
+    _phases: weakref.WeakKeyDictionary[pygame.sprite.Sprite, int]
+    _frame: int
+
+    def __init__(self, interval: int, margin: int = 0):
+        self.interval = interval
+        self.margin = margin
+        self._pending_dt = weakref.WeakKeyDictionary()
+        self._phases = weakref.WeakKeyDictionary()
+        self._frame = 0
+
+    def reset(self):
+        """
+        Forget the time pending for and the phases of all Sprites, e.g. when
+        the Sprites of another map are updated from now on.
+        """
+        self._pending_dt.clear()
+        self._phases.clear()
+
+    def update(
+        self,
+        sprites: Iterable[pygame.sprite.Sprite],
+        dt: float,
+        viewport: pygame.Rect,
+    ):
+        """
+        Update all Sprites that are due this frame.
+
+        :param sprites: Sprites to update
+        :param dt: Time (in seconds) since the last frame
+        :param viewport: Area of the map that is currently visible on screen
+        """
+        self._frame += 1
+        area = viewport.inflate(self.margin * 2, self.margin * 2)
+        for sprite in sprites:
+            if not getattr(sprite, "throttle_off_screen", False) or self.interval <= 1:
+                mark_on_screen(sprite)
+                sprite.update(self._pending_dt.pop(sprite, 0) + dt)
+                continue
+
+            off_screen = not area.colliderect(sprite.rect)
+            if hasattr(sprite, "off_screen"):
+                sprite.off_screen = off_screen
+
+            sprite_dt = self._pending_dt.pop(sprite, 0) + dt
+            if off_screen:
+                phase = self._phases.get(sprite)
+                if phase is None:
+                    phase = self._phases[sprite] = len(self._phases) % self.interval
+                if (self._frame + phase) % self.interval:
+                    self._pending_dt[sprite] = sprite_dt
+                    continue
+            sprite.update(sprite_dt)
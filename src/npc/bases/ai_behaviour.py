@@ -2,16 +2,37 @@ import random
 import warnings
 from abc import ABC
 from collections.abc import Callable
+from typing import ClassVar
 
 import pygame
-from pathfinding.core.grid import Grid
 
 from src.npc.bases.ai_behaviour_base import AIBehaviourBase, AIState
+from src.npc.batch_motion import BatchMotion
 from src.npc.behaviour.ai_behaviour_tree_base import ContextType, NodeWrapper
+from src.npc.flow_field import FlowField
+from src.npc.path_cache import PathCache
+from src.npc.path_scheduler import PathRequestScheduler
+from src.npc.path_service import PathService
+from src.npc.pathfinding import PathfindingGrid
 from src.settings import SCALED_TILE_SIZE
 
 
 class AIBehaviour(AIBehaviourBase, ABC):
+    throttle_off_screen = True
+
+    pf_scheduler: ClassVar[PathRequestScheduler | None] = None
+    """Queue through which the Entity creates new paths once it stops idling.
+       If it is None, paths are created immediately."""
+    pf_service: ClassVar[PathService | None] = None
+    """Worker processes that search the Entity's paths in the background.
+       If it is None, paths are searched on the main thread."""
+    pf_cache: ClassVar[PathCache | None] = None
+    """Paths that have recently been found, which are reused instead of
+       searching them again. If it is None, every path is searched."""
+    pf_motion: ClassVar[BatchMotion | None] = None
+    """Moves the Entity along its path together with all other Entities, once
+       all Sprites have been updated. If it is None, the Entity moves itself."""
+
     def __init__(self, behaviour_tree_context: ContextType):  # noqa
         """
         !IMPORTANT! AIBehaviour doesn't call Entity.__init__ while still
@@ -29,6 +50,7 @@ class AIBehaviour(AIBehaviourBase, ABC):
         self.conditional_behaviour_tree = None
         self.continuous_behaviour_tree = None
 
+        self.__on_path_creation_funcs = []
         self.__on_path_abortion_funcs = []
         self.__on_path_completion_funcs = []
 
@@ -50,11 +72,52 @@ class AIBehaviour(AIBehaviourBase, ABC):
     def continuous_behaviour_tree(self, value: NodeWrapper | None):
         self._continuous_behaviour_tree = value
 
+    @property
+    def pf_path_pending(self) -> bool:
+        """Whether the Entity is waiting for the PathService to find its path"""
+        return self.pf_service is not None and self in self.pf_service
+
+    def on_path_creation(self, func: Callable[[], None]):
+        """
+        Call the function once pf_path has been created. If the path is not
+        searched in the background, it already has been, so the function is
+        called immediately.
+        """
+        if self.pf_path_pending:
+            self.__on_path_creation_funcs.append(func)
+        else:
+            func()
+        return
+
+    def receive_path(self, path_raw: list[tuple[int, int]]):
+        """
+        Follow a path that has been searched in the background.
+        :param path_raw: All tiles of the path, including the start tile
+        """
+        # see create_path_to_tile
+        self.pf_path = [(x + 0.5, y + 0.5) for x, y in path_raw[1:]]
+
+        if not self.pf_path:
+            self.abort_path()
+            return
+
+        self.pf_state = AIState.MOVING
+        self.pf_state_duration = 0
+
+        for func in self.__on_path_creation_funcs:
+            func()
+        self.__on_path_creation_funcs.clear()
+
     def on_path_abortion(self, func: Callable[[], None]):
         self.__on_path_abortion_funcs.append(func)
         return
 
     def abort_path(self):
+        if self.pf_scheduler is not None:
+            self.pf_scheduler.cancel(self)
+        if self.pf_service is not None:
+            self.pf_service.cancel(self)
+
         self.pf_state = AIState.IDLE
         self.direction.update((0, 0))
         self.pf_state_duration = 1 + random.random() * 1
@@ -92,18 +155,27 @@ class AIBehaviour(AIBehaviourBase, ABC):
         for func in self.__on_stop_moving_funcs:
             func()
 
+        self.__on_path_creation_funcs.clear()
         self.__on_path_abortion_funcs.clear()
         self.__on_path_completion_funcs.clear()
         self.__on_stop_moving_funcs.clear()
         return
 
-    def create_path_to_tile(self, coord: tuple[int, int], pf_grid: Grid = None) -> bool:
+    def create_path_to_tile(
+        self, coord: tuple[int, int], pf_grid: PathfindingGrid = None
+    ) -> bool:
         """
         Initiates the AI-controlled Entity to move to the specified tile.
 
         Note: Path generation has a high performance impact,
         calling it too often at once will cause the game to stutter
 
+        Tiles covered by moving objects (self.pf_obstacles) are avoided.
+
+        If self.pf_service is set, the path is searched in the background and
+        the Entity stays idle until it has been found. Code that depends on
+        pf_path should then be run through on_path_creation.
+
         :param coord: Coordinate of the tile the Entity should move to.
         :param pf_grid: (Optional) pathfinding grid to use. Defaults to self.pf_grid
         :return: Whether the path has successfully been created.
@@ -114,6 +186,8 @@ class AIBehaviour(AIBehaviourBase, ABC):
 
         if not pf_grid.walkable(coord[0], coord[1]):
             return False
+        if self.pf_obstacles is not None and self.pf_obstacles.blocked(*coord):
+            return False
 
         # current NPC position on the tilemap
         tile_coord = (
@@ -121,21 +195,39 @@ class AIBehaviour(AIBehaviourBase, ABC):
             / SCALED_TILE_SIZE
         )
 
+        start = (int(tile_coord.x), int(tile_coord.y))
+        end = (int(coord[0]), int(coord[1]))
+
+        if self.pf_service is not None:
+            if not pf_grid.inside(*start):
+                warnings.warn(f"NPC is at invalid location {tile_coord}")
+                return False
+            if not pf_grid.connected(start, end):
+                return False
+            self.pf_state = AIState.IDLE
+            self.pf_path = []
+            self.pf_service.submit(
+                self, start, end, pf_grid, self.pf_finder, self.pf_obstacles
+            )
+            return True
+
         self.pf_state = AIState.MOVING
         self.pf_state_duration = 0
 
-        pf_grid.cleanup()
-
         try:
-            start = pf_grid.node(int(tile_coord.x), int(tile_coord.y))
+            if self.pf_cache is None:
+                path_raw = self.pf_finder.find_path(
+                    start, end, pf_grid, self.pf_obstacles
+                )
+            else:
+                path_raw = self.pf_cache.find_path(
+                    self.pf_finder, start, end, pf_grid, self.pf_obstacles
+                )
         except IndexError as e:
             # FIXME: Occurs when NPCs get stuck inside each other at the edge
             #  of the map and one of them gets pushed out of the walkable area
             warnings.warn(f"NPC is at invalid location {tile_coord}\nFull error: {e}")
             return False
-        end = pf_grid.node(*[int(i) for i in coord])
-
-        path_raw = self.pf_finder.find_path(start, end, pf_grid)
 
         # The first position in the path will always be removed as it is the
         # same coordinate the NPC is already standing on. Otherwise, if the NPC
@@ -143,13 +235,42 @@ class AIBehaviour(AIBehaviourBase, ABC):
         # coordinate, it may turn around quickly once it reaches it, if the
         # second coordinate of the path points in the same direction as where
         # the NPC was just standing.
-        self.pf_path = [(i.x + 0.5, i.y + 0.5) for i in path_raw[0][1:]]
+        self.pf_path = [(x + 0.5, y + 0.5) for x, y in path_raw[1:]]
 
         if not self.pf_path:
             return False
 
         return True
 
+    def create_path_from_flow_field(
+        self, flow_field: FlowField, max_length: int = -1
+    ) -> bool:
+        """
+        Initiates the AI-controlled Entity to follow the given FlowField.
+        Unlike create_path_to_tile, this does not search a path, so it can be
+        called for any number of Entities sharing the same FlowField.
+
+        Moving objects (self.pf_obstacles) are not part of the FlowField, so
+        the path ends in front of the first tile covered by another one. If
+        that is already the next tile, no path is created.
+
+        :param flow_field: FlowField the Entity should follow.
+        :param max_length: (Optional) maximum length of the created path
+        :return: Whether the path has successfully been created.
+        """
+        self.pf_state = AIState.MOVING
+        self.pf_state_duration = 0
+
+        path_raw = flow_field.path(self.get_tile_pos(), max_length)
+        if self.pf_obstacles is not None:
+            for i, (x, y) in enumerate(path_raw):
+                if self.pf_obstacles.blocked(x, y, ignore=self):
+                    path_raw = path_raw[:i]
+                    break
+        self.pf_path = [(x + 0.5, y + 0.5) for x, y in path_raw]
+
+        return bool(self.pf_path)
+
     def create_step_to_coord(self, coord: tuple[float, float]) -> bool:
         self.pf_path.append((coord[0] / SCALED_TILE_SIZE, coord[1] / SCALED_TILE_SIZE))
         return True
@@ -167,8 +288,16 @@ class AIBehaviour(AIBehaviourBase, ABC):
             self.update_idle(dt)
 
         if self.pf_state == AIState.MOVING:
-            self.update_moving(dt)
+            if self.pf_motion is None:
+                self.update_moving(dt)
+            else:
+                # the rect is aligned once the Entity has been moved
+                self.pf_motion.push(self, dt)
+                return
+
+        self.align_rect_with_hitbox()
 
+    def align_rect_with_hitbox(self):
         self.rect.update(
             (
                 self.hitbox_rect.x - self._current_hitbox.x,
@@ -178,10 +307,16 @@ class AIBehaviour(AIBehaviourBase, ABC):
         )
 
     def update_idle(self, dt: float):
+        if self.pf_path_pending:
+            return
+
         self.pf_state_duration -= dt
 
         if self.pf_state_duration <= 0:
-            self.exit_idle()
+            if self.pf_scheduler is None:
+                self.exit_idle()
+            else:
+                self.pf_scheduler.request(self)
 
     def update_moving(self, dt: float):
         if not self.pf_path:
@@ -242,10 +377,18 @@ class AIBehaviour(AIBehaviourBase, ABC):
                 #  favors vertical movement
                 self.direction.update((round(dx / distance), round(dy / distance)))
 
+        self.place_on_path(current_point)
+
+    def place_on_path(self, point: tuple[float, float]):
+        """
+        Move the Entity to the given point of its path, aborting the path if
+        the Entity collides with anything there.
+        :param point: Position (in tiles) the hitbox should be centered on
+        """
         self.hitbox_rect.update(
             (
-                current_point[0] * SCALED_TILE_SIZE - self.hitbox_rect.width / 2,
-                current_point[1] * SCALED_TILE_SIZE - self.hitbox_rect.height / 2,
+                point[0] * SCALED_TILE_SIZE - self.hitbox_rect.width / 2,
+                point[1] * SCALED_TILE_SIZE - self.hitbox_rect.height / 2,
             ),
             self.hitbox_rect.size,
         )
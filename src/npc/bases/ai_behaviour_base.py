@@ -5,10 +5,9 @@ from collections.abc import Callable
 from enum import IntEnum
 from typing import ClassVar
 
-from pathfinding.core.grid import Grid
-from pathfinding.finder.a_star import AStarFinder
-
 from src.npc.behaviour.ai_behaviour_tree_base import NodeWrapper
+from src.npc.flow_field import FlowField
+from src.npc.pathfinding import DynamicObstacles, PathFinder, PathfindingGrid
 from src.sprites.entities.entity import Entity
 
 
@@ -25,8 +24,10 @@ class AIBehaviourBase(Entity, ABC):
        where 1 stands for a walkable tile, and 0 stands for a
        non-walkable tile. Each list entry represents one row of the tilemap."""
 
-    pf_grid: ClassVar[Grid | None]
-    pf_finder: ClassVar[AStarFinder | None]
+    pf_grid: ClassVar[PathfindingGrid | None]
+    pf_obstacles: ClassVar[DynamicObstacles | None]
+    """Tiles currently covered by moving objects, which paths should avoid"""
+    pf_finder: ClassVar[PathFinder | None]
     pf_state: AIState
     pf_state_duration: float
 
@@ -36,6 +37,7 @@ class AIBehaviourBase(Entity, ABC):
        coordinate tuple, while the first one in the list always being the NPCs
        current target position."""
 
+    __on_path_creation_funcs: list[Callable[[], None]]
     __on_path_abortion_funcs: list[Callable[[], None]]
     __on_path_completion_funcs: list[Callable[[], None]]
 
@@ -62,7 +64,23 @@ class AIBehaviourBase(Entity, ABC):
         pass
 
     @abstractmethod
-    def create_path_to_tile(self, coord: tuple[int, int], pf_grid: Grid) -> bool:
+    def create_path_to_tile(
+        self, coord: tuple[int, int], pf_grid: PathfindingGrid
+    ) -> bool:
+        pass
+
+    @abstractmethod
+    def create_path_from_flow_field(
+        self, flow_field: FlowField, max_length: int
+    ) -> bool:
+        pass
+
+    @abstractmethod
+    def on_path_creation(self, func: Callable[[], None]):
+        pass
+
+    @abstractmethod
+    def receive_path(self, path_raw: list[tuple[int, int]]):
         pass
 
     @abstractmethod
@@ -4,20 +4,20 @@ from abc import ABC
 from typing import ClassVar
 
 import pygame
-from pathfinding.core.grid import Grid
-from pathfinding.finder.a_star import AStarFinder
 
 from src.npc.bases.ai_behaviour import AIBehaviour
 from src.npc.bases.animal import Animal
 from src.npc.behaviour.ai_behaviour_tree_base import ContextType
+from src.npc.pathfinding import DynamicObstacles, PathFinder, PathfindingGrid
 from src.settings import Coordinate
 from src.sprites.setup import EntityAsset
 
 
 class ChickenBase(Animal, AIBehaviour, ABC):
     pf_matrix: ClassVar[list[list[int]] | None] = None
-    pf_grid: ClassVar[Grid | None] = None
-    pf_finder: ClassVar[AStarFinder | None] = None
+    pf_grid: ClassVar[PathfindingGrid | None] = None
+    pf_obstacles: ClassVar[DynamicObstacles | None] = None
+    pf_finder: ClassVar[PathFinder | None] = None
 
     def __init__(
         self,
@@ -4,12 +4,11 @@ from abc import ABC, abstractmethod
 from typing import ClassVar
 
 import pygame
-from pathfinding.core.grid import Grid
-from pathfinding.finder.a_star import AStarFinder
 
 from src.npc.bases.ai_behaviour import AIBehaviour
 from src.npc.bases.animal import Animal
 from src.npc.behaviour.ai_behaviour_tree_base import ContextType
+from src.npc.pathfinding import DynamicObstacles, PathFinder, PathfindingGrid
 from src.settings import Coordinate
 from src.sprites.entities.character import Character
 from src.sprites.setup import EntityAsset
@@ -17,8 +16,9 @@ from src.sprites.setup import EntityAsset
 
 class CowBase(Animal, AIBehaviour, ABC):
     pf_matrix: ClassVar[list[list[int]] | None] = None
-    pf_grid: ClassVar[Grid | None] = None
-    pf_finder: ClassVar[AStarFinder | None] = None
+    pf_grid: ClassVar[PathfindingGrid | None] = None
+    pf_obstacles: ClassVar[DynamicObstacles | None] = None
+    pf_finder: ClassVar[PathFinder | None] = None
 
     fleeing: bool
 
@@ -46,5 +46,7 @@ class CowBase(Animal, AIBehaviour, ABC):
         self.speed = 150
 
     @abstractmethod
-    def flee_from_pos(self, pos: tuple[int, int], pf_grid: Grid = None) -> bool:
+    def flee_from_pos(
+        self, pos: tuple[int, int], pf_grid: PathfindingGrid = None
+    ) -> bool:
         pass
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.npc.bases.ai_behaviour_base import AIState
+from src.settings import SCALED_TILE_SIZE
+
+if TYPE_CHECKING:
+    from src.npc.bases.ai_behaviour import AIBehaviour
+
+
+# number of rows the arrays of a BatchMotion are created with
+_INITIAL_CAPACITY = 16
+
+
+class BatchMotion:
+    """
+    Moves all AI-controlled Entities that follow a path at once.
+
+    Instead of moving itself along its path, an Entity pushes itself to the
+    BatchMotion while it is being updated. Once all Sprites have been updated,
+    update moves all pushed Entities in one vectorised step: their positions,
+    current waypoints and distances to travel are kept in NumPy arrays (one
+    row per Entity), so that all Entities that stay on their current path
+    segment are moved without any per-Entity arithmetic in Python. The few
+    Entities that reach a waypoint in the current frame, and the ones whose
+    path has changed since they were pushed, are moved by
+    AIBehaviour.update_moving as usual.
+
+    Each Entity keeps its row from its first push until clear is called
+    (e.g. when another map is loaded). Pushing an Entity only writes its
+    current position to its row, as it may have been pushed around by
+    collisions, while its waypoint and distance to travel are only written
+    when its path, its current waypoint, its speed or the dt change.
+
+    The new positions are then written back to the pushed Entities, resolving
+    their collisions. Entities far away from the camera are only updated (and
+    thus pushed) every few frames by LevelOfDetail, so they are also written
+    back less often.
+
+    Attributes:
+        _index: Row of each Entity that has been pushed since the last clear
+        _entities: Entity of each row
+        _paths: Path each row's waypoint has been taken from
+        _waypoint_counts: Length of that path when the waypoint was taken
+        _steps: Speed and dt each row's distance to travel was computed from
+        _positions: Hitbox center (in tiles) of each row
+        _waypoints: Current waypoint (in tiles) of each row
+        _travel: Distance (in tiles) each row has to travel
+        _dts: dt of each row
+        _pushed: Rows pushed since the last update, in the order of pushing
+    """
+
+    _index: dict[AIBehaviour, int]
+    _entities: list[AIBehaviour]
+    _paths: list[list[tuple[float, float]] | None]
+    _waypoint_counts: list[int]
+    _steps: list[tuple[float, float] | None]
+    _positions: np.ndarray
+    _waypoints: np.ndarray
+    _travel: np.ndarray
+    _dts: np.ndarray
+    _pushed: list[int]
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self._pushed)
+
+    def _add_row(self, ai: AIBehaviour) -> int:
+        """:return: Row of the new Entity, growing the arrays if necessary"""
+        row = len(self._entities)
+        if row == len(self._travel):
+            capacity = 2 * row
+            self._positions = np.resize(self._positions, (capacity, 2))
+            self._waypoints = np.resize(self._waypoints, (capacity, 2))
+            self._travel = np.resize(self._travel, capacity)
+            self._dts = np.resize(self._dts, capacity)
+        self._index[ai] = row
+        self._entities.append(ai)
+        self._paths.append(None)
+        self._waypoint_counts.append(0)
+        self._steps.append(None)
+        return row
+
+    def push(self, ai: AIBehaviour, dt: float):
+        """
+        Move the Entity along its path on the next update.
+
+        :param ai: Entity that follows a path
+        :param dt: Time (in seconds) the Entity should move for
+        """
+        row = self._index.get(ai)
+        if row is None:
+            row = self._add_row(ai)
+
+        # FRect.center is not always exactly (FRect.centerx, FRect.centery),
+        # the latter are what AIBehaviour.update_moving uses
+        self._positions[row] = (
+            ai.hitbox_rect.centerx / SCALED_TILE_SIZE,
+            ai.hitbox_rect.centery / SCALED_TILE_SIZE,
+        )
+
+        path = ai.pf_path
+        if path is not self._paths[row] or len(path) != self._waypoint_counts[row]:
+            # update_moving removes waypoints from the front of the path
+            self._paths[row] = path
+            self._waypoint_counts[row] = len(path)
+            # Entities without a waypoint are handled by update_moving
+            self._waypoints[row] = path[0] if path else (np.nan, np.nan)
+
+        step = (ai.speed, dt)
+        if step != self._steps[row]:
+            self._steps[row] = step
+            self._travel[row] = ai.speed * dt / SCALED_TILE_SIZE
+            self._dts[row] = dt
+
+        self._pushed.append(row)
+
+    def update(self):
+        """
+        Move all Entities that have been pushed since the last update. Should
+        be called once per frame, after all Sprites have been updated.
+        """
+        if not self._pushed:
+            return
+        rows = self._pushed
+        self._pushed = []
+
+        positions = self._positions[rows]
+        deltas = self._waypoints[rows] - positions
+        travel = self._travel[rows]
+        # the operations are the same as in AIBehaviour.update_moving, so
+        # that both produce exactly the same positions
+        distances = (deltas[:, 0] ** 2 + deltas[:, 1] ** 2) ** 0.5
+
+        # Entities that stay on their current path segment (comparisons with
+        # NaN are false, so Entities without a waypoint are excluded)
+        on_segment = (distances > travel) & (travel > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            new_positions = (
+                positions + deltas * travel[:, np.newaxis] / distances[:, np.newaxis]
+            )
+            # see AIBehaviour.update_moving on why the direction is rounded
+            directions = np.round(deltas / distances[:, np.newaxis])
+
+        for row, moves, position, direction, dt in zip(
+            rows,
+            on_segment.tolist(),
+            new_positions.tolist(),
+            directions.tolist(),
+            self._dts[rows].tolist(),
+            strict=True,
+        ):
+            ai = self._entities[row]
+            if ai.pf_state != AIState.MOVING:
+                # the path has been aborted by another Entity in the meantime
+                continue
+            path = ai.pf_path
+            if (
+                moves
+                and path is self._paths[row]
+                and len(path) == self._waypoint_counts[row]
+            ):
+                ai.direction.update(direction)
+                ai.place_on_path(position)
+            else:
+                ai.update_moving(dt)
+            ai.align_rect_with_hitbox()
+
+    def clear(self):
+        """Forget all Entities, e.g. once the Entities of another map move."""
+        self._index = {}
+        self._entities = []
+        self._paths = []
+        self._waypoint_counts = []
+        self._steps = []
+        self._positions = np.empty((_INITIAL_CAPACITY, 2))
+        self._waypoints = np.empty((_INITIAL_CAPACITY, 2))
+        self._travel = np.empty(_INITIAL_CAPACITY)
+        self._dts = np.empty(_INITIAL_CAPACITY)
+        self._pushed = []
@@ -3,8 +3,6 @@ from __future__ import annotations
 from dataclasses import dataclass
 from enum import Enum
 
-from pathfinding.core.grid import Grid
-
 from src.npc.bases.cow_base import CowBase
 from src.npc.behaviour.ai_behaviour_tree_base import (
     Action,
@@ -14,6 +12,7 @@ from src.npc.behaviour.ai_behaviour_tree_base import (
     Selector,
     Sequence,
 )
+from src.npc.pathfinding import PathfindingGrid
 from src.npc.setup import AIData
 from src.npc.utils import pf_wander
 from src.settings import SCALED_TILE_SIZE
@@ -22,7 +21,7 @@ from src.settings import SCALED_TILE_SIZE
 @dataclass
 class CowIndividualContext(Context):
     cow: CowBase
-    range_grid: Grid = None
+    range_grid: PathfindingGrid = None
 
 
 def wander(context: CowIndividualContext) -> bool:
@@ -3,6 +3,7 @@ from __future__ import annotations
 import random
 from dataclasses import dataclass
 from enum import Enum
+from functools import partial
 from typing import Callable
 
 import pygame
@@ -45,21 +46,29 @@ def walk_to_pos(
         return False
 
     if pf_move_to(context.npc, target_position):
-        if len(context.npc.pf_path) > 1:
-            facing = (
-                context.npc.pf_path[-1][0] - context.npc.pf_path[-2][0],
-                context.npc.pf_path[-1][1] - context.npc.pf_path[-2][1],
-            )
-        else:
+        facing = (0, 0)
+
+        # the path may still be searched in the background
+        @context.npc.on_path_creation
+        def _():
+            nonlocal facing
+            if len(context.npc.pf_path) > 1:
+                facing = (
+                    context.npc.pf_path[-1][0] - context.npc.pf_path[-2][0],
+                    context.npc.pf_path[-1][1] - context.npc.pf_path[-2][1],
+                )
+            else:
+                facing = (
+                    context.npc.pf_path[-1][0]
+                    - context.npc.rect.centerx / SCALED_TILE_SIZE,
+                    context.npc.pf_path[-1][1]
+                    - context.npc.rect.centery / SCALED_TILE_SIZE,
+                )
+
             facing = (
-                context.npc.pf_path[-1][0]
-                - context.npc.rect.centerx / SCALED_TILE_SIZE,
-                context.npc.pf_path[-1][1]
-                - context.npc.rect.centery / SCALED_TILE_SIZE,
+                (facing[0], 0) if abs(facing[0]) > abs(facing[1]) else (0, facing[1])
             )
 
-        facing = (facing[0], 0) if abs(facing[0]) > abs(facing[1]) else (0, facing[1])
-
         NPCSharedContext.targets.add(target_position)
 
         @context.npc.on_path_completion
@@ -171,7 +180,7 @@ def create_new_farmland(context: NPCIndividualContext) -> bool:
 
     for pos in near_tiles(tile_coord, radius):
         if pos in untilled_tiles:
-            if context.npc.soil_area.tiles.get(pos).pf_weight:
+            if context.npc.soil_area.pf_weight(pos):
                 weighted_coords.append(pos)
             else:
                 coords.append(pos)
@@ -489,7 +498,9 @@ def chop_tree(context: NPCIndividualContext) -> bool:
                     tree_edge_coord = offset_edge_midpoint(
                         direction, tree.hitbox_rect, context.npc.hitbox_rect.size
                     )
-                    context.npc.create_step_to_coord(tree_edge_coord)
+                    context.npc.on_path_creation(
+                        partial(context.npc.create_step_to_coord, tree_edge_coord)
+                    )
                     return True
 
         first_iteration = False
@@ -1,9 +1,10 @@
 import pygame
-from pathfinding.core.grid import Grid
 
 from src.enums import Layer
 from src.npc.bases.cow_base import CowBase
 from src.npc.behaviour.cow_behaviour_tree import CowIndividualContext
+from src.npc.flow_field import FleeField
+from src.npc.pathfinding import PathfindingGrid
 from src.npc.utils import pf_move_to
 from src.settings import Coordinate
 from src.sprites.setup import EntityAsset
@@ -35,7 +36,9 @@ class Cow(CowBase):
         self.speed = 150
         self.fleeing = False
 
-    def flee_from_pos(self, pos: tuple[int, int], pf_grid: Grid = None) -> bool:
+    def flee_from_pos(
+        self, pos: tuple[int, int], pf_grid: PathfindingGrid = None
+    ) -> bool:
         """
         Aborts the current path of the cow and makes it flee into the opposite
         direction of the given position.
@@ -46,10 +49,7 @@ class Cow(CowBase):
         :return: Whether the path has successfully been created.
         """
         if not self.fleeing:
-            self.abort_path()
-
-            self.speed = 350
-            self.fleeing = True
+            self._start_fleeing()
 
             # current NPC position on the tilemap
             tile_coord = self.get_tile_pos()
@@ -65,3 +65,23 @@ class Cow(CowBase):
                 if pf_move_to(self, (x_coord, y_coord), 5, pf_grid=pf_grid):
                     return True
         return False
+
+    def flee_along(self, flee_field: FleeField) -> bool:
+        """
+        Aborts the current path of the cow and makes it follow the given
+        FleeField. Unlike flee_from_pos, this does not search any paths.
+        If another moving object stands on the next tile of the field, the
+        cow does not flee until its next decision.
+        :param flee_field: FleeField of the position that should be fled from
+        :return: Whether the path has successfully been created.
+        """
+        if not self.fleeing:
+            self._start_fleeing()
+            return self.create_path_from_flow_field(flee_field, 5)
+        return False
+
+    def _start_fleeing(self):
+        self.abort_path()
+
+        self.speed = 350
+        self.fleeing = True
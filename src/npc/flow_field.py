@@ -0,0 +1,235 @@
+import math
+from collections.abc import Iterable
+from heapq import heappop, heappush
+
+from src.npc.pathfinding import DiagonalMovement, PathfindingGrid
+
+_SQRT2 = math.sqrt(2)
+
+# Tiles of a FleeField are rated by their distance to the threat multiplied by
+# this factor. Since it is greater than 1, fleeing Entities prefer taking a
+# detour around the threat over running into a dead end
+_FLEE_FACTOR = 1.2
+
+
+class FlowField:
+    """
+    Cost of the cheapest path from each tile of a PathfindingGrid to the
+    nearest goal tile (integration field), and the next tile on that path
+    (direction field).
+
+    Entities that share the same goals can follow the field instead of each
+    searching their own path, so the cost per Entity does not depend on the
+    size of the grid. The field is only recomputed once its goals or the
+    walkability of the grid's tiles change.
+
+    Moving objects are not part of the field, as it would have to be
+    recomputed whenever one of them moves. Entities following the field
+    check the tiles of their path against DynamicObstacles instead, see
+    AIBehaviour.create_path_from_flow_field.
+
+    Attributes:
+        grid: Grid the field is computed on
+        diagonal_movement: Whether diagonal steps are allowed
+        radius: (Optional) only tiles at most this far away (in tiles, in
+                each direction) from the goals are part of the field
+        goals: Goal tiles of the field
+        costs: Integration field, by tile index. Tiles without a path to
+               any goal are not included
+        directions: Direction field, i.e. the index of the next tile of each
+                    tile included in costs, or -1 for the goals
+        recomputations: Number of times the field has been computed
+        _outdated: Whether the grid has changed since the field was computed
+    """
+
+    grid: PathfindingGrid
+    diagonal_movement: DiagonalMovement
+    radius: int | None
+    goals: tuple[tuple[int, int], ...]
+    costs: dict[int, float]
+    directions: dict[int, int]
+    recomputations: int
+    _outdated: bool
+
+    def __init__(
+        self,
+        grid: PathfindingGrid,
+        diagonal_movement: DiagonalMovement = DiagonalMovement.NEVER,
+        radius: int | None = None,
+    ):
+        self.grid = grid
+        self.diagonal_movement = diagonal_movement
+        self.radius = radius
+        self.goals = ()
+        self.costs = {}
+        self.directions = {}
+        self.recomputations = 0
+        self._outdated = False
+
+        grid.add_watcher(self)
+
+    def set_goals(self, goals: Iterable[tuple[int, int]]) -> bool:
+        """
+        Recompute the field for the given goal tiles, if they (or the
+        walkability of the grid's tiles) have changed. Goal tiles that are
+        outside the grid or not walkable are ignored (FleeFields only ignore
+        threats outside the grid).
+
+        :return: Whether the field has been recomputed
+        """
+        goals = tuple(goals)
+        if goals == self.goals and not self._outdated:
+            return False
+        self.goals = goals
+        self._compute()
+        self._outdated = False
+        self.recomputations += 1
+        return True
+
+    def tile_changed(self, x: int, y: int):
+        self._outdated = True
+
+    def _compute(self):
+        width = self.grid.width
+        self.costs, self.directions = self._integrate(
+            {y * width + x: 0 for x, y in self.goals if self.grid.walkable(x, y)}
+        )
+
+    def _bounds(self) -> tuple[int, int, int, int]:
+        """:return: (x min, y min, x max, y max) of the field (exclusive)"""
+        if self.radius is None or not self.goals:
+            return 0, 0, self.grid.width, self.grid.height
+        return (
+            max(min(x for x, _ in self.goals) - self.radius, 0),
+            max(min(y for _, y in self.goals) - self.radius, 0),
+            min(max(x for x, _ in self.goals) + self.radius + 1, self.grid.width),
+            min(max(y for _, y in self.goals) + self.radius + 1, self.grid.height),
+        )
+
+    def _integrate(
+        self, seeds: dict[int, float]
+    ) -> tuple[dict[int, float], dict[int, int]]:
+        """
+        Dijkstra search from all seed tiles at once, in the opposite direction
+        of the paths. Steps are only taken between walkable tiles.
+
+        :param seeds: Initial cost of each tile the search starts from
+        :return: The integration field and the direction field
+        """
+        x_min, y_min, x_max, y_max = self._bounds()
+        width = self.grid.width
+        cells = self.grid.cells
+        diagonal = self.diagonal_movement == DiagonalMovement.ONLY_WHEN_NO_OBSTACLE
+
+        costs = dict(seeds)
+        directions = dict.fromkeys(seeds, -1)
+        open_list = [(cost, index) for index, cost in seeds.items()]
+        open_list.sort()
+        while open_list:
+            cost, index = heappop(open_list)
+            if cost > costs[index]:
+                # a cheaper path from the tile has been found in the meantime
+                continue
+
+            y, x = divmod(index, width)
+            neighbours = []
+            n, e, s, w = index - width, index + 1, index + width, index - 1
+            north = y > y_min and cells[n]
+            if north:
+                neighbours.append((n, 1))
+            east = x < x_max - 1 and cells[e]
+            if east:
+                neighbours.append((e, 1))
+            south = y < y_max - 1 and cells[s]
+            if south:
+                neighbours.append((s, 1))
+            west = x > x_min and cells[w]
+            if west:
+                neighbours.append((w, 1))
+            if diagonal:
+                if north and west and cells[n - 1]:
+                    neighbours.append((n - 1, _SQRT2))
+                if north and east and cells[n + 1]:
+                    neighbours.append((n + 1, _SQRT2))
+                if south and east and cells[s + 1]:
+                    neighbours.append((s + 1, _SQRT2))
+                if south and west and cells[s - 1]:
+                    neighbours.append((s - 1, _SQRT2))
+
+            for neighbour, step_cost in neighbours:
+                new_cost = cost + step_cost
+                if neighbour not in costs or new_cost < costs[neighbour]:
+                    costs[neighbour] = new_cost
+                    directions[neighbour] = index
+                    heappush(open_list, (new_cost, neighbour))
+        return costs, directions
+
+    def path(
+        self, start: tuple[int, int], max_length: int = -1
+    ) -> list[tuple[int, int]]:
+        """
+        Follow the direction field. Like with PathFinder.find_path, the start
+        tile itself does not need to be walkable, in which case the path
+        continues on its cheapest walkable neighbour.
+
+        :param start: Tile the path should start on
+        :param max_length: (Optional) maximum number of tiles of the path
+        :return: All tiles of the path, excluding the start tile, or an empty
+                 list if the start tile is not part of the field
+        """
+        width = self.grid.width
+        index = start[1] * width + start[0]
+        if not self.grid.inside(*start):
+            return []
+        if index not in self.costs:
+            x, y = start
+            neighbours = [
+                i
+                for i, inside in (
+                    (index - width, y > 0),
+                    (index + 1, x < width - 1),
+                    (index + width, y < self.grid.height - 1),
+                    (index - 1, x > 0),
+                )
+                if inside and i in self.costs
+            ]
+            if not neighbours:
+                return []
+            index = min(neighbours, key=self.costs.__getitem__)
+            path = [(index % width, index // width)]
+        else:
+            path = []
+
+        directions = self.directions
+        while directions[index] != -1 and len(path) != max_length:
+            index = directions[index]
+            path.append((index % width, index // width))
+        return path
+
+
+class FleeField(FlowField):
+    """
+    FlowField that leads away from its goals instead of towards them, i.e.
+    its goals are threats that should be fled from.
+
+    The field is created by integrating a field towards the threats first,
+    rating each tile by its negated (and scaled) distance to the threats, and
+    integrating again from all tiles with these ratings. Following the field
+    leads to the nearby tile that is the furthest away from the threats,
+    without getting cornered in dead ends along the way.
+    """
+
+    def _compute(self):
+        width = self.grid.width
+        cells = self.grid.cells
+        # threats can stand on tiles that are not walkable, e.g. the Player
+        distances, _ = self._integrate(
+            {y * width + x: 0 for x, y in self.goals if self.grid.inside(x, y)}
+        )
+        self.costs, self.directions = self._integrate(
+            {
+                index: -_FLEE_FACTOR * distance
+                for index, distance in distances.items()
+                if cells[index]
+            }
+        )
@@ -0,0 +1,532 @@
+import math
+import weakref
+from heapq import heappop, heappush
+from itertools import pairwise
+
+from src.npc.pathfinding import (
+    DiagonalMovement,
+    DynamicObstacles,
+    PathFinder,
+    PathfindingGrid,
+)
+
+_SQRT2 = math.sqrt(2)
+_OCTILE_FACTOR = _SQRT2 - 1
+
+# Walkable stretches of a cluster border shorter than this get one transition
+# in their middle, longer ones get one transition at each end
+_MIN_DOUBLE_TRANSITION_LENGTH = 6
+
+# sides of a cluster that are stored as its borders. The west and north border
+# of a cluster are the east and south border of its neighbours
+_EAST = 0
+_SOUTH = 1
+
+# key of the start and end tile in the abstract search
+_START = -2
+_END = -1
+
+# (cluster, side)
+type _BorderKey = tuple[int, int]
+# (cost, indices of all tiles of the path)
+type _Route = tuple[float, list[int]]
+
+
+class ClusterGraph:
+    """
+    Abstract graph of a PathfindingGrid, used to search long paths.
+
+    The grid is split into square clusters. Wherever the walkable tiles of two
+    neighbouring clusters meet, transitions between them are created. The
+    tiles of all transitions are the nodes of the graph, connected to the
+    tiles on the other side of their transitions, and to all other nodes of
+    their cluster that can be reached without leaving the cluster.
+
+    Whenever the walkability of a tile changes, its cluster is rebuilt before
+    the graph is used again. Neighbouring clusters are only rebuilt as well if
+    the transitions between them have changed.
+
+    The graph does not reference its grid, only the grid's cells, so that
+    HierarchicalPathFinder can key its graphs weakly by their grid.
+
+    Attributes:
+        width: Width of the grid the graph has been created from (in tiles)
+        height: Height of the grid the graph has been created from (in tiles)
+        diagonal_movement: Whether diagonal steps are allowed
+        cluster_size: Width and height of each cluster (in tiles)
+        columns: Number of clusters in each row
+        rows: Number of clusters in each column
+        rebuilt_clusters: Number of clusters (re-)built so far
+
+        _cells: Walkability of each tile of the grid, shared with the grid
+        _borders: Transitions across each border between two clusters, as
+                  (tile in the west / north cluster, tile in the other one)
+        _inter: Tiles on the other side of the transitions of each node,
+                stored per cluster
+        _intra: Costs from each node to all other reachable nodes of its
+                cluster, stored per cluster
+        _paths: Tiles of the paths between all connected nodes of each
+                cluster, stored per cluster
+        _outdated: Clusters whose tiles have changed since they were built
+    """
+
+    width: int
+    height: int
+    diagonal_movement: DiagonalMovement
+    cluster_size: int
+    columns: int
+    rows: int
+    rebuilt_clusters: int
+
+    _cells: bytearray
+    _borders: dict[_BorderKey, list[tuple[int, int]]]
+    _inter: list[dict[int, list[int]]]
+    _intra: list[dict[int, dict[int, float]]]
+    _paths: list[dict[tuple[int, int], list[int]]]
+    _outdated: set[int]
+
+    def __init__(
+        self,
+        grid: PathfindingGrid,
+        cluster_size: int,
+        diagonal_movement: DiagonalMovement = DiagonalMovement.NEVER,
+    ):
+        self.width = grid.width
+        self.height = grid.height
+        self._cells = grid.cells
+        self.diagonal_movement = diagonal_movement
+        self.cluster_size = cluster_size
+        self.columns = math.ceil(grid.width / cluster_size)
+        self.rows = math.ceil(grid.height / cluster_size)
+        self.rebuilt_clusters = 0
+
+        self._borders = {}
+        for cluster in range(self.columns * self.rows):
+            for key, _, first in self._cluster_borders(cluster):
+                if first:
+                    self._borders[key] = self._find_transitions(key)
+
+        self._inter = [{} for _ in range(self.columns * self.rows)]
+        self._intra = [{} for _ in range(self.columns * self.rows)]
+        self._paths = [{} for _ in range(self.columns * self.rows)]
+        for cluster in range(self.columns * self.rows):
+            self._build_cluster(cluster)
+        self._outdated = set()
+
+        grid.add_watcher(self)
+
+    def cluster_of(self, index: int) -> int:
+        """:return: Cluster of the tile with the given index"""
+        y, x = divmod(index, self.width)
+        return (y // self.cluster_size) * self.columns + x // self.cluster_size
+
+    def nodes(self, cluster: int) -> list[int]:
+        """:return: Tile indices of all nodes of the cluster"""
+        return list(self._inter[cluster])
+
+    def neighbours(self, node: int) -> list[tuple[int, float]]:
+        """:return: All nodes connected to the node, and the cost to get there"""
+        cluster = self.cluster_of(node)
+        neighbours = [(partner, 1) for partner in self._inter[cluster][node]]
+        neighbours.extend(self._intra[cluster][node].items())
+        return neighbours
+
+    def intra_path(self, node: int, other: int) -> list[int]:
+        """
+        :return: Indices of all tiles of the path between two connected nodes
+                 of the same cluster, including both nodes
+        """
+        return self._paths[self.cluster_of(node)][(node, other)]
+
+    def tile_changed(self, x: int, y: int):
+        """Mark the cluster of the tile as outdated."""
+        self._outdated.add(self.cluster_of(y * self.width + x))
+
+    def refresh(self):
+        """Rebuild all outdated clusters."""
+        rebuild = set(self._outdated)
+        for cluster in self._outdated:
+            for key, other, _ in self._cluster_borders(cluster):
+                transitions = self._find_transitions(key)
+                if transitions != self._borders[key]:
+                    self._borders[key] = transitions
+                    rebuild.add(other)
+        for cluster in rebuild:
+            self._build_cluster(cluster)
+        self._outdated.clear()
+
+    def _bounds(self, cluster: int) -> tuple[int, int, int, int]:
+        """:return: (x min, y min, x max, y max) of the cluster (exclusive)"""
+        y, x = divmod(cluster, self.columns)
+        x_min, y_min = x * self.cluster_size, y * self.cluster_size
+        return (
+            x_min,
+            y_min,
+            min(x_min + self.cluster_size, self.width),
+            min(y_min + self.cluster_size, self.height),
+        )
+
+    def _cluster_borders(self, cluster: int) -> list[tuple[_BorderKey, int, bool]]:
+        """
+        :return: (border, cluster on the other side, whether the cluster is
+                 the west / north one) of each border of the cluster
+        """
+        y, x = divmod(cluster, self.columns)
+        borders = []
+        if x < self.columns - 1:
+            borders.append(((cluster, _EAST), cluster + 1, True))
+        if y < self.rows - 1:
+            borders.append(((cluster, _SOUTH), cluster + self.columns, True))
+        if x > 0:
+            borders.append(((cluster - 1, _EAST), cluster - 1, False))
+        if y > 0:
+            borders.append(
+                ((cluster - self.columns, _SOUTH), cluster - self.columns, False)
+            )
+        return borders
+
+    def _find_transitions(self, key: _BorderKey) -> list[tuple[int, int]]:
+        cluster, side = key
+        x_min, y_min, x_max, y_max = self._bounds(cluster)
+        width = self.width
+        cells = self._cells
+
+        if side == _EAST:
+            pairs = [
+                (y * width + x_max - 1, y * width + x_max) for y in range(y_min, y_max)
+            ]
+        else:
+            row = (y_max - 1) * width
+            pairs = [(row + x, row + width + x) for x in range(x_min, x_max)]
+
+        transitions = []
+        stretch = []
+        for pair in pairs + [None]:
+            if pair is not None and cells[pair[0]] and cells[pair[1]]:
+                stretch.append(pair)
+                continue
+            if len(stretch) >= _MIN_DOUBLE_TRANSITION_LENGTH:
+                transitions.append(stretch[0])
+                transitions.append(stretch[-1])
+            elif stretch:
+                transitions.append(stretch[len(stretch) // 2])
+            stretch = []
+        return transitions
+
+    def _build_cluster(self, cluster: int):
+        inter = {}
+        for key, _, first in self._cluster_borders(cluster):
+            for west_tile, east_tile in self._borders[key]:
+                if first:
+                    inter.setdefault(west_tile, []).append(east_tile)
+                else:
+                    inter.setdefault(east_tile, []).append(west_tile)
+
+        # paths can be walked in both directions, so each pair of nodes is
+        # only searched once
+        nodes = list(inter)
+        intra = {node: {} for node in nodes}
+        paths = {}
+        for i, node in enumerate(nodes[:-1]):
+            routes = self.search_cluster(node, cluster, set(nodes[i + 1 :]))
+            for other, (cost, path) in routes.items():
+                intra[node][other] = cost
+                intra[other][node] = cost
+                paths[(node, other)] = path
+                paths[(other, node)] = path[::-1]
+
+        self._inter[cluster] = inter
+        self._intra[cluster] = intra
+        self._paths[cluster] = paths
+        self.rebuilt_clusters += 1
+
+    def search_cluster(
+        self, source: int, cluster: int, targets: set[int]
+    ) -> dict[int, _Route]:
+        """
+        Search the cheapest paths from the source tile to the target tiles
+        without leaving the cluster. Like with PathFinder.find_path, the
+        source tile itself does not need to be walkable.
+
+        :param source: Index of the tile the paths start on
+        :param cluster: Cluster that contains all tiles
+        :param targets: Indices of the tiles the paths should end on
+        :return: The cost and tiles of the paths to all reachable targets
+        """
+        x_min, y_min, x_max, y_max = self._bounds(cluster)
+        width = self.width
+        cells = self._cells
+        diagonal = self.diagonal_movement == DiagonalMovement.ONLY_WHEN_NO_OBSTACLE
+
+        costs = {source: 0}
+        parents = {source: -1}
+        found = {}
+        open_list = [(0, source)]
+        while open_list and len(found) < len(targets):
+            cost, index = heappop(open_list)
+            if cost > costs[index]:
+                # a cheaper path to the tile has been found in the meantime
+                continue
+            if index in targets:
+                path = []
+                tile = index
+                while tile != -1:
+                    path.append(tile)
+                    tile = parents[tile]
+                path.reverse()
+                found[index] = cost, path
+
+            y, x = divmod(index, width)
+            neighbours = []
+            n, e, s, w = index - width, index + 1, index + width, index - 1
+            north = y > y_min and cells[n]
+            if north:
+                neighbours.append((n, 1))
+            east = x < x_max - 1 and cells[e]
+            if east:
+                neighbours.append((e, 1))
+            south = y < y_max - 1 and cells[s]
+            if south:
+                neighbours.append((s, 1))
+            west = x > x_min and cells[w]
+            if west:
+                neighbours.append((w, 1))
+            if diagonal:
+                if north and west and cells[n - 1]:
+                    neighbours.append((n - 1, _SQRT2))
+                if north and east and cells[n + 1]:
+                    neighbours.append((n + 1, _SQRT2))
+                if south and east and cells[s + 1]:
+                    neighbours.append((s + 1, _SQRT2))
+                if south and west and cells[s - 1]:
+                    neighbours.append((s - 1, _SQRT2))
+
+            for neighbour, step_cost in neighbours:
+                new_cost = cost + step_cost
+                if neighbour not in costs or new_cost < costs[neighbour]:
+                    costs[neighbour] = new_cost
+                    parents[neighbour] = index
+                    heappush(open_list, (new_cost, neighbour))
+        return found
+
+
+class HierarchicalPathFinder(PathFinder):
+    """
+    PathFinder that searches long paths hierarchically (HPA*).
+
+    A ClusterGraph is created for every grid the first time it is searched,
+    or when prepare is called. Long paths are searched on the graph, from
+    node to node, and put together from the paths between the nodes the graph
+    has stored. Parts of the path that lead over DynamicObstacles are then
+    replaced with detours found by short direct searches. Should one of them
+    fail, the whole path is searched directly instead. Paths can be slightly
+    longer than the shortest paths.
+
+    Paths between tiles in the same cluster, or between tiles closer than
+    min_distance, are always searched directly.
+
+    Attributes:
+        cluster_size: Width and height of the clusters (in tiles)
+        min_distance: Minimum manhattan distance (in tiles) between the start
+                      and end tile of hierarchically searched paths
+        _graphs: ClusterGraph of each searched grid
+    """
+
+    cluster_size: int
+    min_distance: int
+    _graphs: weakref.WeakKeyDictionary[PathfindingGrid, ClusterGraph]
+
+    def __init__(
+        self,
+        diagonal_movement: DiagonalMovement = DiagonalMovement.NEVER,
+        cluster_size: int = 10,
+        min_distance: int = 20,
+    ):
+        super().__init__(diagonal_movement)
+        self.cluster_size = cluster_size
+        self.min_distance = min_distance
+        self._graphs = weakref.WeakKeyDictionary()
+
+    @property
+    def variant(self) -> tuple:
+        return *super().variant, self.cluster_size, self.min_distance
+
+    def prepare(self, grid: PathfindingGrid) -> ClusterGraph:
+        """
+        Build the ClusterGraph of the grid, if it has not been built yet.
+
+        :return: The up-to-date ClusterGraph of the grid
+        """
+        graph = self._graphs.get(grid)
+        if graph is None:
+            graph = self._graphs[grid] = ClusterGraph(
+                grid, self.cluster_size, self.diagonal_movement
+            )
+        else:
+            graph.refresh()
+        return graph
+
+    def find_path(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        grid: PathfindingGrid,
+        obstacles: DynamicObstacles | None = None,
+    ) -> list[tuple[int, int]]:
+        if not grid.inside(*start) or not grid.inside(*end):
+            raise IndexError(f"Path from {start} to {end} leaves the grid")
+        if abs(start[0] - end[0]) + abs(
+            start[1] - end[1]
+        ) < self.min_distance or not grid.connected(start, end):
+            return super().find_path(start, end, grid, obstacles)
+
+        graph = self.prepare(grid)
+        width = grid.width
+        start_index = start[1] * width + start[0]
+        end_index = end[1] * width + end[0]
+        start_cluster = graph.cluster_of(start_index)
+        end_cluster = graph.cluster_of(end_index)
+        if start_cluster == end_cluster:
+            return super().find_path(start, end, grid, obstacles)
+
+        start_routes = graph.search_cluster(
+            start_index, start_cluster, set(graph.nodes(start_cluster))
+        )
+        end_routes = graph.search_cluster(
+            end_index, end_cluster, set(graph.nodes(end_cluster))
+        )
+        nodes = self._find_abstract_path(graph, start_routes, end_routes, end)
+        if nodes is None:
+            return super().find_path(start, end, grid, obstacles)
+
+        path = start_routes[nodes[0]][1].copy()
+        for node, next_node in pairwise(nodes):
+            if graph.cluster_of(node) == graph.cluster_of(next_node):
+                path.extend(graph.intra_path(node, next_node)[1:])
+            else:
+                path.append(next_node)
+        path.extend(end_routes[nodes[-1]][1][-2::-1])
+
+        if obstacles is not None:
+            path = self._avoid_obstacles(path, grid, obstacles)
+            if path is None:
+                return super().find_path(start, end, grid, obstacles)
+        return [(index % width, index // width) for index in path]
+
+    def _avoid_obstacles(
+        self, path: list[int], grid: PathfindingGrid, obstacles: DynamicObstacles
+    ) -> list[int] | None:
+        """
+        Replace all parts of the path that lead over tiles covered by moving
+        objects with detours found by direct searches.
+
+        :param path: Indices of all tiles of the path
+        :return: Indices of all tiles of the new path, or None if a detour
+                 could not be found
+        """
+        width = grid.width
+        counts = obstacles.counts
+
+        def blocked(index: int, previous: int) -> bool:
+            if counts[index]:
+                return True
+            # diagonal steps also need both adjacent tiles to be free
+            dx = index % width - previous % width
+            dy = index // width - previous // width
+            return bool(dx and dy and (counts[previous + dx] or counts[index - dx]))
+
+        new_path = [path[0]]
+        i = 1
+        while i < len(path):
+            if not blocked(path[i], path[i - 1]):
+                new_path.append(path[i])
+                i += 1
+                continue
+            # the detour leads to the first tile after the blocked ones
+            j = i + 1
+            while j < len(path) and blocked(path[j], path[j - 1]):
+                j += 1
+            if j == len(path):
+                return None
+            previous, target = new_path[-1], path[j]
+            detour = super().find_path(
+                (previous % width, previous // width),
+                (target % width, target // width),
+                grid,
+                obstacles,
+            )
+            if not detour:
+                return None
+            new_path.extend(y * width + x for x, y in detour[1:])
+            i = j + 1
+        return new_path
+
+    def _find_abstract_path(
+        self,
+        graph: ClusterGraph,
+        start_routes: dict[int, _Route],
+        end_routes: dict[int, _Route],
+        end: tuple[int, int],
+    ) -> list[int] | None:
+        """
+        A* search on the ClusterGraph.
+
+        :param start_routes: Route from the start tile to each node of its
+                             cluster
+        :param end_routes: Route from the end tile to each node of its cluster
+        :param end: End tile
+        :return: All nodes of the path, or None if there is no path
+        """
+        width = graph.width
+        end_x, end_y = end
+        diagonal = self.diagonal_movement == DiagonalMovement.ONLY_WHEN_NO_OBSTACLE
+
+        def estimate(node: int) -> float:
+            y, x = divmod(node, width)
+            dx, dy = abs(x - end_x), abs(y - end_y)
+            if not diagonal:
+                return dx + dy
+            return _OCTILE_FACTOR * min(dx, dy) + max(dx, dy)
+
+        costs = {}
+        parents = {}
+        closed = set()
+        # (estimated total cost, push number, node)
+        open_list = []
+        pushed = 0
+        for node, (cost, _) in start_routes.items():
+            costs[node] = cost
+            parents[node] = _START
+            pushed += 1
+            heappush(open_list, (cost + estimate(node), pushed, node))
+
+        while open_list:
+            _, _, node = heappop(open_list)
+            if node == _END:
+                nodes = []
+                node = parents[_END]
+                while node != _START:
+                    nodes.append(node)
+                    node = parents[node]
+                nodes.reverse()
+                return nodes
+            if node in closed:
+                continue
+            closed.add(node)
+            self.expanded_tiles += 1
+
+            cost = costs[node]
+            neighbours = graph.neighbours(node)
+            if node in end_routes:
+                neighbours.append((_END, end_routes[node][0]))
+            for neighbour, step_cost in neighbours:
+                if neighbour in closed:
+                    continue
+                new_cost = cost + step_cost
+                if new_cost < costs.get(neighbour, math.inf):
+                    costs[neighbour] = new_cost
+                    parents[neighbour] = node
+                    pushed += 1
+                    heuristic = 0 if neighbour == _END else estimate(neighbour)
+                    heappush(open_list, (new_cost + heuristic, pushed, neighbour))
+        return None
@@ -91,22 +91,18 @@ class NPC(NPCBase):
         :return: list of tiles that the NPC is responsible for, e.g. a ROW of untilled soil
         """
         if tile_type == "untilled":
-            tiles = self.soil_area.untilled_tiles
+            mask = self.soil_area.untilled
         elif tile_type == "unplanted":
-            tiles = self.soil_area.unplanted_tiles
+            mask = self.soil_area.unplanted
         elif tile_type == "harvestable":
-            tiles = self.soil_area.harvestable_tiles
+            mask = self.soil_area.harvestable
         elif tile_type == "unwatered":
-            tiles = self.soil_area.unwatered_tiles
+            mask = self.soil_area.unwatered
         else:
             raise ValueError("Invalid tile type")
         # include only tiles that are in the same row as the NPC's start position
-        return [
-            # 1 is the y-coordinate of tile position to pick the row
-            tile
-            for tile in tiles
-            if tile[1] == self.start_tile_pos[1]
-        ]
+        # (1 is the y-coordinate of tile position to pick the row)
+        return self.soil_area.positions_in_row(mask, self.start_tile_pos[1])
 
     def get_personal_adjacent_untilled_tiles(self) -> list[tuple[int, int]]:
         """
@@ -205,6 +201,8 @@ class NPC(NPCBase):
             return
         super().update(dt)
 
+        if self.off_screen:
+            return
         self.emote_manager.update_obj(
             self, (self.rect.centerx - 47, self.rect.centery - 128)
         )
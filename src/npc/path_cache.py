@@ -0,0 +1,136 @@
+import weakref
+from collections import OrderedDict
+
+from src.npc.pathfinding import DynamicObstacles, PathFinder, PathfindingGrid
+
+# (grid, grid version, start tile, end tile, PathFinder.variant)
+type PathCacheKey = tuple[
+    weakref.ref[PathfindingGrid],
+    int,
+    tuple[int, int],
+    tuple[int, int],
+    tuple,
+]
+
+
+class PathCache:
+    """
+    Least recently used cache of found paths.
+
+    Animals wander around the same small ranges and NPCs walk between the same
+    few fields, so the same paths are searched over and over again. Entries
+    are keyed by the grid and its version, so once the walkability of a tile
+    changes, all entries of the grid become unreachable and are eventually
+    evicted. Since all steps cost the same in both directions, a path is
+    also reused (reversed) for the search from its end to its start.
+    Different kinds of PathFinders (e.g. HierarchicalPathFinder and
+    PathFinder) can find different paths, so the variant of the finder is
+    part of the key as well.
+
+    Paths depend on the DynamicObstacles at the time of the search as well.
+    They are not part of the key, as they change every frame. Instead, a
+    cached path only counts as a hit if none of its tiles is currently
+    blocked. Such a path may be a detour around obstacles that have moved
+    away by now, but it is never blocked. Searches that found no path are not
+    cached, as obstacles could be the reason.
+
+    Attributes:
+        capacity: Maximum number of cached paths
+        hits: Number of lookups that have been answered from the cache
+        misses: Number of lookups that required a search
+        _paths: Cached paths, from least to most recently used
+    """
+
+    capacity: int
+    hits: int
+    misses: int
+    _paths: OrderedDict[PathCacheKey, list[tuple[int, int]]]
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._paths = OrderedDict()
+
+    def __len__(self):
+        return len(self._paths)
+
+    @property
+    def hit_rate(self) -> float:
+        """:return: Share of lookups that have been answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    @staticmethod
+    def key(
+        finder: PathFinder,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        grid: PathfindingGrid,
+    ) -> PathCacheKey:
+        """
+        :return: Key of the path the finder would find on the grid in its
+                 current version
+        """
+        # the grid is only referenced weakly, so that the cache does not keep
+        # the grids of previously loaded maps alive
+        return weakref.ref(grid), grid.version, start, end, finder.variant
+
+    def get(
+        self, key: PathCacheKey, obstacles: DynamicObstacles | None = None
+    ) -> list[tuple[int, int]] | None:
+        """
+        :param key: Key of the path
+        :param obstacles: (Optional) moving objects the path should avoid
+        :return: A copy of the cached path, or None if there is no cached path
+                 or it is blocked by the obstacles
+        """
+        path = self._paths.get(key)
+        if path is None:
+            grid, version, start, end, variant = key
+            path = self._paths.get((grid, version, end, start, variant))
+            if path is not None:
+                path = path[::-1]
+        if path is not None and obstacles is not None:
+            counts = obstacles.counts
+            width = obstacles.width
+            # the start tile may be covered by the searching Entity itself
+            if any(counts[y * width + x] for x, y in path[1:]):
+                path = None
+        if path is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.put(key, path)
+        return list(path)
+
+    def put(self, key: PathCacheKey, path: list[tuple[int, int]]):
+        """Cache the path, evicting the least recently used one if necessary."""
+        if not path:
+            return
+        self._paths[key] = list(path)
+        self._paths.move_to_end(key)
+        if len(self._paths) > self.capacity:
+            self._paths.popitem(last=False)
+
+    def find_path(
+        self,
+        finder: PathFinder,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        grid: PathfindingGrid,
+        obstacles: DynamicObstacles | None = None,
+    ) -> list[tuple[int, int]]:
+        """
+        Same as finder.find_path, but paths are taken from the cache if
+        possible, and paths that have been searched are cached.
+        """
+        key = self.key(finder, start, end, grid)
+        path = self.get(key, obstacles)
+        if path is None:
+            path = finder.find_path(start, end, grid, obstacles)
+            self.put(key, path)
+        return path
+
+    def clear(self):
+        self._paths.clear()
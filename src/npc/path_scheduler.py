@@ -0,0 +1,171 @@
+from collections.abc import Callable
+from heapq import heappop, heappush
+
+import pygame
+
+from src.npc.bases.ai_behaviour_base import AIBehaviourBase, AIState
+
+
+class PathRequest:
+    """
+    Pending request of an AI-controlled Entity to create a new path.
+
+    Attributes:
+        ai: Entity that requested the path
+        priority: Requests with lower priorities are processed first
+        run: Function that creates the path
+        on_path_completion: (Optional) function that is called once the
+                            Entity has completed the created path
+        cancelled: Whether the request has been cancelled
+    """
+
+    ai: AIBehaviourBase
+    priority: float
+    run: Callable[[], None]
+    on_path_completion: Callable[[], None] | None
+    cancelled: bool
+
+    def __init__(
+        self,
+        ai: AIBehaviourBase,
+        priority: float,
+        run: Callable[[], None],
+        on_path_completion: Callable[[], None] | None = None,
+    ):
+        self.ai = ai
+        self.priority = priority
+        self.run = run
+        self.on_path_completion = on_path_completion
+        self.cancelled = False
+
+
+class PathRequestScheduler:
+    """
+    Queue of path requests, processed under a per-frame budget.
+
+    Creating paths is expensive, so AI-controlled Entities do not create
+    their paths immediately, but add a request to this queue. Each frame,
+    requests are processed in order of their priority until the pathfinding
+    searches of the processed requests have expanded as many tiles as the
+    budget allows. At least one request is processed every frame, so that
+    the queue always makes progress.
+
+    Searches that are handed to a PathService do not expand any tiles on the
+    main thread. Instead, no more requests are processed while the service
+    of the next Entity already has as many pending jobs as it allows.
+
+    Attributes:
+        budget: Maximum number of tiles that should be expanded per frame
+        focus: (Optional) Sprite whose surroundings matter the most, usually
+               the Player. By default, requests of Entities closer to it are
+               processed first
+        _queue: Heap of (priority, request number, request)
+        _requests: Pending request of each Entity
+        _counter: Number of the next request, so that requests with the same
+                  priority are processed in the order they have been made
+    """
+
+    budget: int
+    focus: pygame.sprite.Sprite | None
+    _queue: list[tuple[float, int, PathRequest]]
+    _requests: dict[AIBehaviourBase, PathRequest]
+    _counter: int
+
+    def __init__(self, budget: int, focus: pygame.sprite.Sprite | None = None):
+        self.budget = budget
+        self.focus = focus
+        self._queue = []
+        self._requests = {}
+        self._counter = 0
+
+    def __len__(self):
+        return len(self._requests)
+
+    def __contains__(self, ai: AIBehaviourBase):
+        return ai in self._requests
+
+    def request(
+        self,
+        ai: AIBehaviourBase,
+        priority: float | None = None,
+        run: Callable[[], None] | None = None,
+        on_path_completion: Callable[[], None] | None = None,
+    ) -> PathRequest:
+        """
+        Add a path request. An Entity can only have one pending request, so
+        if it already has one, that request is returned instead.
+
+        :param ai: Entity that requests the path
+        :param priority: (Optional) requests with lower priorities are
+                         processed first. Defaults to the distance between
+                         the Entity and the focus
+        :param run: (Optional) function that creates the path.
+                    Defaults to ai.exit_idle, running the Entity's
+                    conditional behaviour tree
+        :param on_path_completion: (Optional) function that will be called
+                                   once the Entity has completed the path
+        :return: The pending request of the Entity
+        """
+        if ai in self._requests:
+            return self._requests[ai]
+
+        if priority is None:
+            priority = 0
+            if self.focus is not None:
+                priority = pygame.Vector2(ai.hitbox_rect.center).distance_to(
+                    self.focus.hitbox_rect.center
+                )
+        if run is None:
+            run = ai.exit_idle
+        path_request = PathRequest(ai, priority, run, on_path_completion)
+        self._requests[ai] = path_request
+        heappush(self._queue, (priority, self._counter, path_request))
+        self._counter += 1
+        return path_request
+
+    def cancel(self, ai: AIBehaviourBase):
+        """Cancel the pending request of the Entity, if it has one."""
+        path_request = self._requests.pop(ai, None)
+        if path_request is not None:
+            # cancelled requests are skipped once they are popped
+            path_request.cancelled = True
+
+    def clear(self):
+        for path_request in self._requests.values():
+            path_request.cancelled = True
+        self._queue.clear()
+        self._requests.clear()
+
+    def update(self):
+        """Process pending requests until this frame's budget is used up."""
+        expanded_tiles = 0
+        processed = False
+        while self._queue and (not processed or expanded_tiles < self.budget):
+            path_request = self._queue[0][2]
+            if path_request.cancelled:
+                heappop(self._queue)
+                continue
+            service = path_request.ai.pf_service
+            if service is not None and service.full:
+                # the request is processed once the workers have caught up
+                break
+            heappop(self._queue)
+            del self._requests[path_request.ai]
+
+            ai = path_request.ai
+            if ai.pf_state != AIState.IDLE:
+                # the Entity has started moving on its own in the meantime,
+                # e.g. to flee from the Player
+                continue
+
+            finder = ai.pf_finder
+            expanded_before = finder.expanded_tiles
+            path_request.run()
+            expanded_tiles += finder.expanded_tiles - expanded_before
+            processed = True
+
+            path_created = (
+                ai.pf_state == AIState.MOVING and ai.pf_path or ai.pf_path_pending
+            )
+            if path_created and path_request.on_path_completion is not None:
+                ai.on_path_completion(path_request.on_path_completion)
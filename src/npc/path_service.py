@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import multiprocessing
+import warnings
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING
+
+from src.npc.hierarchical_pathfinding import HierarchicalPathFinder
+from src.npc.path_cache import PathCache, PathCacheKey
+from src.npc.pathfinding import DynamicObstacles, PathFinder, PathfindingGrid
+
+if TYPE_CHECKING:
+    from src.npc.bases.ai_behaviour_base import AIBehaviourBase
+
+# (PathFinder class, arguments it is created with)
+type _FinderBlueprint = tuple[type[PathFinder], tuple]
+
+# (start, end, grid, PathFinder, obstacle footprints) of a search
+type _Search = tuple[
+    tuple[int, int],
+    tuple[int, int],
+    PathfindingGrid,
+    PathFinder,
+    list[tuple[int, int, int, int]] | None,
+]
+
+# maximum number of grids each worker keeps a copy of
+_WORKER_GRID_LIMIT = 8
+
+
+class _SharedGrid:
+    """
+    Copy of the walkability of a PathfindingGrid in shared memory, which
+    follows all changes of the grid.
+
+    Attributes:
+        memory: Shared memory block holding a copy of the grid's cells
+        release: Closes and unlinks the memory block. Called automatically
+                 once the grid has been garbage collected
+    """
+
+    memory: SharedMemory
+    release: weakref.finalize
+    _width: int
+    _cells: bytearray
+
+    def __init__(self, grid: PathfindingGrid):
+        # shared memory blocks cannot be empty
+        self.memory = SharedMemory(create=True, size=max(len(grid.cells), 1))
+        self.memory.buf[: len(grid.cells)] = grid.cells
+        # the grid itself must not be referenced, so that it can be garbage
+        # collected, which releases the memory block
+        self._width = grid.width
+        self._cells = grid.cells
+
+        grid.add_watcher(self)
+        self.release = weakref.finalize(grid, _release, self.memory)
+
+    def tile_changed(self, x: int, y: int):
+        index = y * self._width + x
+        self.memory.buf[index] = self._cells[index]
+
+
+def _release(memory: SharedMemory):
+    memory.close()
+    memory.unlink()
+
+
+def _get_blueprint(finder: PathFinder) -> _FinderBlueprint:
+    """:return: Everything a worker needs to create an equivalent PathFinder"""
+    if isinstance(finder, HierarchicalPathFinder):
+        return HierarchicalPathFinder, (
+            finder.diagonal_movement,
+            finder.cluster_size,
+            finder.min_distance,
+        )
+    return PathFinder, (finder.diagonal_movement,)
+
+
+# state of each worker process
+_worker_grids: dict[str, tuple[int, PathfindingGrid]] = {}
+_worker_finders: dict[_FinderBlueprint, PathFinder] = {}
+
+
+def _get_worker_grid(
+    name: str, version: int, width: int, height: int
+) -> PathfindingGrid:
+    """
+    :return: The worker's copy of the shared grid, updated to the given
+             version if it is outdated
+    """
+    version_and_grid = _worker_grids.pop(name, None)
+    if version_and_grid is not None and version_and_grid[0] == version:
+        grid = version_and_grid[1]
+    else:
+        memory = SharedMemory(name)
+        cells = bytes(memory.buf[: width * height])
+        memory.close()
+        if version_and_grid is None:
+            grid = PathfindingGrid.from_cells(width, cells)
+        else:
+            # only changed tiles are updated, so that derived data like
+            # region labels and ClusterGraphs can be updated incrementally
+            grid = version_and_grid[1]
+            for index, walkable in enumerate(cells):
+                if grid.cells[index] != walkable:
+                    grid.set_walkable(index % width, index // width, walkable)
+
+    # most recently used grids are kept at the end
+    _worker_grids[name] = (version, grid)
+    if len(_worker_grids) > _WORKER_GRID_LIMIT:
+        del _worker_grids[next(iter(_worker_grids))]
+    return grid
+
+
+def _search(
+    grid_name: str,
+    grid_version: int,
+    width: int,
+    height: int,
+    blueprint: _FinderBlueprint,
+    start: tuple[int, int],
+    end: tuple[int, int],
+    footprints: list[tuple[int, int, int, int]] | None,
+) -> list[tuple[int, int]]:
+    """Search a path in a worker process."""
+    grid = _get_worker_grid(grid_name, grid_version, width, height)
+    finder = _worker_finders.get(blueprint)
+    if finder is None:
+        finder_type, args = blueprint
+        finder = _worker_finders[blueprint] = finder_type(*args)
+    obstacles = None
+    if footprints is not None:
+        obstacles = DynamicObstacles.from_footprints(width, height, footprints)
+    return finder.find_path(start, end, grid, obstacles)
+
+
+class PathService:
+    """
+    Pool of worker processes that search paths in the background, so that
+    long searches do not block the game loop.
+
+    Grids are copied into shared memory the first time a path is searched on
+    them. Afterwards, only tiles whose walkability changes are written, so a
+    job only carries the name and version of the grid's memory block, and a
+    snapshot of the DynamicObstacles.
+
+    Finished jobs are collected on the main thread by update, which passes
+    their paths to the Entities that requested them. Each Entity can only have
+    one pending job. Jobs that have been cancelled in the meantime, e.g.
+    because the Entity's path has been aborted, are discarded.
+
+    Searches in the background do not count against the budget of the
+    PathRequestScheduler, so the number of pending jobs is limited by
+    max_jobs instead. If a job fails, or the worker processes cannot be used
+    anymore, its path is searched on the main thread instead, and so are all
+    paths submitted after the pool has broken down.
+
+    Paths that are in the PathCache are passed to the Entity immediately,
+    without submitting a job.
+
+    Attributes:
+        cache: (Optional) cache found paths are looked up in and added to
+        max_jobs: Maximum number of jobs that should be pending at once
+        broken: Whether the worker processes cannot be used anymore
+        _executor: Pool of worker processes
+        _grids: Shared copy of each grid paths have been searched on
+        _jobs: Pending job of each Entity, the cache key of its path and
+               everything needed to search it on the main thread instead
+    """
+
+    cache: PathCache | None
+    max_jobs: int
+    broken: bool
+    _executor: ProcessPoolExecutor
+    _grids: weakref.WeakKeyDictionary[PathfindingGrid, _SharedGrid]
+    _jobs: dict[AIBehaviourBase, tuple[Future, PathCacheKey | None, _Search]]
+
+    def __init__(self, workers: int, cache: PathCache | None = None, max_jobs: int = 4):
+        """
+        :param workers: Number of worker processes
+        :param cache: (Optional) cache found paths are looked up in and
+                      added to
+        :param max_jobs: Maximum number of jobs that should be pending at once
+        """
+        self.cache = cache
+        self.max_jobs = max_jobs
+        self.broken = False
+        # forking a process that runs pygame and other threads is not safe
+        self._executor = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._grids = weakref.WeakKeyDictionary()
+        self._jobs = {}
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __contains__(self, ai: AIBehaviourBase):
+        return ai in self._jobs
+
+    @property
+    def full(self) -> bool:
+        """Whether no more jobs should be submitted until some have finished"""
+        return len(self._jobs) >= self.max_jobs
+
+    def submit(
+        self,
+        ai: AIBehaviourBase,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        grid: PathfindingGrid,
+        finder: PathFinder,
+        obstacles: DynamicObstacles | None = None,
+    ):
+        """
+        Search a path in the background. Once it has been found, it is passed
+        to ai.receive_path. A pending job of the Entity is cancelled.
+        If the path is cached, it is passed to ai.receive_path immediately.
+
+        :param ai: Entity that requests the path
+        :param start: Tile the path should start on
+        :param end: Tile the path should end on
+        :param grid: Grid to search
+        :param finder: PathFinder whose search should be used
+        :param obstacles: (Optional) moving objects the path should avoid
+        """
+        self.cancel(ai)
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(finder, start, end, grid)
+            path = self.cache.get(key, obstacles)
+            if path is not None:
+                ai.receive_path(path)
+                return
+
+        footprints = None if obstacles is None else obstacles.footprints()
+        search = (start, end, grid, finder, footprints)
+        if self.broken:
+            self._search_here(ai, key, search)
+            return
+
+        shared_grid = self._grids.get(grid)
+        if shared_grid is None:
+            shared_grid = self._grids[grid] = _SharedGrid(grid)
+        try:
+            job = self._executor.submit(
+                _search,
+                shared_grid.memory.name,
+                grid.version,
+                grid.width,
+                grid.height,
+                _get_blueprint(finder),
+                start,
+                end,
+                footprints,
+            )
+        except BrokenProcessPool as e:
+            self._break_down(e)
+            self._search_here(ai, key, search)
+            return
+        self._jobs[ai] = job, key, search
+
+    def cancel(self, ai: AIBehaviourBase):
+        """Discard the pending job of the Entity, if it has one."""
+        job = self._jobs.pop(ai, None)
+        if job is not None:
+            job[0].cancel()
+
+    def clear(self):
+        for job, _, _ in self._jobs.values():
+            job.cancel()
+        self._jobs.clear()
+
+    def _break_down(self, error: BaseException):
+        warnings.warn(
+            f"Path searches are run on the main thread from now on, as the "
+            f"worker processes cannot be used anymore\nFull error: {error}"
+        )
+        self.broken = True
+
+    def _search_here(
+        self, ai: AIBehaviourBase, key: PathCacheKey | None, search: _Search
+    ):
+        """Search a path on the main thread and pass it to the Entity."""
+        start, end, grid, finder, footprints = search
+        obstacles = None
+        if footprints is not None:
+            obstacles = DynamicObstacles.from_footprints(
+                grid.width, grid.height, footprints
+            )
+        try:
+            path = finder.find_path(start, end, grid, obstacles)
+        except IndexError as e:
+            # FIXME: Same as in AIBehaviour.create_path_to_tile
+            warnings.warn(f"NPC is at invalid location\nFull error: {e}")
+            path = []
+        if key is not None:
+            self.cache.put(key, path)
+        ai.receive_path(path)
+
+    def update(self):
+        """Pass the paths of all finished jobs to their Entities."""
+        for ai, (job, key, search) in list(self._jobs.items()):
+            if not job.done() or self._jobs.get(ai, (None,))[0] is not job:
+                continue
+            del self._jobs[ai]
+
+            try:
+                path = job.result()
+            except IndexError as e:
+                # FIXME: Same as in AIBehaviour.create_path_to_tile
+                warnings.warn(f"NPC is at invalid location\nFull error: {e}")
+                path = []
+            except BrokenProcessPool as e:
+                if not self.broken:
+                    self._break_down(e)
+                self._search_here(ai, key, search)
+                continue
+            except Exception as e:
+                warnings.warn(
+                    f"Path search failed in a worker process\nFull error: {e}"
+                )
+                self._search_here(ai, key, search)
+                continue
+            if key is not None:
+                self.cache.put(key, path)
+            ai.receive_path(path)
+
+    def close(self):
+        """
+        Discard all pending jobs, shut the worker processes down and release
+        all shared memory blocks. The service cannot be used afterwards.
+        """
+        self.clear()
+        self._executor.shutdown(cancel_futures=True)
+        for shared_grid in list(self._grids.values()):
+            shared_grid.release()
+        self._grids.clear()
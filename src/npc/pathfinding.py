@@ -0,0 +1,543 @@
+from __future__ import annotations
+
+import math
+import weakref
+from collections.abc import Iterable
+from enum import IntEnum
+from heapq import heappop, heappush
+
+import pygame
+
+from src.settings import SCALED_TILE_SIZE
+
+_SQRT2 = math.sqrt(2)
+_OCTILE_FACTOR = _SQRT2 - 1
+
+
+class DiagonalMovement(IntEnum):
+    NEVER = 0
+    # diagonal steps are only allowed if both adjacent tiles are walkable
+    ONLY_WHEN_NO_OBSTACLE = 1
+
+
+class PathfindingGrid:
+    """
+    Walkability of each tile of a map, stored in a flat bytearray.
+
+    Walkable tiles are labelled by the connected region they belong to, so
+    that searches between two regions can be rejected without expanding a
+    single tile. The labels are computed when the grid is created, and are
+    updated whenever a tile's walkability changes.
+
+    The grid also holds the search state of each tile, which is reused by all
+    searches on it. Instead of resetting the state of every tile before a
+    search, each search gets a new generation number, and the state of a tile
+    is only valid if it has been stamped with the current generation.
+
+    Attributes:
+        width: Width of the grid (in tiles)
+        height: Height of the grid (in tiles)
+        cells: 1 for every walkable tile and 0 for every other tile.
+               Tile (x, y) is stored at index y * width + x
+        version: Incremented whenever the walkability of a tile changes, so
+                 that results derived from the grid can be told apart from
+                 outdated ones
+
+        _components: Region label of each walkable tile, and 0 for every
+                     other tile. Two walkable tiles are connected by a path
+                     if and only if they have the same label
+        _component_count: Highest region label in use
+        _components_outdated: Whether the labels need to be recomputed
+                              before they can be used again
+        _watchers: Objects derived from the grid, e.g. ClusterGraphs, whose
+                   tile_changed method is called whenever the walkability of
+                   a tile changes, see add_watcher
+        _generation: Generation number of the latest search
+        _seen: Generation in which each tile was last added to the open list
+        _closed: Generation in which each tile was last expanded
+        _costs: Cost of the best known path to each tile
+        _parents: Index of the previous tile on that path, or -1
+        _entries: Push number of the latest open list entry of each tile
+        _no_obstacles: Occupancy of each tile when searching without
+                       DynamicObstacles, i.e. 0 for every tile
+    """
+
+    width: int
+    height: int
+    cells: bytearray
+    version: int
+
+    _components: list[int]
+    _component_count: int
+    _components_outdated: bool
+    _watchers: weakref.WeakSet
+
+    _generation: int
+    _seen: list[int]
+    _closed: list[int]
+    _costs: list[float]
+    _parents: list[int]
+    _entries: list[int]
+    _no_obstacles: bytes
+
+    def __init__(self, matrix: list[list[int]]):
+        """
+        :param matrix: Pathfinding matrix, where each list represents one row
+                       of the tilemap and every value of at least 1 stands for
+                       a walkable tile
+        """
+        width = len(matrix[0]) if matrix else 0
+        self._setup(width, bytearray(value >= 1 for row in matrix for value in row))
+
+    @classmethod
+    def from_cells(cls, width: int, cells: bytes) -> PathfindingGrid:
+        """
+        :param width: Width of the grid (in tiles)
+        :param cells: Walkability of each tile, in the same layout as
+                      PathfindingGrid.cells
+        :return: A grid with the given walkability
+        """
+        grid = cls.__new__(cls)
+        grid._setup(width, bytearray(cells))
+        return grid
+
+    def _setup(self, width: int, cells: bytearray):
+        self.width = width
+        self.height = len(cells) // width if width else 0
+        self.cells = cells
+        self.version = 0
+
+        self._label_components()
+        self._watchers = weakref.WeakSet()
+
+        size = len(self.cells)
+        self._generation = 0
+        self._seen = [0] * size
+        self._closed = [0] * size
+        self._costs = [0] * size
+        self._parents = [-1] * size
+        self._entries = [0] * size
+        self._no_obstacles = bytes(size)
+
+    def add_watcher(self, watcher):
+        """
+        Call watcher.tile_changed(x, y) whenever the walkability of a tile
+        changes. The grid only references the watcher weakly.
+
+        :param watcher: Object derived from the grid, e.g. a ClusterGraph
+        """
+        self._watchers.add(watcher)
+
+    def inside(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def walkable(self, x: int, y: int) -> bool:
+        """:return: Whether the tile is inside the grid and walkable"""
+        return self.inside(x, y) and self.cells[y * self.width + x] == 1
+
+    def set_walkable(self, x: int, y: int, walkable: bool):
+        """
+        :raise IndexError: If the tile is not inside the grid
+        """
+        if not self.inside(x, y):
+            raise IndexError(f"Tile {(x, y)} is outside of the grid")
+        index = y * self.width + x
+        if self.cells[index] == walkable:
+            return
+        self.cells[index] = walkable
+        self.version += 1
+        if not self._components_outdated:
+            self._update_components(index)
+        for watcher in self._watchers:
+            watcher.tile_changed(x, y)
+
+    def connected(self, start: tuple[int, int], end: tuple[int, int]) -> bool:
+        """
+        Note: Like with PathFinder.find_path, the start tile itself does not
+        need to be walkable. DynamicObstacles are not taken into account,
+        so a path can still be blocked if this returns True.
+
+        :return: Whether a path from start to end can exist
+        """
+        if start == end:
+            return True
+        if not self.inside(*start) or not self.inside(*end):
+            return False
+        if self._components_outdated:
+            self._label_components()
+
+        components = self._components
+        start_index = start[1] * self.width + start[0]
+        component = components[end[1] * self.width + end[0]]
+        if not component:
+            return False
+        if components[start_index]:
+            return components[start_index] == component
+        # Paths from a tile that is not walkable can only lead through its
+        # walkable neighbours. Diagonal neighbours do not need to be checked,
+        # since diagonal steps are only allowed next to walkable tiles
+        return any(
+            components[neighbour] == component
+            for neighbour in self._neighbours(start_index)
+        )
+
+    def _neighbours(self, index: int) -> list[int]:
+        """:return: Indices of the (up to 4) orthogonal neighbours of the tile"""
+        width = self.width
+        x = index % width
+        neighbours = []
+        if index >= width:
+            neighbours.append(index - width)
+        if x < width - 1:
+            neighbours.append(index + 1)
+        if index < len(self.cells) - width:
+            neighbours.append(index + width)
+        if x > 0:
+            neighbours.append(index - 1)
+        return neighbours
+
+    def _label_components(self):
+        """Label the regions of all walkable tiles with a flood fill."""
+        cells = self.cells
+        components = [0] * len(cells)
+        component = 0
+        for index, walkable in enumerate(cells):
+            if not walkable or components[index]:
+                continue
+            component += 1
+            components[index] = component
+            stack = [index]
+            while stack:
+                for neighbour in self._neighbours(stack.pop()):
+                    if cells[neighbour] and not components[neighbour]:
+                        components[neighbour] = component
+                        stack.append(neighbour)
+
+        self._components = components
+        self._component_count = component
+        self._components_outdated = False
+
+    def _update_components(self, index: int):
+        """
+        Update the region labels after the walkability of a tile has changed.
+        Changes that can only extend or shrink a single region are applied
+        directly, while all others cause the labels to be recomputed on the
+        next call to connected.
+        """
+        components = self._components
+        walkable_neighbours = [n for n in self._neighbours(index) if self.cells[n]]
+        if self.cells[index]:
+            neighbour_components = {components[n] for n in walkable_neighbours}
+            if len(neighbour_components) > 1:
+                # the tile merges several regions
+                self._components_outdated = True
+            elif neighbour_components:
+                components[index] = neighbour_components.pop()
+            else:
+                self._component_count += 1
+                components[index] = self._component_count
+        else:
+            components[index] = 0
+            if len(walkable_neighbours) > 1:
+                # the region might have been split into several regions
+                self._components_outdated = True
+
+    def _next_generation(self) -> int:
+        """
+        Invalidate the search state of all tiles.
+
+        :return: The generation number of the new search
+        """
+        self._generation += 1
+        return self._generation
+
+
+type _Footprint = tuple[int, int, int, int]
+
+
+class DynamicObstacles:
+    """
+    Tiles covered by the hitboxes of moving objects, such as the Player and
+    all NPCs and animals of a map.
+
+    The occupancy is kept separately from the PathfindingGrids of the map,
+    so that they never need to be modified when searching around moving
+    objects. Whenever the tracked objects move, update should be called, which
+    only changes the occupancy of the objects that have moved onto other tiles.
+
+    Attributes:
+        width: Width of the map (in tiles)
+        height: Height of the map (in tiles)
+        counts: Number of tracked objects covering each tile,
+                stored in the same order as PathfindingGrid.cells
+        _footprints: Tiles covered by each tracked object as
+                     (x min, y min, x max, y max), where the maximums are
+                     exclusive
+    """
+
+    width: int
+    height: int
+    counts: list[int]
+    _footprints: dict[pygame.sprite.Sprite, _Footprint]
+
+    def __init__(
+        self, width: int, height: int, objects: Iterable[pygame.sprite.Sprite] = ()
+    ):
+        """
+        :param width: Width of the map (in tiles)
+        :param height: Height of the map (in tiles)
+        :param objects: Objects with a hitbox_rect that should be tracked
+        """
+        self.width = width
+        self.height = height
+        self.counts = [0] * (width * height)
+        self._footprints = {}
+
+        for obj in objects:
+            self.track(obj)
+
+    @classmethod
+    def from_footprints(
+        cls, width: int, height: int, footprints: Iterable[_Footprint]
+    ) -> DynamicObstacles:
+        """
+        :param width: Width of the map (in tiles)
+        :param height: Height of the map (in tiles)
+        :param footprints: Footprints of the covered tiles, e.g. from
+                           DynamicObstacles.footprints of another instance
+        :return: DynamicObstacles that cover the given tiles, without
+                 tracking any objects
+        """
+        obstacles = cls(width, height)
+        for footprint in footprints:
+            obstacles._add_footprint(footprint, 1)
+        return obstacles
+
+    def footprints(self) -> list[_Footprint]:
+        """:return: Tiles covered by each tracked object"""
+        return list(self._footprints.values())
+
+    @staticmethod
+    def _get_footprint(obj: pygame.sprite.Sprite) -> _Footprint:
+        hitbox = obj.hitbox_rect
+        return (
+            int(hitbox.left / SCALED_TILE_SIZE),
+            int(hitbox.top / SCALED_TILE_SIZE),
+            math.ceil(hitbox.right / SCALED_TILE_SIZE),
+            math.ceil(hitbox.bottom / SCALED_TILE_SIZE),
+        )
+
+    def _add_footprint(self, footprint: _Footprint, amount: int):
+        x_min, y_min, x_max, y_max = footprint
+        # tiles outside the map are ignored
+        x_min, y_min = max(x_min, 0), max(y_min, 0)
+        x_max, y_max = min(x_max, self.width), min(y_max, self.height)
+        counts = self.counts
+        for y in range(y_min, y_max):
+            row = y * self.width
+            for x in range(x_min, x_max):
+                counts[row + x] += amount
+
+    def track(self, obj: pygame.sprite.Sprite):
+        if obj in self._footprints:
+            return
+        footprint = self._get_footprint(obj)
+        self._footprints[obj] = footprint
+        self._add_footprint(footprint, 1)
+
+    def untrack(self, obj: pygame.sprite.Sprite):
+        footprint = self._footprints.pop(obj, None)
+        if footprint is not None:
+            self._add_footprint(footprint, -1)
+
+    def update(self):
+        """Update the occupancy of all tracked objects that have moved."""
+        footprints = self._footprints
+        for obj, old_footprint in footprints.items():
+            footprint = self._get_footprint(obj)
+            if footprint != old_footprint:
+                self._add_footprint(old_footprint, -1)
+                self._add_footprint(footprint, 1)
+                footprints[obj] = footprint
+
+    def blocked(
+        self, x: int, y: int, ignore: pygame.sprite.Sprite | None = None
+    ) -> bool:
+        """
+        :param ignore: (Optional) tracked object that does not count, e.g.
+                       the Entity that wants to step onto the tile
+        :return: Whether a tracked object covers the tile
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        count = self.counts[y * self.width + x]
+        if count and ignore is not None:
+            footprint = self._footprints.get(ignore)
+            if (
+                footprint is not None
+                and footprint[0] <= x < footprint[2]
+                and footprint[1] <= y < footprint[3]
+            ):
+                count -= 1
+        return count > 0
+
+
+class PathFinder:
+    """
+    A* search on a PathfindingGrid.
+
+    Paths are exactly the ones the AStarFinder of the pathfinding package
+    finds on a Grid created from the same matrix, i.e. all steps have a cost
+    of 1 (or sqrt(2) for diagonal steps), neighbours are explored in the same
+    order and ties between tiles with equal costs are broken the same way.
+
+    Attributes:
+        diagonal_movement: Whether diagonal steps are allowed
+        expanded_tiles: Number of tiles expanded by all searches so far,
+                        which can be used to measure the cost of searches
+    """
+
+    diagonal_movement: DiagonalMovement
+    expanded_tiles: int
+
+    def __init__(self, diagonal_movement: DiagonalMovement = DiagonalMovement.NEVER):
+        self.diagonal_movement = diagonal_movement
+        self.expanded_tiles = 0
+
+    @property
+    def variant(self) -> tuple:
+        """
+        :return: Everything that determines which paths the finder finds.
+                 Finders of the same variant find the same paths
+        """
+        return type(self), self.diagonal_movement
+
+    def find_path(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        grid: PathfindingGrid,
+        obstacles: DynamicObstacles | None = None,
+    ) -> list[tuple[int, int]]:
+        """
+        Note: The start tile itself does not need to be walkable.
+
+        :param start: Tile the path should start on
+        :param end: Tile the path should end on
+        :param grid: Grid to search
+        :param obstacles: (Optional) moving objects the path should avoid.
+                          Tiles covered by them are treated as not walkable
+        :return: All tiles of the path, including the start and end tile,
+                 or an empty list if there is no path
+        :raise IndexError: If the start or end tile is not inside the grid
+        """
+        if not grid.inside(*start) or not grid.inside(*end):
+            raise IndexError(f"Path from {start} to {end} leaves the grid")
+        if not grid.connected(start, end):
+            # the search could only fail after expanding the whole region
+            return []
+
+        width = grid.width
+        cells = grid.cells
+        if obstacles is None:
+            occupied = grid._no_obstacles
+        elif (obstacles.width, obstacles.height) == (grid.width, grid.height):
+            occupied = obstacles.counts
+        else:
+            raise ValueError("The obstacles do not have the same size as the grid")
+        south_limit = len(cells) - width
+        diagonal = self.diagonal_movement == DiagonalMovement.ONLY_WHEN_NO_OBSTACLE
+        end_x, end_y = end
+        start_index = start[1] * width + start[0]
+        end_index = end_y * width + end_x
+
+        generation = grid._next_generation()
+        seen = grid._seen
+        closed = grid._closed
+        costs = grid._costs
+        parents = grid._parents
+        entries = grid._entries
+
+        # (estimated total cost, push number, tile index)
+        # Outdated entries stay in the heap and are skipped once they are
+        # popped. Due to float rounding, they can have the same estimated total
+        # cost as the latest entry, so they are identified by their push number
+        open_list = [(0, 0, start_index)]
+        seen[start_index] = generation
+        costs[start_index] = 0
+        parents[start_index] = -1
+        entries[start_index] = 0
+        pushed = 0
+        expanded = 0
+
+        while open_list:
+            _, number, index = heappop(open_list)
+            if number != entries[index]:
+                continue
+            closed[index] = generation
+            expanded += 1
+
+            if index == end_index:
+                self.expanded_tiles += expanded
+                path = []
+                while index != -1:
+                    path.append((index % width, index // width))
+                    index = parents[index]
+                path.reverse()
+                return path
+
+            y, x = divmod(index, width)
+            # (tile index, x, y, step cost), in the same order as the
+            # pathfinding package: N, E, S, W, NW, NE, SE, SW
+            neighbours = []
+            n, e, s, w = index - width, index + 1, index + width, index - 1
+            north = y > 0 and cells[n] and not occupied[n]
+            if north:
+                neighbours.append((n, x, y - 1, 1))
+            east = x < width - 1 and cells[e] and not occupied[e]
+            if east:
+                neighbours.append((e, x + 1, y, 1))
+            south = index < south_limit and cells[s] and not occupied[s]
+            if south:
+                neighbours.append((s, x, y + 1, 1))
+            west = x > 0 and cells[w] and not occupied[w]
+            if west:
+                neighbours.append((w, x - 1, y, 1))
+            if diagonal:
+                nw, ne, se, sw = n - 1, n + 1, s + 1, s - 1
+                if north and west and cells[nw] and not occupied[nw]:
+                    neighbours.append((nw, x - 1, y - 1, _SQRT2))
+                if north and east and cells[ne] and not occupied[ne]:
+                    neighbours.append((ne, x + 1, y - 1, _SQRT2))
+                if south and east and cells[se] and not occupied[se]:
+                    neighbours.append((se, x + 1, y + 1, _SQRT2))
+                if south and west and cells[sw] and not occupied[sw]:
+                    neighbours.append((sw, x - 1, y + 1, _SQRT2))
+
+            cost = costs[index]
+            for neighbour, nx, ny, step_cost in neighbours:
+                if closed[neighbour] == generation:
+                    continue
+                new_cost = cost + step_cost
+                if seen[neighbour] != generation or new_cost < costs[neighbour]:
+                    seen[neighbour] = generation
+                    costs[neighbour] = new_cost
+                    parents[neighbour] = index
+
+                    dx = abs(nx - end_x)
+                    dy = abs(ny - end_y)
+                    if not diagonal:
+                        # manhattan distance
+                        estimate = dx + dy
+                    elif dx < dy:
+                        # octile distance
+                        estimate = _OCTILE_FACTOR * dx + dy
+                    else:
+                        estimate = _OCTILE_FACTOR * dy + dx
+
+                    pushed += 1
+                    entries[neighbour] = pushed
+                    heappush(open_list, (new_cost + estimate, pushed, neighbour))
+
+        self.expanded_tiles += expanded
+        return []
@@ -1,17 +1,39 @@
-from pathfinding.core.diagonal_movement import DiagonalMovement
-from pathfinding.core.grid import Grid
-from pathfinding.finder.a_star import AStarFinder
-
 from src.npc.bases.chicken_base import ChickenBase
 from src.npc.bases.cow_base import CowBase
 from src.npc.bases.npc_base import NPCBase
+from src.npc.batch_motion import BatchMotion
+from src.npc.hierarchical_pathfinding import HierarchicalPathFinder
+from src.npc.path_cache import PathCache
+from src.npc.path_scheduler import PathRequestScheduler
+from src.npc.path_service import PathService
+from src.npc.pathfinding import (
+    DiagonalMovement,
+    DynamicObstacles,
+    PathFinder,
+    PathfindingGrid,
+)
+from src.settings import (
+    BATCH_MOTION,
+    HIERARCHICAL_PATHFINDING,
+    HIERARCHICAL_PATHFINDING_MIN_DISTANCE,
+    PATH_CACHE_SIZE,
+    PATH_REQUEST_BUDGET,
+    PATHFINDING_CLUSTER_SIZE,
+    PATHFINDING_MAX_JOBS,
+    PATHFINDING_WORKERS,
+)
 from src.sprites.entities.entity import Entity
 from src.sprites.entities.player import Player
 
 
 class AIData:
     Matrix: list[list[int]] = None
-    Grid: Grid = None
+    Grid: PathfindingGrid = None
+    Obstacles: DynamicObstacles = None
+    Scheduler: PathRequestScheduler = None
+    Cache: PathCache = None
+    Service: PathService | None = None
+    Motion: BatchMotion | None = None
 
     player: Player = None
     moving_collideable_objects: list[Entity] = None
@@ -24,24 +46,43 @@ class AIData:
         pathfinding_matrix: list[list[int]],
         player: Player,
         moving_collideable_objects: list[Entity] = None,
+        pathfinding_grid: PathfindingGrid = None,
     ) -> None:
         if not cls.setup:
-            NPCBase.pf_finder = AStarFinder()
-            ChickenBase.pf_finder = AStarFinder(
-                diagonal_movement=DiagonalMovement.only_when_no_obstacle
+            if HIERARCHICAL_PATHFINDING:
+                # NPCs are the only ones that walk across the whole map
+                NPCBase.pf_finder = HierarchicalPathFinder(
+                    cluster_size=PATHFINDING_CLUSTER_SIZE,
+                    min_distance=HIERARCHICAL_PATHFINDING_MIN_DISTANCE,
+                )
+            else:
+                NPCBase.pf_finder = PathFinder()
+            ChickenBase.pf_finder = PathFinder(
+                diagonal_movement=DiagonalMovement.ONLY_WHEN_NO_OBSTACLE
             )
-            CowBase.pf_finder = AStarFinder(
-                diagonal_movement=DiagonalMovement.only_when_no_obstacle
+            CowBase.pf_finder = PathFinder(
+                diagonal_movement=DiagonalMovement.ONLY_WHEN_NO_OBSTACLE
             )
 
+            cls.Scheduler = PathRequestScheduler(PATH_REQUEST_BUDGET)
+            cls.Cache = PathCache(PATH_CACHE_SIZE)
+            if PATHFINDING_WORKERS:
+                cls.Service = PathService(
+                    PATHFINDING_WORKERS, cache=cls.Cache, max_jobs=PATHFINDING_MAX_JOBS
+                )
+            if BATCH_MOTION:
+                cls.Motion = BatchMotion()
+
             cls.setup = True
 
         cls.Matrix = pathfinding_matrix
-        cls.Grid = Grid(matrix=cls.Matrix)
-
-        for ai in (NPCBase, ChickenBase, CowBase):
-            ai.pf_matrix = cls.Matrix
-            ai.pf_grid = cls.Grid
+        # the grid can be passed directly if it has already been created from
+        # the given matrix, e.g. when re-entering a previously loaded map
+        if pathfinding_grid is None:
+            pathfinding_grid = PathfindingGrid(cls.Matrix)
+        cls.Grid = pathfinding_grid
+        if isinstance(NPCBase.pf_finder, HierarchicalPathFinder):
+            NPCBase.pf_finder.prepare(cls.Grid)
 
         cls.player = player
 
@@ -49,3 +90,67 @@ class AIData:
         if cls.moving_collideable_objects is None:
             cls.moving_collideable_objects = []
         cls.moving_collideable_objects.append(cls.player)
+
+        cls.Obstacles = DynamicObstacles(
+            cls.Grid.width, cls.Grid.height, cls.moving_collideable_objects
+        )
+
+        # requests of the previous map are obsolete
+        cls.Scheduler.clear()
+        cls.Scheduler.focus = cls.player
+        if cls.Service is not None:
+            cls.Service.clear()
+        if cls.Motion is not None:
+            cls.Motion.clear()
+
+        for ai in (NPCBase, ChickenBase, CowBase):
+            ai.pf_matrix = cls.Matrix
+            ai.pf_grid = cls.Grid
+            ai.pf_obstacles = cls.Obstacles
+            ai.pf_scheduler = cls.Scheduler
+            ai.pf_service = cls.Service
+            ai.pf_cache = cls.Cache
+            ai.pf_motion = cls.Motion
+
+    @classmethod
+    def update_obstacles(cls):
+        """
+        Update the tiles covered by moving objects. Should be called once per
+        frame, before any paths are created.
+        """
+        if cls.Obstacles is not None:
+            cls.Obstacles.update()
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Shut the worker processes of the PathService down and release their
+        shared memory. Should be called before the game exits, paths are
+        searched on the main thread afterwards.
+        """
+        if cls.Service is not None:
+            cls.Service.close()
+            cls.Service = None
+        for ai in (NPCBase, ChickenBase, CowBase):
+            ai.pf_service = None
+
+    @classmethod
+    def process_path_requests(cls):
+        """
+        Hand out the paths found in the background since the last frame, and
+        create the paths of as many pending path requests as this frame's
+        budget allows. Should be called once per frame.
+        """
+        if cls.Service is not None:
+            cls.Service.update()
+        if cls.Scheduler is not None:
+            cls.Scheduler.update()
+
+    @classmethod
+    def update_motion(cls):
+        """
+        Move all AI-controlled Entities that follow a path. Should be called
+        once per frame, after all Sprites have been updated.
+        """
+        if cls.Motion is not None:
+            cls.Motion.update()
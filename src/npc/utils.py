@@ -1,12 +1,10 @@
 import math
 import warnings
-from contextlib import AbstractContextManager, contextmanager
-from typing import Generator
-
-from pathfinding.core.grid import Grid
+from contextlib import contextmanager
 
 from src.exceptions import PathfindingWarning
 from src.npc.bases.ai_behaviour_base import AIBehaviourBase
+from src.npc.pathfinding import PathfindingGrid
 from src.npc.setup import AIData
 from src.settings import SCALED_TILE_SIZE, TILE_SIZE
 from src.support import near_tiles
@@ -14,7 +12,9 @@ from src.support import near_tiles
 
 # region
 @contextmanager
-def pf_grid_temporary_exclude(positions: set[tuple[int, int]], pf_grid: Grid = None):
+def pf_grid_temporary_exclude(
+    positions: set[tuple[int, int]], pf_grid: PathfindingGrid = None
+):
     if pf_grid is None:
         pf_grid = AIData.Grid
 
@@ -22,19 +22,17 @@ def pf_grid_temporary_exclude(positions: set[tuple[int, int]], pf_grid: Grid = N
 
     try:
         for x, y in positions:
-            try:
+            if pf_grid.inside(x, y):
                 _old_walkable_values[(x, y)] = pf_grid.walkable(x, y)
-                pf_grid.node(x, y).walkable = False
-            except IndexError:
-                pass
+                pf_grid.set_walkable(x, y, False)
         yield
     finally:
-        for x, y in positions:
-            pf_grid.node(x, y).walkable = _old_walkable_values[(x, y)]
+        for (x, y), walkable in _old_walkable_values.items():
+            pf_grid.set_walkable(x, y, walkable)
 
 
 @contextmanager
-def pf_exclude_player_position(pf_grid: Grid = None):
+def pf_exclude_player_position(pf_grid: PathfindingGrid = None):
     if pf_grid is None:
         pf_grid = AIData.Grid
 
@@ -54,34 +52,6 @@ def pf_exclude_player_position(pf_grid: Grid = None):
         yield ctx
 
 
-@contextmanager
-def pathfinding_context(
-    *args, pf_grid: Grid = None
-) -> Generator[AbstractContextManager, None, None]:
-    if pf_grid is None:
-        pf_grid = AIData.Grid
-
-    positions = set()
-    for obj in AIData.moving_collideable_objects:
-        current_hitbox = obj.hitbox_rect
-        x_min = int(current_hitbox.left / SCALED_TILE_SIZE)
-        x_max = math.ceil(current_hitbox.right / SCALED_TILE_SIZE)
-        y_min = int(current_hitbox.top / SCALED_TILE_SIZE)
-        y_max = math.ceil(current_hitbox.bottom / SCALED_TILE_SIZE)
-
-        current_positions = [
-            (x + x_min, y + y_min)
-            for x in range(x_max - x_min)
-            for y in range(y_max - y_min)
-        ]
-
-        for pos in current_positions:
-            positions.add(pos)
-
-    with pf_grid_temporary_exclude(positions, pf_grid=pf_grid) as ctx:
-        yield ctx
-
-
 def pf_add_matrix_collision(
     matrix: list[list[int]], pos: tuple[float, float], size: tuple[float, float]
 ):
@@ -114,7 +84,7 @@ def pf_move_to(
     ai: AIBehaviourBase,
     target_tile: tuple[int, int],
     max_length: int = -1,
-    pf_grid: Grid = None,
+    pf_grid: PathfindingGrid = None,
 ):
     """
     Makes the Entity move to the given tile.
@@ -124,15 +94,20 @@ def pf_move_to(
     :param pf_grid: (Optional) pathfinding grid to use. Defaults to self.pf_grid
     :return: True if path has successfully been created, otherwise False
     """
-    with pathfinding_context(pf_grid=pf_grid):
-        if ai.create_path_to_tile(target_tile, pf_grid=pf_grid):
+    if ai.create_path_to_tile(target_tile, pf_grid=pf_grid):
+
+        @ai.on_path_creation
+        def _():
             if 0 < max_length < len(ai.pf_path):
                 ai.pf_path = ai.pf_path[:max_length]
-            return True
+
+        return True
     return False
 
 
-def pf_wander(ai: AIBehaviourBase, radius: int = 5, pf_grid: Grid = None) -> bool:
+def pf_wander(
+    ai: AIBehaviourBase, radius: int = 5, pf_grid: PathfindingGrid = None
+) -> bool:
     """
     Makes the Entity wander to a random tile in the given radius.
     :param ai: Entity that should wander
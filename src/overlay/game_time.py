@@ -1,4 +1,4 @@
-import pygame
+from src.timer import get_ticks
 
 
 class GameTime:
@@ -12,7 +12,7 @@ class GameTime:
         self.seconds_per_game_minute = 0.7
 
         # gets the creation time in ticks
-        self.last_time = pygame.time.get_ticks()
+        self.last_time = get_ticks()
 
     def set_time(self, hours, minutes):
         self.game_hour = hours
@@ -23,7 +23,7 @@ class GameTime:
 
     def update(self):
         # day-night cycle
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
 
         # if more than seconds_per_game_minute has passed, update clock
         if current_time - self.last_time > self.seconds_per_game_minute * 1000:
@@ -1,136 +1,125 @@
 from collections.abc import Callable
 from random import choice
 
+import numpy as np
 import pygame
 from pytmx import TiledTileLayer
 
 from src.enums import FarmingTool, InventoryResource, Layer, SeedType, StudyGroup
 from src.groups import AllSprites
-from src.settings import SCALED_TILE_SIZE
+from src.overlay.soil_renderer import SoilRenderer
+from src.settings import GROW_SPEED
 from src.sprites.base import Sprite
 from src.sprites.entities.character import Character
 from src.sprites.objects.plant import Plant
 from src.support import tile_to_screen
 
+# bits of the hoed neighbours of a tile, see SoilArea.determine_tile_type
+_ABOVE, _RIGHT, _BELOW, _LEFT = 1, 2, 4, 8
+_NEIGHBOUR_BITS = (
+    ((0, -1), _ABOVE),
+    ((1, 0), _RIGHT),
+    ((0, 1), _BELOW),
+    ((-1, 0), _LEFT),
+)
+# soil frame of a tile, indexed by the bitmask of its hoed neighbours
+_TILE_TYPES = (
+    "o",  # none
+    "b",  # above
+    "l",  # right
+    "bl",  # above, right
+    "t",  # below
+    "tb",  # above, below
+    "tl",  # right, below
+    "tbr",  # above, right, below
+    "r",  # left
+    "br",  # above, left
+    "lr",  # right, left
+    "lrb",  # above, right, left
+    "tr",  # below, left
+    "tbl",  # above, below, left
+    "lrt",  # right, below, left
+    "x",  # all
+)
 
-class Tile(Sprite):
-    pos: tuple[int, int]
-
-    farmable: bool
-    hoed: bool
-    plant: Plant | None
-    planted: bool
-    watered: bool
 
-    pf_weight: float
-
-    def __init__(self, pos: tuple[int, int], group: tuple[pygame.sprite.Group, ...]):
-        self._callback = None
+class Tile(Sprite):
+    """
+    Sprite of a hoed tile. Farmable tiles that have not been hoed have no
+    Sprite, the state of all tiles is kept by their SoilArea. Tiles are not
+    drawn on their own, but through the SoilRenderer of their SoilArea.
+    """
 
-        surf = pygame.Surface((SCALED_TILE_SIZE, SCALED_TILE_SIZE), pygame.SRCALPHA)
+    pos: tuple[int, int]
+    area: "SoilArea"
 
-        super().__init__(tile_to_screen(pos), surf, group, Layer.SOIL)
+    def __init__(self, pos: tuple[int, int], image: pygame.Surface, area: "SoilArea"):
+        super().__init__(tile_to_screen(pos), image, (), Layer.SOIL)
 
         self.pos = pos
-
-        self._on_farmable_funcs = []
-        self._on_hoed_funcs = []
-        self._on_plant_funcs = []
-        self._on_plant_harvestable_funcs = []
-        self._on_watered_funcs = []
-
-        self.farmable = False
-        self.hoed = False
-        self.plant = None
-        self.watered = False
-        self.pf_weight = 0
+        self.area = area
+        self._index = area.index(pos)
 
     @property
-    def planted(self):
-        return self.plant is not None
+    def farmable(self) -> bool:
+        return bool(self.area.farmable[self._index])
 
     @property
-    def farmable(self):
-        return self._farmable
-
-    @farmable.setter
-    def farmable(self, value: bool):
-        for func in self._on_farmable_funcs:
-            func(value)
-
-        self._farmable = value
-
-    def on_farmable(self, func):
-        self._on_farmable_funcs.append(func)
+    def hoed(self) -> bool:
+        return bool(self.area.hoed[self._index])
 
     @property
-    def hoed(self):
-        return self._hoed
-
-    @hoed.setter
-    def hoed(self, value: bool):
-        for func in self._on_hoed_funcs:
-            func(value)
-
-        self._hoed = value
-
-    def on_hoed(self, func):
-        self._on_hoed_funcs.append(func)
+    def watered(self) -> bool:
+        return bool(self.area.watered[self._index])
 
     @property
-    def plant(self):
-        return self._plant
-
-    @plant.setter
-    def plant(self, value: Plant | None):
-        for func in self._on_plant_funcs:
-            func(value)
-
-        try:
-            self.plant.harvestable = False
-            self.plant.kill()
-        except (AttributeError, TypeError):
-            pass
-
-        self._plant = value
-
-        if self.plant:
-
-            @self.plant.on_harvestable
-            def on_harvestable(inner_value: bool):
-                for func_ in self._on_plant_harvestable_funcs:
-                    func_(inner_value)
-
-    def on_plant(self, func):
-        self._on_plant_funcs.append(func)
-
-    def on_plant_harvestable(self, func):
-        self._on_plant_harvestable_funcs.append(func)
+    def plant(self) -> Plant | None:
+        return self.area.plants.get(self.pos)
 
     @property
-    def watered(self):
-        return self._watered
-
-    @watered.setter
-    def watered(self, value: bool):
-        for func in self._on_watered_funcs:
-            func(value)
-
-        self._watered = value
-
-    def on_watered(self, func):
-        self._on_watered_funcs.append(func)
+    def planted(self) -> bool:
+        return self.pos in self.area.plants
 
 
 class SoilArea:
+    """
+    State of all farmable tiles of one study group.
+
+    The state is kept in NumPy arrays covering the bounding box of the
+    farmable tiles, indexed by SoilArea.index. The sets of untilled,
+    unplanted, unwatered and harvestable tiles are derived from them through
+    masks. Sprites are only created for hoed tiles (Tile) and planted tiles
+    (Plant). Hoed tiles, water overlays and young plants are all drawn by
+    one SoilRenderer, only grown plants are drawn as Sprites of their own.
+
+    Attributes:
+        farmable: Whether each tile can be hoed
+        hoed: Whether each tile has been hoed
+        watered: Whether each tile has been watered today
+        plant_type: SeedType of the plant on each tile, or -1
+        plant_age: Age of the plant on each tile
+        tiles: Sprites of all hoed tiles
+        plants: Sprites of all plants
+        renderer: SoilRenderer of the area, or None if it has no tiles
+    """
+
     all_sprites: pygame.sprite.Group
     level_frames: dict
 
     soil_sprites: pygame.sprite.Group
-    water_sprites: pygame.sprite.Group
     plant_sprites: pygame.sprite.Group
 
+    farmable: np.ndarray
+    hoed: np.ndarray
+    watered: np.ndarray
+    plant_type: np.ndarray
+    plant_age: np.ndarray
+    _hoed_neighbours: np.ndarray
+    _origin: tuple[int, int]
+
     tiles: dict[tuple[int, int], Tile]
+    plants: dict[tuple[int, int], Plant]
+    renderer: SoilRenderer | None
     neighbor_directions: list[tuple[int, int]]
 
     raining: bool
@@ -140,16 +129,20 @@ class SoilArea:
         self.level_frames = frames
 
         self.soil_sprites = pygame.sprite.Group()
-        self.water_sprites = pygame.sprite.Group()
         self.plant_sprites = pygame.sprite.Group()
 
+        self._allocate((0, 0), 0, 0)
         self.tiles = {}
+        self.plants = {}
+        self.renderer = None
 
-        self._untilled_tiles = set(self.tiles)
-        self._unplanted_tiles = set()
-        self._unwatered_tiles = set()
-        self._harvestable_tiles = set()
-        self.planted_types = {i: 0 for i in SeedType}
+        # daily growth and age at which plants are harvestable, per SeedType
+        self._grow_speeds = np.array(
+            [GROW_SPEED[seed_type.as_plant_name()] for seed_type in SeedType]
+        )
+        self._max_ages = np.array(
+            [len(frames[seed_type.as_plant_name()]) - 1 for seed_type in SeedType]
+        )
 
         self.neighbor_directions = [
             (0, -1),
@@ -164,6 +157,50 @@ class SoilArea:
 
         self.raining = False
 
+    def _allocate(self, origin: tuple[int, int], width: int, height: int):
+        self._origin = origin
+        shape = (height, width)
+        self.farmable = np.zeros(shape, bool)
+        self.hoed = np.zeros(shape, bool)
+        self.watered = np.zeros(shape, bool)
+        self.plant_type = np.full(shape, -1, np.int8)
+        self.plant_age = np.zeros(shape)
+        # bitmask of the hoed neighbours of each tile, kept up to date
+        # whenever a tile is hoed or un-hoed
+        self._hoed_neighbours = np.zeros(shape, np.uint8)
+
+    def index(self, pos: tuple[int, int]) -> tuple[int, int] | None:
+        """
+        :param pos: Position of a tile (tool targets are floats, see
+                    screen_to_tile)
+        :return: Index of the tile in the state arrays, or None if the tile
+                 lies outside of this area
+        """
+        y = int(pos[1]) - self._origin[1]
+        x = int(pos[0]) - self._origin[0]
+        height, width = self.farmable.shape
+        if 0 <= y < height and 0 <= x < width:
+            return y, x
+        return None
+
+    def positions(self, mask: np.ndarray) -> set[tuple[int, int]]:
+        """:return: Positions of all tiles selected by the mask"""
+        ys, xs = np.nonzero(mask)
+        return set(
+            zip(
+                (xs + self._origin[0]).tolist(),
+                (ys + self._origin[1]).tolist(),
+                strict=True,
+            )
+        )
+
+    def positions_in_row(self, mask: np.ndarray, y: int) -> list[tuple[int, int]]:
+        """:return: Positions of the tiles in row y selected by the mask"""
+        row = y - self._origin[1]
+        if not 0 <= row < mask.shape[0]:
+            return []
+        return [(int(x) + self._origin[0], y) for x in np.flatnonzero(mask[row])]
+
     @property
     def raining(self) -> bool:
         return self._raining
@@ -174,200 +211,275 @@ class SoilArea:
         if self._raining:
             self.water_all()
 
+    @property
+    def planted(self) -> np.ndarray:
+        return self.plant_type >= 0
+
+    @property
+    def untilled(self) -> np.ndarray:
+        return self.farmable & ~self.hoed
+
+    @property
+    def unplanted(self) -> np.ndarray:
+        return self.hoed & (self.plant_type < 0)
+
+    @property
+    def unwatered(self) -> np.ndarray:
+        return (self.plant_type >= 0) & ~self.watered
+
+    @property
+    def harvestable(self) -> np.ndarray:
+        planted = self.plant_type >= 0
+        max_ages = self._max_ages[np.where(planted, self.plant_type, 0)]
+        return planted & (self.plant_age >= max_ages)
+
     @property
     def untilled_tiles(self):
-        return self._untilled_tiles
+        return self.positions(self.untilled)
 
     @property
     def unplanted_tiles(self):
-        return self._unplanted_tiles
+        return self.positions(self.unplanted)
 
     @property
     def unwatered_tiles(self):
-        return self._unwatered_tiles
+        return self.positions(self.unwatered)
 
     @property
     def harvestable_tiles(self):
-        return self._harvestable_tiles
-
-    def _setup_tile(self, tile: Tile):
-        @tile.on_farmable
-        def on_farmable(value: bool):
-            if value:
-                if not tile.hoed:
-                    self._untilled_tiles.add(tile.pos)
-            else:
-                self._untilled_tiles.discard(tile.pos)
-
-        @tile.on_hoed
-        def on_hoed(value: bool):
-            if value:
-                self._untilled_tiles.discard(tile.pos)
-                if not tile.planted:
-                    self._unplanted_tiles.add(tile.pos)
-            else:
-                self._unplanted_tiles.discard(tile.pos)
-                if tile.farmable:
-                    self.untilled_tiles.add(tile.pos)
-
-        @tile.on_plant
-        def on_plant(value: Plant | None):
-            if value:
-                self.planted_types[value.seed_type] += 1
-
-                self._unplanted_tiles.discard(tile.pos)
-                if not tile.watered:
-                    self._unwatered_tiles.add(tile.pos)
-            else:
-                if tile.plant:
-                    self.planted_types[tile.plant.seed_type] -= 1
-
-                self._unwatered_tiles.discard(tile.pos)
-                if tile.hoed:
-                    self._unplanted_tiles.add(tile.pos)
-
-        @tile.on_plant_harvestable
-        def on_plant_harvestable(value: bool):
-            if value:
-                self._harvestable_tiles.add(tile.pos)
-            else:
-                self._harvestable_tiles.discard(tile.pos)
+        return self.positions(self.harvestable)
 
-        @tile.on_watered
-        def on_watered(value: bool):
-            if value:
-                self._unwatered_tiles.discard(tile.pos)
-            else:
-                if tile.planted:
-                    self._unwatered_tiles.add(tile.pos)
-
-    # def reset(self):
-    #     self.tiles = {}
-    #     self.soil_sprites.empty()
-    #     self.water_sprites.empty()
-    #     self.plant_sprites.empty()
+    @property
+    def planted_types(self) -> dict[SeedType, int]:
+        counts = np.bincount(
+            self.plant_type[self.plant_type >= 0], minlength=len(SeedType)
+        )
+        return {seed_type: int(counts[seed_type]) for seed_type in SeedType}
 
     def create_soil_tiles(
         self, layer: TiledTileLayer, previous_soil_data: dict | None = None
     ):
-        if self.tiles:
+        if self.renderer is not None:
             self.all_sprites.add(
-                self.soil_sprites, self.plant_sprites, self.water_sprites
+                self.renderer,
+                [plant for plant in self.plant_sprites if plant.z == Layer.MAIN],
             )
             return
-        for x, y, _ in layer.tiles():
-            tile = Tile((x, y), ())
-            tile.add(self.all_sprites, self.soil_sprites)
-
-            self._setup_tile(tile)
-
-            tile.farmable = True
-
-            if previous_soil_data is not None and previous_soil_data:
-                self._prepare_tile_from_saved_data(tile, (x, y), previous_soil_data)
-
-            self.tiles[(x, y)] = tile
-
-        for pos, tile in self.tiles.items():
-            self.update_tile_image(tile, pos)
-
-    def _prepare_tile_from_saved_data(self, tile, pos, prev_data: dict):
-        if pos not in prev_data:
+        positions = [(x, y) for x, y, _ in layer.tiles()]
+        if not positions:
             return
-        tile_info = prev_data[pos]
-        self._hoe(tile)
-        if tile_info.watered:
-            self._water(tile)
-        if tile_info.plant_info is not None:
-            plant_info = tile_info.plant_info
-            seed_name = plant_info.plant_type.as_plant_name()
-            frames = self.level_frames[seed_name]
-            plant = Plant(plant_info.plant_type, (), tile, frames)
-            plant.add(self.all_sprites, self.plant_sprites)
-
-    def update_tile_image(self, tile, pos):
-        for dx, dy in self.neighbor_directions:
-            neighbor = self.tiles.get((pos[0] + dx, pos[1] + dy))
-            if neighbor is not None:
-                neighbor_pos = (pos[0] + dx, pos[1] + dy)
-                neighbor_type = self.determine_tile_type(neighbor_pos)
-                if neighbor.hoed:
-                    neighbor.image = self.level_frames["soil"][neighbor_type]
-                    neighbor.pf_weight = 0
+        xs, ys = np.array(positions).T
+        left, top = int(xs.min()), int(ys.min())
+        width, height = int(xs.max()) - left + 1, int(ys.max()) - top + 1
+        self._allocate((left, top), width, height)
+        self.farmable[ys - top, xs - left] = True
+        self.renderer = SoilRenderer(self, (left, top), (width, height))
+        self.all_sprites.add(self.renderer)
+
+        saved_tiles = []
+        if previous_soil_data is not None and previous_soil_data:
+            for pos, tile_info in previous_soil_data.items():
+                index = self.index(pos)
+                if index is not None and self.farmable[index]:
+                    # the tile images are determined once all tiles are hoed
+                    self.hoed[index] = True
+                    saved_tiles.append((pos, tile_info))
+
+        self.autotile_all()
+
+        for pos, tile_info in saved_tiles:
+            if tile_info.watered:
+                self._water(pos)
+            if tile_info.plant_info is not None:
+                plant_info = tile_info.plant_info
+                self._add_plant(pos, plant_info.plant_type, plant_info.age)
+
+    def _update_hoed_neighbours(self, index: tuple[int, int], hoed: bool):
+        y, x = index
+        height, width = self._hoed_neighbours.shape
+        for (dx, dy), bit in _NEIGHBOUR_BITS:
+            # the tile lies in the direction of the bit, seen from the
+            # neighbour in the opposite direction
+            neighbour_y, neighbour_x = y - dy, x - dx
+            if 0 <= neighbour_y < height and 0 <= neighbour_x < width:
+                if hoed:
+                    self._hoed_neighbours[neighbour_y, neighbour_x] |= bit
                 else:
-                    neighbor.pf_weight = int(neighbor_type != "o")
+                    self._hoed_neighbours[neighbour_y, neighbour_x] &= ~np.uint8(bit)
 
-        tile_type = self.determine_tile_type(pos)
-        if tile.hoed:
-            tile.image = self.level_frames["soil"][tile_type]
-            tile.pf_weight = 0
-        else:
-            tile.pf_weight = int(tile_type != "o")
+    def update_tile_image(self, pos: tuple[int, int]):
+        # the types of the diagonal neighbours do not depend on the tile
+        for (dx, dy), _ in _NEIGHBOUR_BITS:
+            neighbor = self.tiles.get((pos[0] + dx, pos[1] + dy))
+            if neighbor is not None:
+                self._update_image(neighbor)
 
-    def _hoe(self, tile):
+        tile = self.tiles.get(pos)
+        if tile is not None:
+            self._update_image(tile)
+        if self.renderer is not None:
+            self.renderer.mark_dirty(pos, 1)
+
+    def autotile_all(self):
+        """
+        Determine the hoed neighbours and the images of all tiles in one
+        pass, e.g. after the tiles have been loaded from save data. Hoed
+        tiles that have no Sprite yet get one.
+        """
+        hoed = np.pad(self.hoed, 1)
+        self._hoed_neighbours = (
+            hoed[:-2, 1:-1] * _ABOVE
+            | hoed[1:-1, 2:] * _RIGHT
+            | hoed[2:, 1:-1] * _BELOW
+            | hoed[1:-1, :-2] * _LEFT
+        ).astype(np.uint8)
+
+        for pos in self.positions(self.hoed):
+            tile = self.tiles.get(pos)
+            if tile is None:
+                self._create_tile(pos)
+            else:
+                self._update_image(tile)
+            self.renderer.mark_dirty(pos, 1)
+
+    def _create_tile(self, pos: tuple[int, int]):
+        pos = (int(pos[0]), int(pos[1]))
+        image = self.level_frames["soil"][self.determine_tile_type(pos)]
+        tile = Tile(pos, image, self)
+        tile.add(self.soil_sprites)
+        self.tiles[pos] = tile
+
+    def _update_image(self, tile: Tile):
+        tile.image = self.level_frames["soil"][self.determine_tile_type(tile.pos)]
+
+    def pf_weight(self, pos: tuple[int, int]) -> int:
+        """
+        :return: 1 if the tile has not been hoed but lies next to a hoed tile,
+                 otherwise 0
+        """
+        index = self.index(pos)
+        if index is None or self.hoed[index]:
+            return 0
+        return int(self._hoed_neighbours[index] != 0)
+
+    def _hoe(self, pos: tuple[int, int]) -> bool:
         """Hoe a tile.
 
         WARNING: this method is for internal usage.
         Use SoilLayer.hoe instead."""
-        if tile is not None and tile.farmable and not tile.hoed:
-            tile.hoed = True
-            self.update_tile_image(tile, tile.pos)
-            return True
-        return False
+        index = self.index(pos)
+        if index is None or not self.farmable[index] or self.hoed[index]:
+            return False
+        self.hoed[index] = True
+        self._update_hoed_neighbours(index, True)
+        self._create_tile(pos)
+        self.update_tile_image(pos)
+        return True
 
     def hoe(self, pos) -> bool:
         """:return: Whether the tile was successfully hoed or not"""
-        tile = self.tiles.get(pos)
-        return self._hoe(tile)
-
-    def _water(self, tile):
+        return self._hoe(pos)
+
+    def unhoe(self, pos) -> bool:
+        """
+        Turn a hoed tile that has neither been planted nor watered back into
+        untilled soil.
+        :return: Whether the tile was successfully un-hoed or not
+        """
+        index = self.index(pos)
+        if index is None or not self.hoed[index]:
+            return False
+        if self.watered[index] or self.plant_type[index] >= 0:
+            return False
+        self.hoed[index] = False
+        self._update_hoed_neighbours(index, False)
+        self.tiles.pop(pos).kill()
+        self.update_tile_image(pos)
+        return True
+
+    def _water(self, pos: tuple[int, int]) -> bool:
         """Water a tile.
 
         WARNING: this method is for internal usage.
         Use SoilLayer.water instead."""
-        if tile is not None and tile.hoed and not tile.watered:
-            tile.watered = True
-
-            water_frames = list(self.level_frames["soil water"].values())
-            water_frame = choice(water_frames)
-            water = Sprite(
-                tile_to_screen(tile.pos),
-                water_frame,
-                (),
-                Layer.SOIL_WATER,
-            )
-            water.add(self.all_sprites, self.water_sprites)
-            return True
+        index = self.index(pos)
+        if index is None or not self.hoed[index] or self.watered[index]:
+            return False
+        self.watered[index] = True
 
-        return False
+        water_frames = list(self.level_frames["soil water"].values())
+        self.renderer.water((int(pos[0]), int(pos[1])), choice(water_frames))
+        return True
 
     def water(self, pos):
         """:return: Whether the tile was successfully watered or not"""
-        tile = self.tiles.get(pos)
-        return self._water(tile)
+        return self._water(pos)
 
     def water_all(self):
-        for pos, tile in self.tiles.items():
-            if tile.hoed:
-                self.water(pos)
-                self.update_tile_image(tile, pos)
+        for pos in self.positions(self.hoed & ~self.watered):
+            self._water(pos)
+
+    def advance_day(self):
+        """
+        Roll the area over to the next day: grow all watered plants, then dry
+        all tiles and remove their water overlays at once. Plants that have
+        grown out of Layer.PLANT are drawn as Sprites of their own from now on.
+        """
+        growing = self.watered & (self.plant_type >= 0)
+        ys, xs = np.nonzero(growing)
+        if len(ys):
+            types = self.plant_type[ys, xs]
+            ages = np.minimum(
+                self.plant_age[ys, xs] + self._grow_speeds[types],
+                self._max_ages[types],
+            )
+            self.plant_age[ys, xs] = ages
+            left, top = self._origin
+            for x, y, age in zip(xs.tolist(), ys.tolist(), ages.tolist(), strict=True):
+                pos = (x + left, y + top)
+                plant = self.plants[pos]
+                plant.set_age(age)
+                if plant.z == Layer.MAIN and plant not in self.all_sprites:
+                    self.all_sprites.add(plant)
+                self.renderer.mark_plant_dirty(pos)
+
+        self.watered[:] = False
+        if self.renderer is not None:
+            self.renderer.dry_all()
+
+    def _add_plant(self, pos: tuple[int, int], seed_type: SeedType, age: float = 0):
+        """
+        :param pos: Position of the tile the plant grows on
+        :param seed_type: Type of the plant
+        :param age: Age of the plant, e.g. when it is restored from the save file
+        """
+        pos = (int(pos[0]), int(pos[1]))
+        frames = self.level_frames[seed_type.as_plant_name()]
+        plant = Plant(seed_type, (self.plant_sprites,), self.tiles[pos], frames)
+        self.plants[pos] = plant
+        index = self.index(pos)
+        self.plant_type[index] = seed_type
+        self.plant_age[index] = age
+        if age:
+            plant.set_age(age)
+            # see advance_day
+            if plant.z == Layer.MAIN:
+                self.all_sprites.add(plant)
+        self.renderer.mark_plant_dirty(pos)
 
     def _plant(self, pos, seed, check=lambda s, t: True):
         """Plant a seed.
 
         WARNING: this method is for internal usage. Consider using
         SoilLayer.plant instead."""
-        tile = self.tiles.get(pos)
+        index = self.index(pos)
         seed_resource = FarmingTool.as_inventory_resource(seed)
         seed_type = SeedType.from_farming_tool(seed)
-        if tile and tile.hoed and not tile.planted:
+        if index is not None and self.hoed[index] and self.plant_type[index] < 0:
             if not check(seed_resource, 1):
                 return False
 
-            seed_name = seed_type.as_plant_name()
-            frames = self.level_frames[seed_name]
-            groups = (self.all_sprites, self.plant_sprites)
-            tile.plant = Plant(seed_type, groups, tile, frames)
+            self._add_plant(pos, seed_type)
             return True
 
         return False
@@ -386,64 +498,33 @@ class SoilArea:
     ) -> bool:
         """:return: Whether the tile was successfully harvested or not"""
 
-        tile = self.tiles.get(pos)
-        if tile and getattr(tile.plant, "harvestable", False):
+        plant = self.plants.get(pos)
+        if plant and plant.age >= plant.max_age:
             # add resource
-            resource = SeedType.as_nonseed_ir(tile.plant.seed_type)
+            resource = SeedType.as_nonseed_ir(plant.seed_type)
             quantity = 3
 
             add_resource(resource, quantity)
 
             # remove plant
-            create_particle(tile.plant)
-            tile.plant = None
+            create_particle(plant)
+            plant.kill()
+            del self.plants[pos]
+            self.renderer.mark_plant_dirty(pos)
+            index = self.index(pos)
+            self.plant_type[index] = -1
+            self.plant_age[index] = 0
             return True
 
         return False
 
-    def determine_tile_type(self, pos):
-        x, y = pos
-        tile_above = self.tiles.get((x, y - 1))
-        tile_below = self.tiles.get((x, y + 1))
-        tile_right = self.tiles.get((x + 1, y))
-        tile_left = self.tiles.get((x - 1, y))
-
-        hoed_above = getattr(tile_above, "hoed", False)
-        hoed_below = getattr(tile_below, "hoed", False)
-        hoed_right = getattr(tile_right, "hoed", False)
-        hoed_left = getattr(tile_left, "hoed", False)
-
-        if all((hoed_above, hoed_right, hoed_below, hoed_left)):
-            return "x"
-        if hoed_left and not any((hoed_above, hoed_right, hoed_below)):
-            return "r"
-        if hoed_right and not any((hoed_above, hoed_left, hoed_below)):
-            return "l"
-        if hoed_right and hoed_left and not any((hoed_above, hoed_below)):
-            return "lr"
-        if hoed_above and not any((hoed_right, hoed_left, hoed_below)):
-            return "b"
-        if hoed_below and not any((hoed_right, hoed_left, hoed_above)):
-            return "t"
-        if hoed_below and hoed_above and not any((hoed_right, hoed_left)):
-            return "tb"
-        if hoed_left and hoed_below and not any((hoed_above, hoed_right)):
-            return "tr"
-        if hoed_right and hoed_below and not any((hoed_above, hoed_left)):
-            return "tl"
-        if hoed_left and hoed_above and not any((hoed_below, hoed_right)):
-            return "br"
-        if hoed_right and hoed_above and not any((hoed_below, hoed_left)):
-            return "bl"
-        if all((hoed_above, hoed_below, hoed_right)) and not hoed_left:
-            return "tbr"
-        if all((hoed_above, hoed_below, hoed_left)) and not hoed_right:
-            return "tbl"
-        if all((hoed_left, hoed_right, hoed_above)) and not hoed_below:
-            return "lrb"
-        if all((hoed_left, hoed_right, hoed_below)) and not hoed_above:
-            return "lrt"
-        return "o"
+    def determine_tile_type(self, pos: tuple[int, int]) -> str:
+        """
+        :param pos: Position of a tile of this area
+        :return: Name of the soil frame that connects the tile to its hoed
+                 neighbours
+        """
+        return _TILE_TYPES[self._hoed_neighbours[self.index(pos)]]
 
 
 class SoilManager:
@@ -493,9 +574,4 @@ class SoilManager:
 
     def update(self):
         for area in self._areas.values():
-            for tile in area.tiles.values():
-                if tile.plant:
-                    tile.plant.grow()
-                tile.watered = False
-                for sprite in area.water_sprites:
-                    sprite.kill()
+            area.advance_day()
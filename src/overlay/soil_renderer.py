@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+import pygame
+
+from src.enums import Layer
+from src.settings import SCALED_TILE_SIZE
+from src.sprites.base import Sprite
+from src.support import tile_to_screen
+
+if TYPE_CHECKING:
+    from src.overlay.soil import SoilArea
+
+
+class SoilRenderer(Sprite):
+    """
+    Draws all hoed tiles, water overlays and young plants of a SoilArea as
+    one Sprite, instead of one Sprite each.
+
+    Everything is drawn onto a cached surface, which covers the area with a
+    margin of one tile, as young plants reach into the tiles around them.
+    Only the tiles that have been marked as dirty since the last draw are
+    redrawn. Grown plants are drawn as separate Sprites on Layer.MAIN, so
+    that they are y-sorted with Characters.
+
+    The surface is only created once the area is drawn for the first time,
+    so areas that are never drawn (e.g. while simulating) do not allocate it.
+
+    Attributes:
+        area: SoilArea whose tiles are drawn
+        water_frames: Water overlay of each watered tile
+        _surface: Cached surface, or None if it has not been drawn yet
+        _dirty: Positions of all tiles that have to be redrawn
+    """
+
+    area: SoilArea
+    water_frames: dict[tuple[int, int], pygame.Surface]
+    _surface: pygame.Surface | None
+    _dirty: set[tuple[int, int]]
+
+    def __init__(self, area: SoilArea, origin: tuple[int, int], size: tuple[int, int]):
+        """
+        :param area: SoilArea whose tiles are drawn
+        :param origin: Position of the top left tile of the area
+        :param size: Width and height of the area (in tiles)
+        """
+        super().__init__(
+            tile_to_screen((origin[0] - 1, origin[1] - 1)),
+            pygame.Surface((0, 0)),
+            (),
+            Layer.SOIL,
+        )
+        self.rect.size = (
+            (size[0] + 2) * SCALED_TILE_SIZE,
+            (size[1] + 2) * SCALED_TILE_SIZE,
+        )
+        self.hitbox_rect = self.rect.copy()
+
+        self.area = area
+        self.water_frames = {}
+        self._surface = None
+        self._dirty = set()
+
+    def mark_dirty(self, pos: tuple[int, int], radius: int = 0):
+        """
+        Redraw the tile (and all tiles at most radius tiles away from it)
+        the next time the area is drawn.
+        """
+        if self._surface is None:
+            return
+        for dy in range(-radius, radius + 1):
+            for dx in range(-radius, radius + 1):
+                self._dirty.add((pos[0] + dx, pos[1] + dy))
+
+    def mark_plant_dirty(self, pos: tuple[int, int]):
+        """Redraw all tiles a young plant on the tile can reach into."""
+        self.mark_dirty(pos, 1)
+
+    def water(self, pos: tuple[int, int], frame: pygame.Surface):
+        self.water_frames[pos] = frame
+        self.mark_dirty(pos)
+
+    def dry_all(self):
+        for pos in self.water_frames:
+            self.mark_dirty(pos)
+        self.water_frames.clear()
+
+    def refresh(self):
+        """Redraw all dirty tiles, or everything on the first call."""
+        if self._surface is None:
+            self._surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            self.image = self._surface
+            young_plants = [
+                plant for plant in self.area.plants.values() if plant.z == Layer.PLANT
+            ]
+            self._draw(self._surface.get_rect(), self._all_positions(), young_plants)
+            return
+
+        for pos in self._dirty:
+            self._draw(self._tile_rect(pos), (pos,), self._young_plants_around(pos))
+        self._dirty.clear()
+
+    def _all_positions(self) -> list[tuple[int, int]]:
+        left = int(self.rect.left) // SCALED_TILE_SIZE
+        top = int(self.rect.top) // SCALED_TILE_SIZE
+        width = int(self.rect.width) // SCALED_TILE_SIZE
+        height = int(self.rect.height) // SCALED_TILE_SIZE
+        return [
+            (x, y) for y in range(top, top + height) for x in range(left, left + width)
+        ]
+
+    def _young_plants_around(self, pos: tuple[int, int]) -> list[Sprite]:
+        plants = self.area.plants
+        young_plants = []
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                plant = plants.get((pos[0] + dx, pos[1] + dy))
+                if plant is not None and plant.z == Layer.PLANT:
+                    young_plants.append(plant)
+        return young_plants
+
+    def _tile_rect(self, pos: tuple[int, int]) -> pygame.Rect:
+        return pygame.Rect(
+            pos[0] * SCALED_TILE_SIZE - self.rect.left,
+            pos[1] * SCALED_TILE_SIZE - self.rect.top,
+            SCALED_TILE_SIZE,
+            SCALED_TILE_SIZE,
+        )
+
+    def _draw(
+        self,
+        clip: pygame.Rect,
+        positions: Iterable[tuple[int, int]],
+        young_plants: list[Sprite],
+    ):
+        """
+        Clear clip and redraw everything inside of it.
+        :param clip: Part of the surface to redraw
+        :param positions: All tiles inside of clip
+        :param young_plants: All young plants that may reach into clip
+        """
+        surface = self._surface
+        surface.set_clip(clip)
+        surface.fill((0, 0, 0, 0), clip)
+
+        tiles = self.area.tiles
+        for pos in positions:
+            tile = tiles.get(pos)
+            if tile is not None:
+                surface.blit(tile.image, self._tile_rect(pos))
+            water = self.water_frames.get(pos)
+            if water is not None:
+                surface.blit(water, self._tile_rect(pos))
+
+        # young plants are drawn in the order the render queue would draw
+        # them in, i.e. by the bottom of their hitbox
+        offset = (-self.rect.left, -self.rect.top)
+        for plant in sorted(young_plants, key=lambda plant: plant.hitbox_rect.bottom):
+            surface.blit(plant.image, plant.rect.move(offset))
+        surface.set_clip(None)
+
+    def draw(self, display_surface: pygame.Surface, rect: pygame.Rect, camera):
+        self.refresh()
+        super().draw(display_surface, rect, camera)
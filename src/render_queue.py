@@ -0,0 +1,218 @@
+import heapq
+from bisect import bisect_left, insort
+from collections.abc import Iterator
+
+import pygame
+
+from src.enums import Layer
+from src.settings import SCALED_TILE_SIZE
+from src.spatial_hash import SpatialHash
+
+# (hitbox bottom, insertion number, Sprite)
+# Insertion numbers are unique, so Sprites themselves are never compared
+type _Entry = tuple[float, int, pygame.sprite.Sprite]
+
+# size of the cells static Sprites are bucketed in, a few tiles wide so that
+# the viewport only covers a handful of cells per layer
+_CELL_SIZE = 4 * SCALED_TILE_SIZE
+
+
+class _LayerBucket:
+    """
+    All Sprites of the RenderQueue that share the same z layer.
+
+    Attributes:
+        static: Entries of all stationary Sprites, stored in a spatial hash by
+                the rect of their Sprite, as they never move
+        dynamic: Entries of all other Sprites, kept sorted by re-positioning
+                 single entries whenever their Sprite moves
+    """
+
+    static: SpatialHash[_Entry]
+    dynamic: list[_Entry]
+
+    def __init__(self):
+        self.static = SpatialHash(_CELL_SIZE)
+        self.dynamic = []
+
+    def add_static(self, entries: list[_Entry]):
+        for entry in entries:
+            self.static.insert(entry, entry[2].rect)
+
+    def iter_static(self, area: pygame.Rect) -> list[_Entry]:
+        """
+        :return: All static entries whose Sprite's rect collides with area,
+                 in drawing order
+        """
+        # only the cells covering the area are looked at, so the number of
+        # entries that have to be sorted does not depend on the map size
+        colliderect = area.colliderect
+        return sorted(
+            entry for entry in self.static.query(area) if colliderect(entry[2].rect)
+        )
+
+
+def _remove_entry(entries: list[_Entry], entry: _Entry):
+    del entries[bisect_left(entries, entry[:2])]
+
+
+class RenderQueue:
+    """
+    Sprites bucketed by their z layer, each bucket being kept in the order
+    the Sprites should be drawn in, i.e. by the bottom of their hitbox and
+    then by the order they have been added in.
+
+    Sprites are added as dynamic Sprites, whose position and layer are checked
+    once per refresh. Calling freeze_stationary moves all stationary Sprites
+    into the static part of their bucket. Static Sprites are never checked
+    again, and only the ones close to the drawn area are looked at.
+
+    Attributes:
+        _counter: Insertion number of the next added Sprite
+        _buckets: Bucket of each z layer
+        _static: z layer and entry of each static Sprite
+        _dynamic: z layer and entry of each dynamic Sprite
+        _pending: Insertion number of each dynamic Sprite that has not been
+                  positioned in its bucket yet
+    """
+
+    _counter: int
+    _buckets: dict[int, _LayerBucket]
+    _static: dict[pygame.sprite.Sprite, tuple[int, _Entry]]
+    _dynamic: dict[pygame.sprite.Sprite, tuple[int, _Entry]]
+    _pending: dict[pygame.sprite.Sprite, int]
+
+    def __init__(self):
+        self._counter = 0
+        self._buckets = {}
+        self._static = {}
+        self._dynamic = {}
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._static) + len(self._dynamic) + len(self._pending)
+
+    def __contains__(self, sprite: pygame.sprite.Sprite):
+        return (
+            sprite in self._static or sprite in self._dynamic or sprite in self._pending
+        )
+
+    def dynamic_sprites(self) -> Iterator[pygame.sprite.Sprite]:
+        """:return: All Sprites that have not been frozen"""
+        yield from self._dynamic
+        yield from self._pending
+
+    def _bucket(self, z: int) -> _LayerBucket:
+        bucket = self._buckets.get(z)
+        if bucket is None:
+            bucket = self._buckets[z] = _LayerBucket()
+        return bucket
+
+    def _position(self, sprite: pygame.sprite.Sprite, order: int) -> _Entry:
+        entry = sprite.hitbox_rect.bottom, order, sprite
+        self._dynamic[sprite] = sprite.z, entry
+        return entry
+
+    def add(self, sprite: pygame.sprite.Sprite):
+        """
+        Add a Sprite as a dynamic Sprite. It is drawn after all Sprites that
+        have already been added and share its layer and hitbox bottom.
+        """
+        if sprite in self:
+            return
+        # Sprites are only positioned on the next refresh, since their rects
+        # are usually not final while they are being added to their groups
+        self._pending[sprite] = self._counter
+        self._counter += 1
+
+    def remove(self, sprite: pygame.sprite.Sprite):
+        """Remove a Sprite. Does nothing if the Sprite has not been added."""
+        if sprite in self._static:
+            z, entry = self._static.pop(sprite)
+            self._buckets[z].static.remove(entry)
+        elif sprite in self._dynamic:
+            z, entry = self._dynamic.pop(sprite)
+            _remove_entry(self._buckets[z].dynamic, entry)
+        else:
+            self._pending.pop(sprite, None)
+
+    def update_static(self, sprite: pygame.sprite.Sprite):
+        """
+        Update the cells of a static Sprite after its rect has changed.
+        Does nothing if the Sprite has not been frozen.
+        """
+        if sprite in self._static:
+            z, entry = self._static[sprite]
+            self._buckets[z].static.update(entry, sprite.rect)
+
+    def clear(self):
+        self._buckets.clear()
+        self._static.clear()
+        self._dynamic.clear()
+        self._pending.clear()
+
+    def freeze_stationary(self):
+        """
+        Move all dynamic Sprites whose class is stationary into the static
+        part of their bucket.
+        """
+        self.refresh()
+        for bucket in self._buckets.values():
+            frozen = []
+            dynamic = []
+            for entry in bucket.dynamic:
+                if getattr(entry[2], "stationary", False):
+                    frozen.append(entry)
+                else:
+                    dynamic.append(entry)
+            if frozen:
+                bucket.dynamic = dynamic
+                bucket.add_static(frozen)
+                for entry in frozen:
+                    self._static[entry[2]] = self._dynamic.pop(entry[2])
+
+    def refresh(self):
+        """
+        Re-position all dynamic Sprites that have moved or changed their
+        layer since the last refresh.
+        """
+        moved = [
+            sprite
+            for sprite, (z, entry) in self._dynamic.items()
+            if sprite.z != z or sprite.hitbox_rect.bottom != entry[0]
+        ]
+        for sprite in moved:
+            z, entry = self._dynamic[sprite]
+            _remove_entry(self._buckets[z].dynamic, entry)
+            insort(self._bucket(sprite.z).dynamic, self._position(sprite, entry[1]))
+
+        if self._pending:
+            # A whole map's worth of Sprites can be pending at once, so they
+            # are appended to their buckets, which are then sorted only once
+            changed = set()
+            for sprite, order in self._pending.items():
+                bucket = self._bucket(sprite.z)
+                bucket.dynamic.append(self._position(sprite, order))
+                changed.add(bucket)
+            for bucket in changed:
+                bucket.dynamic.sort()
+            self._pending.clear()
+
+    def iter_visible(self, area: pygame.Rect) -> Iterator[pygame.sprite.Sprite]:
+        """
+        :param area: Area of the map that will be drawn (in world coordinates)
+        :return: All dynamic Sprites and all static Sprites colliding with
+                 area, layer by layer and in drawing order
+        """
+        for layer in Layer:
+            bucket = self._buckets.get(layer)
+            if bucket is None:
+                continue
+            if not bucket.dynamic:
+                entries = bucket.iter_static(area)
+            elif not len(bucket.static):
+                entries = bucket.dynamic
+            else:
+                entries = heapq.merge(bucket.iter_static(area), bucket.dynamic)
+            for entry in entries:
+                yield entry[2]
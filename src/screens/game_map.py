@@ -4,7 +4,6 @@ from collections.abc import Callable
 from typing import Any
 
 import pygame
-from pathfinding.core.grid import Grid
 from pytmx import TiledElement, TiledMap, TiledObject, TiledObjectGroup, TiledTileLayer
 
 from src.camera.camera_target import CameraTarget
@@ -37,6 +36,7 @@ from src.npc.behaviour.npc_behaviour_tree import NPCBehaviourTree
 from src.npc.chicken import Chicken
 from src.npc.cow import Cow
 from src.npc.npc import NPC
+from src.npc.pathfinding import PathfindingGrid
 from src.npc.setup import AIData
 from src.npc.utils import pf_add_matrix_collision
 from src.overlay.soil import SoilManager
@@ -55,6 +55,8 @@ from src.sprites.entities.player import Player
 from src.sprites.objects.berry_bush import BerryBush
 from src.sprites.objects.tree import Tree
 from src.sprites.setup import ENTITY_ASSETS
+from src.sprites.tile_chunk import TileChunkLayer
+from src.support import scaled_surface_cache
 
 
 def _setup_tile_layer(
@@ -91,13 +93,14 @@ def _setup_object_layer(
 
 
 def _setup_animal_ranges(
-    interaction_sprites: PersistentSpriteGroup, animals: list[Animal]
-) -> None:
-    if AIData.Matrix is None:
-        raise InvalidMapError("AI Pathfinding Matrix is not defined")
-
-    range_matrix_cows = [row.copy() for row in AIData.Matrix]
-    range_matrix_chickens = [row.copy() for row in AIData.Matrix]
+    pf_matrix: list[list[int]], interaction_sprites: PersistentSpriteGroup
+) -> tuple[PathfindingGrid, PathfindingGrid]:
+    """
+    :return: Pathfinding Grids of the areas cows and chickens are allowed to
+             move in (cow range grid, chicken range grid)
+    """
+    range_matrix_cows = [row.copy() for row in pf_matrix]
+    range_matrix_chickens = [row.copy() for row in pf_matrix]
 
     for sprite in interaction_sprites:
         if sprite.name in ["L_RANGE_BLOCKAGE", "R_RANGE_BLOCKAGE"]:
@@ -120,8 +123,7 @@ def _setup_animal_ranges(
                 (rect.width / SCALE_FACTOR, rect.height / SCALE_FACTOR),
             )
 
-    CowIndividualContext.range_grid = Grid(matrix=range_matrix_cows)
-    ChickenIndividualContext.range_grid = Grid(matrix=range_matrix_chickens)
+    return PathfindingGrid(range_matrix_cows), PathfindingGrid(range_matrix_chickens)
 
 
 def _setup_camera_layer(layer: TiledObjectGroup):
@@ -239,7 +241,17 @@ class GameMap:
                       TODO: This should probably be reworked to only load on
                        game start, as all maps are loaded on game start as well
 
+        _tile_chunk_layers: baked TileChunks of each static tile layer, by
+                            tile layer name
+
+        _camera_targets: camera targets of all cutscenes of the map
+        _zoom_areas: zoom areas of the map
+        _soil_layers: farmable tile layer of each study group
+
         _pf_matrix: pathfinding matrix
+        _pf_grid: PathfindingGrid created from the pathfinding matrix
+        _range_grids: pathfinding Grids of the areas cows and chickens are
+                      allowed to move in, or None if they have not been set up
 
         player_spawnpoint: default spawnpoint for the player
         player_entry_warps: warps where the player should enter the map,
@@ -257,10 +269,18 @@ class GameMap:
 
     _map_objects: MapObjects
 
+    _tile_chunk_layers: dict[str, TileChunkLayer]
+
+    _camera_targets: list[CameraTarget]
+    _zoom_areas: list[ZoomArea]
+    _soil_layers: dict[StudyGroup, TiledTileLayer]
+
     minigame_layer: TiledObjectGroup | None
 
     # pathfinding
     _pf_matrix: list[list[int]]
+    _pf_grid: PathfindingGrid | None
+    _range_grids: tuple[PathfindingGrid, PathfindingGrid] | None
 
     # map warp points
     player_spawnpoint: tuple[int, int] | None
@@ -298,6 +318,9 @@ class GameMap:
         frames: dict,
     ):
         self._tilemap = tilemap
+        self.save_file = save_file
+        self.scene_ani = scene_ani
+        self.zoom_man = zoom_man
 
         if "Player" not in self._tilemap.layernames:
             raise InvalidMapError("No Player layer could be found")
@@ -336,6 +359,12 @@ class GameMap:
 
         self._map_objects = MapObjects(self._tilemap)
 
+        self._tile_chunk_layers = {}
+
+        self._camera_targets = []
+        self._zoom_areas = []
+        self._soil_layers = {}
+
         self.minigame_layer = None
 
         self.player_spawnpoint = None
@@ -344,14 +373,56 @@ class GameMap:
         self.npcs = []
         self.animals = []
 
-        self._setup_layers(save_file, selected_map, scene_ani, zoom_man)
+        self._setup_layers(selected_map)
 
+        self._pf_grid = None
+        self._range_grids = None
         if SETUP_PATHFINDING:
-            AIData.update(self._pf_matrix, self.player, [*self.npcs, *self.animals])
+            self._pf_grid = PathfindingGrid(self._pf_matrix)
+            if ENABLE_NPCS:
+                self._range_grids = _setup_animal_ranges(
+                    self._pf_matrix, self.interaction_sprites
+                )
+
+        self.activate()
+
+    def activate(self):
+        """
+        Apply all state of this map that is shared with the rest of the game,
+        i.e. cutscene camera targets, zoom areas, soil areas and pathfinding
+        data. Called once the map has been set up, and again whenever the map
+        is re-entered after having been retained in the scene cache.
+        """
+
+        # We clear the target data first so that the cutscene from the previous
+        # room doesn't play again if the current one
+        # doesn't have any camera targets
+        self.scene_ani.reset()
+        self.scene_ani.clear()
+        if self._camera_targets:
+            self.scene_ani.set_target_points(self._camera_targets)
+
+        # Clearing the zoom manager in advance, in case no zoom areas exist for the current map
+        self.zoom_man.clear()
+        self.zoom_man.set_zoom_areas(self._zoom_areas)
+
+        for study_group, layer in self._soil_layers.items():
+            self.soil_manager.load_area(study_group, layer, self.save_file.soil_data)
+
+        if SETUP_PATHFINDING:
+            AIData.update(
+                self._pf_matrix,
+                self.player,
+                [*self.npcs, *self.animals],
+                self._pf_grid,
+            )
 
             if ENABLE_NPCS:
                 self._setup_emote_interactions()
-                _setup_animal_ranges(self.interaction_sprites, self.animals)
+                (
+                    CowIndividualContext.range_grid,
+                    ChickenIndividualContext.range_grid,
+                ) = self._range_grids
 
     @property
     def size(self):
@@ -368,12 +439,12 @@ class GameMap:
         """
         Create a new Sprite and add it to the given groups
         :param pos: Position of the Sprite (x, y)
-        :param surf: Surface that will be scaled up by SCALE_FACTOR and serve
+        :param surf: Surface whose copy scaled up by SCALE_FACTOR will serve
                      as image for the Sprite
         :param layer: z-Layer on which the Sprite should be displayed
         :param groups: Groups the Sprite should be added to
         """
-        image = pygame.transform.scale_by(surf, SCALE_FACTOR)
+        image = scaled_surface_cache.get(surf, SCALE_FACTOR)
         Sprite(pos, image, z=layer).add(groups)
 
     def _setup_collideable_tile(
@@ -396,6 +467,18 @@ class GameMap:
                 surf.get_size(),
             )
 
+    def _setup_tile_chunk_layer(self, tilemap_layer: TiledTileLayer, layer: Layer):
+        """
+        Bake all tiles of the given tile layer into TileChunks instead of
+        creating a separate Sprite for each tile
+        :param tilemap_layer: Static tile layer
+        :param layer: z-Layer on which the chunks should be displayed
+        """
+        chunk_layer = TileChunkLayer(self.all_sprites, layer)
+        for x, y, image in tilemap_layer.tiles():
+            chunk_layer.set_tile((x, y), image)
+        self._tile_chunk_layers[tilemap_layer.name] = chunk_layer
+
     def _setup_water_tile(
         self,
         pos: tuple[int, int],
@@ -567,7 +650,7 @@ class GameMap:
                     ),
                 )
         else:
-            surf = pygame.transform.scale_by(object_type.image, SCALE_FACTOR)
+            surf = scaled_surface_cache.get(object_type.image, SCALE_FACTOR)
             Sprite(pos, surf, z=layer).add(self.all_sprites)
 
     def _setup_player_warp(self, pos: tuple[int, int], obj: TiledObject):
@@ -711,51 +794,29 @@ class GameMap:
 
     # endregion
 
-    def _setup_layers(
-        self,
-        save_file: SaveFile,
-        gmap: Map,
-        scene_ani: SceneAnimation,
-        zoom_man: ZoomManager,
-    ):
+    def _setup_layers(self, gmap: Map):
         """
         Iterates over all map layers, updates the GameMap state and creates
         all Sprites for the map.
         """
-
-        # We clear the target data first so that the cutscene from the previous
-        # room doesn't play again if the current one
-        # doesn't have any camera targets
-        scene_ani.reset()
-        scene_ani.clear()
-
-        # Clearing the zoom manager in advance, in case no zoom areas exist for the current map
-        zoom_man.clear()
-
         for tilemap_layer in self._tilemap.layers:
             if isinstance(tilemap_layer, TiledTileLayer):
                 # create soil layer
+                # (soil areas are loaded when the map is activated)
                 if tilemap_layer.name == "farmable_ingroup":
-                    self.soil_manager.load_area(
-                        StudyGroup.INGROUP, tilemap_layer, save_file.soil_data
-                    )
+                    self._soil_layers[StudyGroup.INGROUP] = tilemap_layer
                     continue
                 elif tilemap_layer.name == "farmable_outgroup":
-                    self.soil_manager.load_area(
-                        StudyGroup.OUTGROUP, tilemap_layer, save_file.soil_data
-                    )
+                    self._soil_layers[StudyGroup.OUTGROUP] = tilemap_layer
                     continue
                 elif tilemap_layer.name == "Border":
+                    self._setup_tile_chunk_layer(tilemap_layer, Layer.BORDER)
+                    # the baked chunks are only drawn, so each tile still needs
+                    # its own Sprite to collide with
                     _setup_tile_layer(
                         tilemap_layer,
                         lambda pos, image: self._setup_collideable_tile(
-                            pos,
-                            image,
-                            Layer.BORDER,
-                            (
-                                self.all_sprites,
-                                self.collision_sprites,
-                            ),
+                            pos, image, Layer.BORDER, self.collision_sprites
                         ),
                     )
                     continue
@@ -775,8 +836,9 @@ class GameMap:
                         tilemap_layer,
                         lambda pos, _: self._setup_water_tile(pos, self.all_sprites),
                     )
-                else:
-                    # decorative and ground tiles will be created as base tile
+                elif layer == Layer.MAIN:
+                    # tiles on the MAIN layer need to be sorted together with
+                    # all entities, so they are created as separate base tiles
                     _setup_tile_layer(
                         tilemap_layer,
                         lambda pos, image: self._setup_base_tile(
@@ -786,6 +848,9 @@ class GameMap:
                             self.all_sprites,
                         ),
                     )
+                else:
+                    # all other decorative and ground tiles are static
+                    self._setup_tile_chunk_layer(tilemap_layer, layer)
 
             elif isinstance(tilemap_layer, TiledObjectGroup):
                 match tilemap_layer.name:
@@ -834,9 +899,9 @@ class GameMap:
                             tilemap_layer, lambda pos, obj: self._setup_animal(pos, obj)
                         )
                     case SpecialObjectLayer.CAMERA_TARGETS:
-                        scene_ani.set_target_points(_setup_camera_layer(tilemap_layer))
+                        self._camera_targets = list(_setup_camera_layer(tilemap_layer))
                     case SpecialObjectLayer.ZOOM_AREAS:
-                        zoom_man.set_zoom_areas(_setup_zoom_layer(tilemap_layer))
+                        self._zoom_areas = list(_setup_zoom_layer(tilemap_layer))
                     case _:
                         # set layer if defined in the TileLayer properties
                         layer = _get_element_property(
@@ -892,5 +957,20 @@ class GameMap:
         def on_emote_wheel_closed():
             self.player.unfocus_entity()
 
+    def set_tile(
+        self,
+        layer_name: str,
+        tile_pos: tuple[int, int],
+        surf: pygame.Surface | None,
+    ):
+        """
+        Replace a single tile of a static tile layer. Only the TileChunk
+        containing the tile will be baked again.
+        :param layer_name: Name of the tile layer
+        :param tile_pos: Position of the tile (in tiles)
+        :param surf: Unscaled image of the new tile, or None to remove it
+        """
+        self._tile_chunk_layers[layer_name].set_tile(tile_pos, surf)
+
     def get_size(self):
         return self._tilemap_scaled_size
@@ -14,9 +14,10 @@ from src.camera.zoom_manager import ZoomManager
 from src.enums import FarmingTool, GameState, Map, ScriptedSequenceType, StudyGroup
 from src.events import DIALOG_ADVANCE, DIALOG_SHOW, START_QUAKE, post_event
 from src.exceptions import GameMapWarning
-from src.groups import AllSprites, PersistentSpriteGroup
+from src.groups import AllSprites, CollisionSpriteGroup, PersistentSpriteGroup
 from src.gui.interface.emotes import NPCEmoteManager, PlayerEmoteManager
 from src.gui.scene_animation import SceneAnimation
+from src.level_of_detail import LevelOfDetail
 from src.npc.setup import AIData
 from src.overlay.game_time import GameTime
 from src.overlay.overlay import Overlay
@@ -27,11 +28,16 @@ from src.savefile import SaveFile
 from src.screens.game_map import GameMap
 from src.screens.minigames.base import Minigame
 from src.screens.minigames.cow_herding import CowHerding, CowHerdingState
+from src.screens.scene_cache import MapScene, SceneCache
 from src.settings import (
+    AI_LOD_INTERVAL,
+    AI_LOD_MARGIN,
     DEFAULT_ANIMATION_NAME,
     GAME_MAP,
     HEALTH_DECAY_VALUE,
+    PREFETCH_WARP_MAPS,
     SCALED_TILE_SIZE,
+    SCENE_CACHE_MEMORY_BUDGET,
     SCREEN_HEIGHT,
     SCREEN_WIDTH,
     MapDict,
@@ -42,7 +48,13 @@ from src.sprites.entities.character import Character
 from src.sprites.entities.player import Player
 from src.sprites.particle import ParticleSprite
 from src.sprites.setup import ENTITY_ASSETS
-from src.support import load_data, map_coords_to_tile, resource_path, save_data
+from src.support import (
+    LazyMapDict,
+    load_data,
+    resource_path,
+    save_data,
+)
+from src.timer import get_ticks
 
 _TO_PLAYER_SPEED_INCREASE_THRESHOLD = 200
 
@@ -64,7 +76,7 @@ class Level:
 
     # sprite groups
     all_sprites: AllSprites
-    collision_sprites: PersistentSpriteGroup
+    collision_sprites: CollisionSpriteGroup
     tree_sprites: PersistentSpriteGroup
     bush_sprites: PersistentSpriteGroup
     interaction_sprites: PersistentSpriteGroup
@@ -130,13 +142,18 @@ class Level:
         self.game_map = None
 
         self.all_sprites = AllSprites()
-        self.collision_sprites = PersistentSpriteGroup()
+        self.all_sprites.level_of_detail = LevelOfDetail(AI_LOD_INTERVAL, AI_LOD_MARGIN)
+        self.collision_sprites = CollisionSpriteGroup()
         self.tree_sprites = PersistentSpriteGroup()
         self.bush_sprites = PersistentSpriteGroup()
         self.interaction_sprites = PersistentSpriteGroup()
         self.drop_sprites = pygame.sprite.Group()
         self.player_exit_warps = pygame.sprite.Group()
 
+        # scenes of recently left maps, so that they don't need to be rebuilt
+        self.scene_cache = SceneCache(SCENE_CACHE_MEMORY_BUDGET)
+        self._current_scene: MapScene | None = None
+
         self.camera = Camera(0, 0)
         self.quaker = Quaker(self.camera)
 
@@ -206,20 +223,20 @@ class Level:
         self.get_round = get_set_round[0]
         self.set_round = get_set_round[1]
 
-    def load_map(self, game_map: Map, from_map: str = None):
-        # prepare level state for new map
-        # clear all sprite groups
-        self.all_sprites.empty()
-        self.collision_sprites.empty()
-        self.interaction_sprites.empty()
-        self.tree_sprites.empty()
-        self.bush_sprites.empty()
-        self.player_exit_warps.empty()
-
-        # clear existing soil_layer (not done due to the fact we need to keep hoed tiles in memory)
-        # self.soil_layer.reset()
-        self.quaker.reset()
+    @property
+    def _map_groups(self) -> tuple[pygame.sprite.AbstractGroup, ...]:
+        """All sprite groups that are filled by the current map"""
+        return (
+            self.all_sprites,
+            self.collision_sprites,
+            self.interaction_sprites,
+            self.tree_sprites,
+            self.bush_sprites,
+            self.player_exit_warps,
+        )
 
+    def _build_map(self, game_map: Map):
+        """Build the given map from its tilemap, filling all map groups."""
         self.game_map = GameMap(
             selected_map=game_map,
             tilemap=self.tmx_maps[game_map],
@@ -241,6 +258,34 @@ class Level:
             save_file=self.save_file,
         )
 
+    def load_map(self, game_map: Map, from_map: str = None):
+        # retain the map that is being left in the scene cache
+        # (the minigame map is changed by the minigame, so it is always rebuilt)
+        if self._current_scene is not None and self.current_map != Map.MINIGAME:
+            self.scene_cache.store(self.current_map, self._current_scene)
+        self._current_scene = None
+
+        # prepare level state for new map
+        # clear all sprite groups
+        for group in self._map_groups:
+            group.empty()
+
+        # clear existing soil_layer (not done due to the fact we need to keep hoed tiles in memory)
+        # self.soil_layer.reset()
+        self.quaker.reset()
+
+        scene = self.scene_cache.pop(game_map)
+        if scene is not None:
+            scene.restore()
+            self.game_map = scene.game_map
+            self.game_map.activate()
+        else:
+            self._build_map(game_map)
+            scene = MapScene.capture(self.game_map, self._map_groups)
+        self._current_scene = scene
+        self.all_sprites.index_stationary_sprites()
+        self.all_sprites.reset_level_of_detail()
+
         self.camera.change_size(*self.game_map.size)
 
         player_spawn = None
@@ -290,6 +335,10 @@ class Level:
 
         self.current_map = game_map
 
+        if PREFETCH_WARP_MAPS and isinstance(self.tmx_maps, LazyMapDict):
+            # parse all maps the player can warp to while they are on this map
+            self.tmx_maps.prefetch(warp.name for warp in self.player_exit_warps)
+
         # show intro scripted sequence only once
         if not self.intro_shown.get(game_map, False):
             self.intro_shown[game_map] = True
@@ -334,11 +383,13 @@ class Level:
     # plant collision
     def plant_collision(self, character: Character):
         area = self.soil_manager.get_area(character.study_group)
-        if area.plant_sprites:
-            for plant in area.plant_sprites:
+        harvestable = area.harvestable
+        if harvestable.any():
+            # only harvestable plants can be collected
+            for pos in area.positions(harvestable):
+                plant = area.plants[pos]
                 if plant.rect.colliderect(character.hitbox_rect):
-                    x, y = map_coords_to_tile(plant.rect.center)
-                    area.harvest((x, y), character.add_resource, self.create_particle)
+                    area.harvest(pos, character.add_resource, self.create_particle)
 
     def switch_to_map(self, map_name: Map):
         if self.tmx_maps.get(map_name):
@@ -426,7 +477,7 @@ class Level:
         # Starts timer for 60 seconds when player is in outgroup farm
         if collided_with_outgroup_farm:
             if not self.outgroup_farm_entered:
-                self.outgroup_farm_time_entered = pygame.time.get_ticks()
+                self.outgroup_farm_time_entered = get_ticks()
                 self.outgroup_farm_entered = True
 
         # Resets the timer when player exits the farm
@@ -438,7 +489,7 @@ class Level:
         # If the player is in the farm and 60 seconds (currently 30s) have passed
         if (
             self.outgroup_farm_entered
-            and pygame.time.get_ticks() - self.outgroup_farm_time_entered >= 30000
+            and get_ticks() - self.outgroup_farm_time_entered >= 30000
         ):
             # Checks if player has already received the message and is not part of the outgroup
             if (
@@ -455,14 +506,14 @@ class Level:
         # checks 60 seconds and 120 seconds after player joins outgroup to convert appearance
         if self.player.study_group == StudyGroup.OUTGROUP:
             if not self.start_become_outgroup:
-                self.start_become_outgroup_time = pygame.time.get_ticks()
+                self.start_become_outgroup_time = get_ticks()
                 self.start_become_outgroup = True
             elif self.finish_become_outgroup:
                 pass
-            elif pygame.time.get_ticks() - self.start_become_outgroup_time > 120000:
+            elif get_ticks() - self.start_become_outgroup_time > 120000:
                 self.player.has_outgroup_skin = True
                 self.finish_become_outgroup = True
-            elif pygame.time.get_ticks() - self.start_become_outgroup_time > 60000:
+            elif get_ticks() - self.start_become_outgroup_time > 60000:
                 self.player.has_horn = True
 
     def handle_event(self, event: pygame.event.Event) -> bool:
@@ -745,16 +796,32 @@ class Level:
                             self.display_surface, (0, 0, 0), start_pos, end_pos
                         )
 
+            if AIData.Cache is not None:
+                cache = AIData.Cache
+                cache_surf = self.font.render(
+                    f"Path cache: {cache.hit_rate:.0%} hits "
+                    f"({cache.hits}/{cache.hits + cache.misses})",
+                    False,
+                    "Black",
+                )
+                self.display_surface.blit(cache_surf, (20, SCREEN_HEIGHT - 50))
+
     # endregion
 
     def draw_overlay(self):
         self.sky.display(self.get_round())
         self.overlay.display()
 
-    def draw(self, dt: float, move_things: bool):
+    def draw(self, dt: float, move_things: bool, alpha: float = 1):
+        """
+        :param alpha: How far the drawn frame lies between the states of the
+                      world before and after the last update (see
+                      AllSprites.draw)
+        """
         self.player.hp = self.overlay.health_bar.hp
         self.display_surface.fill((130, 168, 132))
-        self.all_sprites.draw(self.camera)
+        self.camera.interpolate(alpha)
+        self.all_sprites.draw(self.camera, alpha)
         self.zoom_manager.apply_zoom()
         if move_things:
             self.sky.display(self.get_round())
@@ -792,10 +859,14 @@ class Level:
         self.day_transition.update()
         self.map_transition.update()
         if move_things:
+            self.collision_sprites.update_moving_sprites()
+            AIData.update_obstacles()
             if self.cutscene_animation.active:
                 self.all_sprites.update_blocked(dt)
             else:
-                self.all_sprites.update(dt)
+                self.all_sprites.update(dt, self.camera)
+            AIData.update_motion()
+            AIData.process_path_requests()
             self.update_cutscene(dt)
             self.quaker.update_quake(dt)
 
@@ -815,4 +886,3 @@ class Level:
             )
 
             self.decay_health()
-        self.draw(dt, move_things)
@@ -4,7 +4,6 @@ from typing import Type
 
 import pygame
 import pygame.gfxdraw
-from pathfinding.core.grid import Grid
 
 from src.controls import Controls
 from src.enums import Direction
@@ -12,6 +11,8 @@ from src.exceptions import MinigameSetupError
 from src.groups import PersistentSpriteGroup
 from src.npc.behaviour.cow_behaviour_tree import CowConditionalBehaviourTree
 from src.npc.cow import Cow
+from src.npc.flow_field import FleeField
+from src.npc.pathfinding import DiagonalMovement, PathfindingGrid
 from src.npc.setup import AIData
 from src.npc.utils import pf_add_matrix_collision
 from src.overlay.overlay import Overlay
@@ -25,7 +26,7 @@ from src.screens.minigames.cow_herding_overlay import (
     _CowHerdingOverlay,
     _CowHerdingScoreboard,
 )
-from src.settings import SCALE_FACTOR, SoundDict
+from src.settings import COW_FLEE_FIELD_RADIUS, SCALE_FACTOR, SoundDict
 from src.sprites.base import Sprite
 from src.sprites.entities.player import Player
 from src.sprites.setup import ENTITY_ASSETS
@@ -173,8 +174,13 @@ class CowHerding(Minigame):
         pf_add_matrix_collision(range_matrix, (obj.x, obj.y), (obj.width, obj.height))
 
         CowHerdingContext.default_grid = AIData.Grid
-        CowHerdingContext.barn_grid = Grid(matrix=barn_matrix)
-        CowHerdingContext.range_grid = Grid(matrix=range_matrix)
+        CowHerdingContext.barn_grid = PathfindingGrid(barn_matrix)
+        CowHerdingContext.range_grid = PathfindingGrid(range_matrix)
+        CowHerdingContext.flee_field = FleeField(
+            CowHerdingContext.default_grid,
+            DiagonalMovement.ONLY_WHEN_NO_OBSTACLE,
+            radius=COW_FLEE_FIELD_RADIUS,
+        )
 
         self._cows_total = len(self._cows)
 
@@ -1,7 +1,5 @@
 from enum import Enum
 
-from pathfinding.core.grid import Grid
-
 from src.npc.behaviour.ai_behaviour_tree_base import (
     Action,
     Condition,
@@ -10,15 +8,18 @@ from src.npc.behaviour.ai_behaviour_tree_base import (
     Sequence,
 )
 from src.npc.behaviour.cow_behaviour_tree import CowIndividualContext, player_nearby
+from src.npc.flow_field import FleeField
+from src.npc.pathfinding import PathfindingGrid
 from src.npc.setup import AIData
 from src.npc.utils import pf_wander
-from src.settings import SCALED_TILE_SIZE
 
 
 class CowHerdingContext:
-    barn_grid: Grid = None
-    default_grid: Grid = None
-    range_grid: Grid = None
+    barn_grid: PathfindingGrid = None
+    default_grid: PathfindingGrid = None
+    range_grid: PathfindingGrid = None
+    # shared by all cows, and only recomputed once the Player enters a new tile
+    flee_field: FleeField = None
 
 
 def wander_barn(context: CowIndividualContext) -> bool:
@@ -30,13 +31,8 @@ def wander_range(context: CowIndividualContext) -> bool:
 
 
 def flee_from_player(context: CowIndividualContext) -> bool:
-    return context.cow.flee_from_pos(
-        (
-            AIData.player.rect.centerx / SCALED_TILE_SIZE,
-            AIData.player.rect.centery / SCALED_TILE_SIZE,
-        ),
-        pf_grid=CowHerdingContext.default_grid,
-    )
+    CowHerdingContext.flee_field.set_goals((AIData.player.get_tile_pos(),))
+    return context.cow.flee_along(CowHerdingContext.flee_field)
 
 
 class CowHerdingBehaviourTree(NodeWrapper, Enum):
@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import pygame
+
+from src.enums import Map
+from src.screens.game_map import GameMap
+from src.sprites.tile_chunk import TileChunk
+from src.support import get_surface_bytes
+
+
+@dataclass
+class MapScene:
+    """
+    A built GameMap, together with the Sprites it has put into each of the
+    Level's sprite groups.
+
+    Attributes:
+        game_map: The built map
+        group_sprites: Sprites of the map, by the group they have been added to
+        size: Estimated memory usage of the map's Sprites (in bytes). The
+              baked images of TileChunks are not included, as their total
+              size is bounded by tile_chunk_cache instead
+    """
+
+    game_map: GameMap
+    group_sprites: dict[pygame.sprite.AbstractGroup, list[pygame.sprite.Sprite]] = (
+        field(default_factory=dict)
+    )
+    size: int = 0
+
+    @classmethod
+    def capture(
+        cls, game_map: GameMap, groups: tuple[pygame.sprite.AbstractGroup, ...]
+    ):
+        """
+        :return: A new scene holding all Sprites currently in the given groups
+        """
+        return cls(game_map, {group: group.sprites() for group in groups})
+
+    def retain(self):
+        """
+        Drop all Sprites that have been removed from their groups since the
+        scene has been captured, and estimate the memory usage of the rest.
+        Should be called right before the map is left.
+        """
+        images = {}
+        for group, sprites in self.group_sprites.items():
+            sprites[:] = [sprite for sprite in sprites if sprite in group]
+            for sprite in sprites:
+                if isinstance(sprite, TileChunk):
+                    continue
+                image = getattr(sprite, "image", None)
+                if image is not None:
+                    images[id(image)] = image
+        self.size = sum(get_surface_bytes(image) for image in images.values())
+
+    def restore(self):
+        """Add all Sprites of the scene back to their groups."""
+        for group, sprites in self.group_sprites.items():
+            group.add(*sprites)
+
+
+class SceneCache:
+    """
+    LRU cache of the scenes of recently left maps, so that re-entering a map
+    only has to re-activate its scene instead of building it again.
+
+    Attributes:
+        memory_budget: Maximum total estimated size of all cached scenes
+                       (in bytes). The least recently left scenes are evicted
+                       once it is exceeded
+        hits: Number of maps that could be re-activated from the cache
+        misses: Number of maps that had to be built
+        _scenes: Cached scenes, from least to most recently left
+    """
+
+    memory_budget: int
+    hits: int
+    misses: int
+
+    _scenes: OrderedDict[Map, MapScene]
+
+    def __init__(self, memory_budget: int):
+        self.memory_budget = memory_budget
+        self.hits = 0
+        self.misses = 0
+        self._scenes = OrderedDict()
+
+    def __len__(self):
+        return len(self._scenes)
+
+    def __contains__(self, game_map: Map):
+        return game_map in self._scenes
+
+    @property
+    def size(self) -> int:
+        """Total estimated size of all cached scenes (in bytes)"""
+        return sum(scene.size for scene in self._scenes.values())
+
+    def store(self, game_map: Map, scene: MapScene):
+        """
+        Retain the scene of a map that is being left, evicting the least
+        recently left scenes if the memory budget is exceeded.
+        """
+        scene.retain()
+        self._scenes[game_map] = scene
+        self._scenes.move_to_end(game_map)
+        while self._scenes and self.size > self.memory_budget:
+            self._scenes.popitem(last=False)
+
+    def pop(self, game_map: Map) -> MapScene | None:
+        """
+        :return: The cached scene of the given map, which is removed from the
+                 cache while it is active, or None if it is not cached
+        """
+        scene = self._scenes.pop(game_map, None)
+        if scene is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return scene
+
+    def clear(self):
+        self._scenes.clear()
@@ -1,3 +1,6 @@
+import sys
+from collections.abc import Mapping
+
 import pygame  # noqa
 import pygame.freetype
 import pytmx
@@ -7,7 +10,7 @@ from src.import_checks import *  # noqa: F403
 
 type Coordinate = tuple[int | float, int | float]
 type SoundDict = dict[str, pygame.mixer.Sound]
-type MapDict = dict[str, pytmx.TiledMap]
+type MapDict = Mapping[str, pytmx.TiledMap]
 type AniFrames = dict[str, list[pygame.Surface]]
 type GogglesStatus = bool | None
 type NecklaceStatus = bool | None
@@ -20,15 +23,68 @@ TILE_SIZE = 16
 CHAR_TILE_SIZE = 48
 SCALE_FACTOR = 4
 SCALED_TILE_SIZE = TILE_SIZE * SCALE_FACTOR
+# width and height (in tiles) of the chunks static tile layers are baked into
+TILE_CHUNK_SIZE = 16
+# maximum total size (in bytes) of all baked chunk images, each of which takes
+# up to 4 MiB. Images of chunks that have not been drawn for the longest time
+# are released (and baked again when needed) once this is exceeded
+TILE_CHUNK_MEMORY_BUDGET = 64 * 1024 * 1024
 
 RANDOM_SEED = 123456789
 
+# the game world is updated in fixed steps of UPDATE_DT seconds, independent
+# of the frame rate, and drawn frames are interpolated in between
+UPDATE_DT = 1 / 60
+# maximum number of frames drawn per second (0 for no limit)
+FRAME_RATE_CAP = 120
+# maximum time (in seconds) that is simulated per frame, so that the game
+# slows down instead of freezing after frames that took very long
+MAX_FRAME_TIME = 0.25
+
 GAME_MAP = Map.NEW_FARM
+# maximum estimated size (in bytes) of all maps retained by the scene cache,
+# not including baked chunk images (see TILE_CHUNK_MEMORY_BUDGET)
+SCENE_CACHE_MEMORY_BUDGET = 256 * 1024 * 1024
+# whether maps reachable through the current map's warps should be parsed in
+# the background (threads are not available in the browser build)
+PREFETCH_WARP_MAPS = sys.platform not in ("emscripten", "wasm")
 
 ENABLE_NPCS = True
 TEST_ANIMALS = True
 
 SETUP_PATHFINDING = any((ENABLE_NPCS, TEST_ANIMALS))
+# maximum number of tiles pathfinding searches of queued path requests should
+# expand per frame (at least one request is always processed per frame)
+PATH_REQUEST_BUDGET = 500
+# NPCs search long paths on an abstract graph of clusters of this many tiles
+# (in each direction) first, which is faster on large maps, but paths can be
+# slightly longer than the shortest ones
+HIERARCHICAL_PATHFINDING = False
+PATHFINDING_CLUSTER_SIZE = 10
+# paths between tiles closer than this (manhattan distance, in tiles) are
+# always searched directly
+HIERARCHICAL_PATHFINDING_MIN_DISTANCE = 20
+# AI-controlled Entities that are more than AI_LOD_MARGIN pixels off-screen
+# are only updated every AI_LOD_INTERVAL frames (1 updates them every frame)
+AI_LOD_INTERVAL = 4
+AI_LOD_MARGIN = 4 * SCALED_TILE_SIZE
+# whether AI-controlled Entities following a path should be moved all at once
+# in a vectorised step, after all Sprites have been updated (their collisions
+# are still resolved one by one, so this only breaks even at about a hundred
+# Entities, see benchmarks/batch_motion.py)
+BATCH_MOTION = False
+# maximum number of found paths that are cached for reuse
+PATH_CACHE_SIZE = 1024
+# number of worker processes that search paths in the background, or 0 to
+# search them on the main thread (processes are not available in the browser)
+PATHFINDING_WORKERS = 2 if sys.platform not in ("emscripten", "wasm") else 0
+# maximum number of path searches that may be pending in the worker processes
+# at once. They do not count against PATH_REQUEST_BUDGET, so further path
+# requests stay queued until some of the searches have finished
+PATHFINDING_MAX_JOBS = 4
+# cows of the cow herding minigame flee along a flow field that covers all
+# tiles at most this far away from the Player (in tiles)
+COW_FLEE_FIELD_RADIUS = 10
 
 EMOTE_SIZE = 48
 
@@ -0,0 +1,106 @@
+import math
+from collections.abc import Hashable, Iterator
+
+import pygame
+
+
+class SpatialHash[T: Hashable]:
+    """
+    Uniform grid bucketing objects by the area they cover in the world.
+
+    Every object is stored in each cell its rect overlaps, so that all objects
+    close to a given area can be retrieved by only looking at the cells
+    covering that area, instead of checking every single object.
+    """
+
+    cell_size: int
+
+    _cells: dict[tuple[int, int], dict[T, None]]
+    _object_cells: dict[T, tuple[int, int, int, int]]
+
+    def __init__(self, cell_size: int):
+        """
+        :param cell_size: Width and height of a single cell (in pixels)
+        """
+        self.cell_size = cell_size
+
+        # cells map to dicts instead of sets to keep them in insertion order
+        self._cells = {}
+        self._object_cells = {}
+
+    def __len__(self):
+        return len(self._object_cells)
+
+    def __contains__(self, obj: T):
+        return obj in self._object_cells
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._object_cells)
+
+    def _cell_range(
+        self, rect: pygame.Rect | pygame.FRect
+    ) -> tuple[int, int, int, int]:
+        """
+        :return: (first column, first row, last column, last row) of all cells
+                 covered by the given rect
+        """
+        left = math.floor(rect.left / self.cell_size)
+        top = math.floor(rect.top / self.cell_size)
+        right = max(left, math.ceil(rect.right / self.cell_size) - 1)
+        bottom = max(top, math.ceil(rect.bottom / self.cell_size) - 1)
+        return left, top, right, bottom
+
+    def insert(self, obj: T, rect: pygame.Rect | pygame.FRect):
+        """
+        Add obj to all cells covered by rect.
+        If obj has already been inserted, it is moved to its new cells instead.
+        """
+        cell_range = self._cell_range(rect)
+        old_range = self._object_cells.get(obj)
+        if old_range == cell_range:
+            return
+        if old_range is not None:
+            self.remove(obj)
+
+        left, top, right, bottom = cell_range
+        for y in range(top, bottom + 1):
+            for x in range(left, right + 1):
+                self._cells.setdefault((x, y), {})[obj] = None
+        self._object_cells[obj] = cell_range
+
+    # Moving an object is the same as re-inserting it, since insert will only
+    # touch the cells of an object if they changed
+    update = insert
+
+    def remove(self, obj: T):
+        """Remove obj from all cells it has been inserted into."""
+        cell_range = self._object_cells.pop(obj, None)
+        if cell_range is None:
+            return
+
+        left, top, right, bottom = cell_range
+        for y in range(top, bottom + 1):
+            for x in range(left, right + 1):
+                cell = self._cells[(x, y)]
+                del cell[obj]
+                if not cell:
+                    del self._cells[(x, y)]
+
+    def clear(self):
+        self._cells.clear()
+        self._object_cells.clear()
+
+    def query(self, rect: pygame.Rect | pygame.FRect) -> set[T]:
+        """
+        :return: All objects stored in cells covered by rect. Objects are not
+                 guaranteed to actually intersect with rect, only to be close
+                 to it.
+        """
+        found = set()
+        left, top, right, bottom = self._cell_range(rect)
+        for y in range(top, bottom + 1):
+            for x in range(left, right + 1):
+                cell = self._cells.get((x, y))
+                if cell:
+                    found.update(cell)
+        return found
@@ -1,14 +1,29 @@
 from abc import ABC
-from typing import Any
+from typing import Any, ClassVar
 
 import pygame
 
 from src.enums import Layer
 from src.map_objects import MapObjectType
 from src.settings import SCALE_FACTOR
+from src.support import scaled_surface_cache
 
 
 class Sprite(pygame.sprite.Sprite):
+    stationary: ClassVar[bool] = True
+    """Whether the Sprite keeps its position once it has been placed on the
+       map. Stationary Sprites are frozen in AllSprites' render queue and
+       are neither re-sorted nor drawn when off-screen, so Sprites that move
+       around should set this to False."""
+    throttle_off_screen: ClassVar[bool] = False
+    """Whether the Sprite may be updated less often while it is off-screen,
+       see LevelOfDetail. Its update method then receives the time that has
+       passed since its last update."""
+    cosmetic: ClassVar[bool] = False
+    """Whether updating the Sprite only changes how it looks. Such Sprites
+       are not updated by AllSprites if it has update_cosmetic set to False,
+       e.g. while the game is simulated without being drawn."""
+
     def __init__(
         self,
         pos: tuple[int | float, int | float],
@@ -49,7 +64,7 @@ class CollideableMapObject(CollideableSprite):
     ):
         self.object_type = object_type
 
-        surf = pygame.transform.scale_by(self.object_type.image, SCALE_FACTOR)
+        surf = scaled_surface_cache.get(self.object_type.image, SCALE_FACTOR)
 
         super().__init__(pos, surf, groups, z, name)
 
@@ -57,6 +72,8 @@ class CollideableMapObject(CollideableSprite):
 
 
 class AnimatedSprite(Sprite):
+    cosmetic = True
+
     def __init__(self, pos, frames, groups=None, z=Layer.MAIN):
         self.frames, self.frame_index = frames, 0
         super().__init__(pos, frames[0], groups, z)
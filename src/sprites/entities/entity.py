@@ -4,6 +4,7 @@ import pygame
 
 from src import settings
 from src.enums import Direction, EntityState, Layer
+from src.groups import CollisionSpriteGroup
 from src.gui.interface import indicators
 from src.settings import SCALED_TILE_SIZE
 from src.sprites.base import CollideableSprite, Sprite
@@ -12,6 +13,8 @@ from src.support import get_entity_facing_direction, screen_to_tile
 
 
 class Entity(CollideableSprite, ABC):
+    stationary = False
+
     frames: dict[str, settings.AniFrames]
     frame_index: int
     _current_ani_frame: list[pygame.Surface] | None
@@ -23,6 +26,10 @@ class Entity(CollideableSprite, ABC):
     speed: int
     collision_sprites: pygame.sprite.Group
 
+    off_screen: bool
+    """Whether the Entity is currently off-screen, in which case purely
+       cosmetic work like choosing its animation frame is skipped"""
+
     def __init__(
         self,
         pos: settings.Coordinate,
@@ -36,6 +43,7 @@ class Entity(CollideableSprite, ABC):
         self._current_ani = None
         self._current_hitbox = None
         self._current_frame = None
+        self.off_screen = False
 
         # Because the following three attributes are properties that depend on
         # each other, the first two of them must be set without calling their
@@ -88,6 +96,9 @@ class Entity(CollideableSprite, ABC):
         self._current_hitbox = self._current_ani.get_hitbox()
 
     def update_frame(self):
+        if self.off_screen:
+            # the frame is chosen once the Entity is on screen again
+            return
         self._current_frame = self._current_ani.get_frame(self.frame_index)
 
     @property
@@ -174,7 +185,13 @@ class Entity(CollideableSprite, ABC):
         """
         colliding_rect = None
 
-        for sprite in self.collision_sprites:
+        if isinstance(self.collision_sprites, CollisionSpriteGroup):
+            # only the Sprites close to the Entity can collide with it
+            candidates = self.collision_sprites.get_nearby_sprites(self.hitbox_rect)
+        else:
+            candidates = self.collision_sprites
+
+        for sprite in candidates:
             if sprite is not self:
                 if sprite.hitbox_rect.colliderect(self.hitbox_rect):
                     colliding_rect = sprite.hitbox_rect
@@ -207,6 +224,9 @@ class Entity(CollideableSprite, ABC):
 
         self.is_colliding = bool(colliding_rect)
 
+        if isinstance(self.collision_sprites, CollisionSpriteGroup):
+            self.collision_sprites.update_sprite(self)
+
     @abstractmethod
     def animate(self, dt: float):
         """
@@ -241,6 +261,8 @@ class Entity(CollideableSprite, ABC):
 
     def update_blocked(self, dt):
         """Only used when cutscenes are run, and entities are not meant to move."""
+        # cutscenes update all Entities in full, regardless of the camera
+        self.off_screen = False
         self._do_common_update_ops()
         self.animate(dt)
         self.image = self._current_frame
@@ -8,6 +8,9 @@ from src.sprites.base import Sprite
 
 
 class Plant(Sprite):
+    # Plants grow upwards from their Tile, which changes their rect
+    stationary = False
+
     def __init__(self, seed_type, groups, tile, frames):
         super().__init__(tile.rect.center, frames[0], groups, Layer.PLANT)
         self.rect.center = tile.rect.center + vector(0.5, -3) * SCALE_FACTOR
@@ -37,19 +40,21 @@ class Plant(Sprite):
     def on_harvestable(self, func: Callable[[bool], None]):
         self._on_harvestable_funcs.append(func)
 
-    def grow(self):
-        if self.tile.watered:
-            self.age += self.grow_speed
+    def set_age(self, age: float):
+        """
+        Show the plant at the given age. The age is kept by the SoilArea the
+        plant belongs to, which grows all of its plants at once.
+        """
+        self.age = age
 
-            if int(self.age) > 0:
-                self.z = Layer.MAIN
-                self.hitbox = self.rect.inflate(-26, -self.rect.height * 0.4)
+        if int(self.age) > 0:
+            self.z = Layer.MAIN
+            self.hitbox = self.rect.inflate(-26, -self.rect.height * 0.4)
 
-            if self.age >= self.max_age:
-                self.age = self.max_age
-                self.harvestable = True
+        if self.age >= self.max_age:
+            self.harvestable = True
 
-            self.image = self.frames[int(self.age)]
-            self.rect = self.image.get_frect(
-                midbottom=self.tile.rect.midbottom + vector(0, 2)
-            )
+        self.image = self.frames[int(self.age)]
+        self.rect = self.image.get_frect(
+            midbottom=self.tile.rect.midbottom + vector(0, 2)
+        )
@@ -0,0 +1,272 @@
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+from src.settings import (
+    SCALE_FACTOR,
+    SCALED_TILE_SIZE,
+    TILE_CHUNK_MEMORY_BUDGET,
+    TILE_CHUNK_SIZE,
+    TILE_SIZE,
+)
+from src.sprites.base import Sprite
+from src.support import get_surface_bytes
+
+
+class TileChunk(Sprite):
+    """
+    Square area of a single tile layer, whose tiles are baked into one
+    Surface so that they can be drawn with a single blit.
+
+    Only the area covered by tiles is baked, which still takes up to
+    (TILE_CHUNK_SIZE * SCALED_TILE_SIZE)^2 * 4 bytes (4 MiB) per chunk. The
+    baked images of all chunks are kept in tile_chunk_cache, which releases
+    the images of the chunks that have not been drawn for the longest time
+    once TILE_CHUNK_MEMORY_BUDGET is exceeded. Released chunks are baked
+    again the next time they are drawn.
+
+    Attributes:
+        area: Area covered by the chunk's tiles (in world coordinates). The
+              chunk's hitbox always covers the whole area, so that the chunks
+              of different tile layers are always drawn in the same order
+        _tiles: Unscaled image of each tile, by tile position
+        _bounds: Area covered by all tiles (in unscaled pixels, relative to
+                 the chunk's area), or None if the chunk has no tiles
+        _image_offset: Position of the baked image relative to rect
+        _dirty: Whether the image has to be baked before it is drawn again
+        _cache_ref: Reference through which tile_chunk_cache tracks the baked
+                    image, or None if the chunk has no baked image
+    """
+
+    area: pygame.Rect
+
+    _tiles: dict[tuple[int, int], pygame.Surface]
+    _bounds: pygame.Rect | None
+    _image_offset: tuple[int, int]
+    _dirty: bool
+    _cache_ref: weakref.ReferenceType["TileChunk"] | None
+
+    def __init__(
+        self,
+        chunk_pos: tuple[int, int],
+        z: int,
+    ):
+        """
+        :param chunk_pos: Position of the chunk (in chunks)
+        :param z: z-Layer on which the chunk should be displayed
+        """
+        size = TILE_CHUNK_SIZE * SCALED_TILE_SIZE
+        self.area = pygame.Rect(chunk_pos[0] * size, chunk_pos[1] * size, size, size)
+        self._tiles = {}
+        self._bounds = None
+        self._image_offset = (0, 0)
+        self._dirty = False
+        self._cache_ref = None
+
+        super().__init__(self.area.topleft, pygame.Surface((0, 0)), z=z)
+        self.rect = self.area.copy()
+        self.hitbox_rect = pygame.FRect(self.area)
+
+    def _tile_rect(self, tile_pos: tuple[int, int], surf: pygame.Surface):
+        """
+        :return: Area covered by the tile (in unscaled pixels, relative to
+                 the chunk's area)
+        """
+        return surf.get_rect(
+            topleft=(
+                tile_pos[0] * TILE_SIZE - self.area.x // SCALE_FACTOR,
+                tile_pos[1] * TILE_SIZE - self.area.y // SCALE_FACTOR,
+            )
+        )
+
+    def set_tile(self, tile_pos: tuple[int, int], surf: pygame.Surface | None):
+        """
+        Replace the tile at the given position. The chunk's image is baked
+        again the next time it is drawn.
+        :param tile_pos: Position of the tile on the map (in tiles)
+        :param surf: Unscaled image of the tile, or None to remove the tile
+        """
+        if surf is None:
+            self._tiles.pop(tile_pos, None)
+            rects = [self._tile_rect(pos, tile) for pos, tile in self._tiles.items()]
+            self._bounds = rects[0].unionall(rects[1:]) if rects else None
+        else:
+            self._tiles[tile_pos] = surf
+            rect = self._tile_rect(tile_pos, surf)
+            self._bounds = self._bounds.union(rect) if self._bounds else rect
+        self._dirty = True
+
+        # oversized tiles can reach out of the chunk's area
+        rect = self.area.copy()
+        if self._bounds:
+            rect.union_ip(
+                pygame.Rect(
+                    self.area.x + self._bounds.x * SCALE_FACTOR,
+                    self.area.y + self._bounds.y * SCALE_FACTOR,
+                    self._bounds.width * SCALE_FACTOR,
+                    self._bounds.height * SCALE_FACTOR,
+                )
+            )
+        if rect != self.rect:
+            self.rect = rect
+            # groups that have already indexed the chunk by its rect
+            for group in self.groups():
+                if hasattr(group, "update_sprite"):
+                    group.update_sprite(self)
+
+    def bake(self):
+        """
+        Blit all tiles onto a new image. Tiles are blitted unscaled, and the
+        whole image is scaled up by SCALE_FACTOR afterwards.
+        """
+        self._dirty = False
+        if self._bounds is None:
+            tile_chunk_cache.discard(self)
+            self.image = pygame.Surface((0, 0))
+            return
+
+        surf = pygame.Surface(self._bounds.size, pygame.SRCALPHA)
+        # tiles are drawn ordered by their bottom, just like separate Sprites
+        for pos, tile in sorted(
+            self._tiles.items(),
+            key=lambda item: item[0][1] * TILE_SIZE + item[1].get_height(),
+        ):
+            rect = self._tile_rect(pos, tile)
+            surf.blit(tile, rect.move(-self._bounds.x, -self._bounds.y))
+
+        self.image = pygame.transform.scale_by(surf, SCALE_FACTOR)
+        if pygame.display.get_surface() is not None:
+            # blitting is faster if the image has the display's pixel format
+            self.image = self.image.convert_alpha()
+        tile_chunk_cache.add(self)
+        self._image_offset = (
+            self.area.x + self._bounds.x * SCALE_FACTOR - self.rect.x,
+            self.area.y + self._bounds.y * SCALE_FACTOR - self.rect.y,
+        )
+
+    def release(self):
+        """
+        Drop the baked image to free its memory. The chunk is baked again the
+        next time it is drawn.
+        """
+        tile_chunk_cache.discard(self)
+        self.image = pygame.Surface((0, 0))
+        self._dirty = True
+
+    def draw(self, display_surface: pygame.Surface, rect: pygame.Rect, camera):
+        if self._dirty:
+            self.bake()
+        else:
+            tile_chunk_cache.touch(self)
+        display_surface.blit(self.image, rect.move(self._image_offset))
+
+
+class TileChunkCache:
+    """
+    LRU of the baked images of all TileChunks, whose total size is kept
+    within a memory budget. Chunks are only referenced weakly, so that the
+    chunks of maps that are no longer used can still be garbage collected.
+
+    Attributes:
+        memory_budget: Maximum total size of all baked images (in bytes). The
+                       images of the least recently drawn chunks are released
+                       once it is exceeded
+        bytes: Total size of all baked images (in bytes)
+        _chunks: Size of the image of each chunk, from least to most recently
+                 drawn
+    """
+
+    memory_budget: int
+    bytes: int
+
+    _chunks: OrderedDict[weakref.ReferenceType[TileChunk], int]
+
+    def __init__(self, memory_budget: int):
+        self.memory_budget = memory_budget
+        self.bytes = 0
+        self._chunks = OrderedDict()
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def _forget(self, ref: weakref.ReferenceType[TileChunk]):
+        size = self._chunks.pop(ref, None)
+        if size is not None:
+            self.bytes -= size
+
+    def add(self, chunk: TileChunk):
+        """
+        Track the newly baked image of a chunk, releasing the images of the
+        least recently drawn chunks if the memory budget is exceeded.
+        """
+        self.discard(chunk)
+        size = get_surface_bytes(chunk.image)
+        chunk._cache_ref = weakref.ref(chunk, self._forget)
+        self._chunks[chunk._cache_ref] = size
+        self.bytes += size
+
+        # the chunk that has just been baked is about to be drawn
+        while self.bytes > self.memory_budget and len(self._chunks) > 1:
+            oldest = next(iter(self._chunks))()
+            oldest.release()
+
+    def touch(self, chunk: TileChunk):
+        """Mark the image of a chunk as the most recently drawn one."""
+        if chunk._cache_ref in self._chunks:
+            self._chunks.move_to_end(chunk._cache_ref)
+
+    def discard(self, chunk: TileChunk):
+        """Stop tracking the image of a chunk."""
+        if chunk._cache_ref is not None:
+            self._forget(chunk._cache_ref)
+            chunk._cache_ref = None
+
+    def clear(self):
+        """Release the images of all chunks."""
+        for ref in list(self._chunks):
+            chunk = ref()
+            if chunk is not None:
+                chunk.release()
+        self._chunks.clear()
+        self.bytes = 0
+
+
+tile_chunk_cache = TileChunkCache(TILE_CHUNK_MEMORY_BUDGET)
+
+
+class TileChunkLayer:
+    """All TileChunks of a single tile layer."""
+
+    groups: tuple[pygame.sprite.Group, ...] | pygame.sprite.Group
+    z: int
+    chunks: dict[tuple[int, int], TileChunk]
+
+    def __init__(
+        self,
+        groups: tuple[pygame.sprite.Group, ...] | pygame.sprite.Group,
+        z: int,
+    ):
+        """
+        :param groups: Groups all chunks should be added to
+        :param z: z-Layer on which the chunks should be displayed
+        """
+        self.groups = groups
+        self.z = z
+        self.chunks = {}
+
+    def set_tile(self, tile_pos: tuple[int, int], surf: pygame.Surface | None):
+        """
+        Replace the tile at the given position. Only the chunk containing
+        the tile is invalidated.
+        :param tile_pos: Position of the tile on the map (in tiles)
+        :param surf: Unscaled image of the tile, or None to remove the tile
+        """
+        chunk_pos = (tile_pos[0] // TILE_CHUNK_SIZE, tile_pos[1] // TILE_CHUNK_SIZE)
+        chunk = self.chunks.get(chunk_pos)
+        if chunk is None:
+            if surf is None:
+                return
+            chunk = self.chunks[chunk_pos] = TileChunk(chunk_pos, self.z)
+            chunk.add(self.groups)
+        chunk.set_tile(tile_pos, surf)
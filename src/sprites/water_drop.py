@@ -7,6 +7,8 @@ from src.sprites.base import Sprite
 
 
 class WaterDrop(Sprite):
+    stationary = False
+
     def __init__(self, pos, surf, groups, moving, z):
         super().__init__(pos, surf, groups, z)
         self.timer = timer.Timer(
@@ -14,7 +16,7 @@ class WaterDrop(Sprite):
             autostart=True,
             func=self.kill,
         )
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = timer.get_ticks()
         self.moving = moving
 
         if moving:
@@ -3,9 +3,13 @@ import math
 import os
 import random
 import sys
-from collections.abc import Generator
+import threading
+import weakref
+from collections.abc import Generator, Iterable, Iterator, Mapping
 from dataclasses import dataclass
+from functools import lru_cache
 
+import numpy as np
 import pygame
 import pygame.freetype
 import pygame.gfxdraw
@@ -50,6 +54,76 @@ def import_image(img_path: str, alpha: bool = True) -> pygame.Surface:
     return pygame.transform.scale_by(surf, SCALE_FACTOR)
 
 
+def get_surface_bytes(surf: pygame.Surface) -> int:
+    return surf.get_pitch() * surf.get_height()
+
+
+class ScaledSurfaceCache:
+    """
+    Process-wide cache of scaled copies of Surfaces, keyed by the identity of
+    the source Surface and the scale factor.
+
+    Tile images are shared by all tiles with the same GID, so every tile (or
+    map object) of the same GID will share one scaled Surface as well.
+    Entries are dropped as soon as their source Surface is garbage collected.
+    The returned Surfaces are shared and should therefore never be modified.
+
+    Attributes:
+        hits: Number of lookups that returned an already scaled Surface
+        misses: Number of lookups that had to scale the source Surface
+        bytes: Total size of all currently cached Surfaces (in bytes)
+    """
+
+    hits: int
+    misses: int
+    bytes: int
+
+    _entries: dict[
+        tuple[int, float], tuple[weakref.ReferenceType[pygame.Surface], pygame.Surface]
+    ]
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self, key: tuple[int, float], ref: weakref.ReferenceType):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is ref:
+            del self._entries[key]
+            self.bytes -= get_surface_bytes(entry[1])
+
+    def get(self, surf: pygame.Surface, scale: float = SCALE_FACTOR) -> pygame.Surface:
+        """
+        :return: surf scaled by scale. The Surface is only scaled on the first
+                 lookup, all subsequent lookups return the same Surface.
+        """
+        key = (id(surf), scale)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is surf:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        scaled = pygame.transform.scale_by(surf, scale)
+        ref = weakref.ref(surf, lambda r, k=key: self._evict(k, r))
+        self._entries[key] = (ref, scaled)
+        self.bytes += get_surface_bytes(scaled)
+        return scaled
+
+    def clear(self):
+        """Drop all cached Surfaces and reset the counters."""
+        self._entries.clear()
+        self.hits = self.misses = self.bytes = 0
+
+
+scaled_surface_cache = ScaledSurfaceCache()
+
+
 def import_folder(fold_path: str) -> list[pygame.Surface]:
     frames = []
     for folder_path, _, file_names in os.walk(resource_path(fold_path)):
@@ -74,13 +148,86 @@ def import_folder_dict(fold_path: str) -> dict[str, pygame.Surface]:
     return frames
 
 
-def tmx_importer(tmx_path: str) -> settings.MapDict:
+class LazyMapDict(Mapping[str, pytmx.TiledMap]):
+    """
+    Mapping of map names to TiledMaps, which only parses the TMX file of a
+    map the first time the map is accessed.
+
+    Maps can also be parsed ahead of time on a background thread through
+    prefetch, e.g. all maps the player could warp to from the current map.
+    Accessing a map that is currently being prefetched waits for it to be
+    parsed instead of parsing it a second time.
+
+    Attributes:
+        _paths: Path of the TMX file of each map
+        _maps: All maps that have already been parsed
+        _locks: Lock of each map, held while the map is being parsed
+    """
+
+    _paths: dict[str, str]
+    _maps: dict[str, pytmx.TiledMap]
+    _locks: dict[str, threading.Lock]
+
+    def __init__(self, paths: dict[str, str]):
+        """
+        :param paths: Path of the TMX file of each map, by map name
+        """
+        self._paths = paths
+        self._maps = {}
+        self._locks = {name: threading.Lock() for name in paths}
+
+    def __getitem__(self, name: str) -> pytmx.TiledMap:
+        tilemap = self._maps.get(name)
+        if tilemap is not None:
+            return tilemap
+
+        path = self._paths[name]
+        with self._locks[name]:
+            if name not in self._maps:
+                self._maps[name] = pytmx.util_pygame.load_pygame(path)
+        return self._maps[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, name: object):
+        return name in self._paths
+
+    def is_loaded(self, name: str) -> bool:
+        """:return: Whether the TMX file of the given map has been parsed"""
+        return name in self._maps
+
+    def prefetch(self, names: Iterable[str]) -> threading.Thread | None:
+        """
+        Parse the given maps on a background thread. Names that are not in
+        the mapping, as well as maps that have already been parsed, are
+        skipped.
+        :return: The started thread, or None if there was nothing to parse
+        """
+        names = [
+            name for name in names if name in self._paths and name not in self._maps
+        ]
+        if not names:
+            return None
+
+        def load():
+            for name in names:
+                self[name]
+
+        thread = threading.Thread(target=load, name="map prefetch", daemon=True)
+        thread.start()
+        return thread
+
+
+def tmx_importer(tmx_path: str) -> LazyMapDict:
     files = {}
     for folder_path, _, file_names in os.walk(resource_path(tmx_path)):
         for file_name in file_names:
-            full_path = os.path.join(folder_path, file_name)
-            files[file_name.split(".")[0]] = pytmx.util_pygame.load_pygame(full_path)
-    return files
+            files[file_name.split(".")[0]] = os.path.join(folder_path, file_name)
+    return LazyMapDict(files)
 
 
 def animation_importer(
@@ -172,74 +319,98 @@ class WeightedCoordinate:
     weight: float = 0
 
 
-def get_flight_matrix(
-    pos: tuple[int, int], radius: int
-) -> list[list[WeightedCoordinate]]:
+def get_flight_matrix(pos: tuple[int, int], radius: int) -> np.ndarray:
     """
-    Returns a matrix with the width and height of radius * 2 + 1, with
-    WeightedCoordinate objects of a weight between 0 and 1, where 0 is the most
-    preferred flight position, and 1 the least preferred flight position.
+    Returns a matrix with the width and height of radius * 2 + 1, with the
+    weight of each position, where lower weights stand for more preferred
+    flight positions. The matrix is indexed by [y, x].
 
     The position from which the flight is to be started is always in the centre
     of the matrix, and will have an infinite weight.
 
     The position of the object to be fled from should be
     relative to the start position, but does not have to be within the
-    matrix coordinates.
+    matrix coordinates. It is rounded to the nearest tile.
+
+    Matrices are cached, so the returned array is read-only.
 
     :param pos: Position of the object that should be fled from
     :param radius: Radius / distance of the flight vector.
                    The returned matrix has a width and height of radius * 2 + 1
-    :return: Matrix with positions that can be fled to
+    :return: Weights of the positions that can be fled to
+    """
+    return _get_flight_field((round(pos[0]), round(pos[1])), radius)[0]
+
+
+@lru_cache
+def _get_flight_angles(radius: int) -> np.ndarray:
+    """
+    :return: Angle from the centre of a flight matrix to each of its positions
     """
+    # np.arctan2 can differ from math.atan2 in the last bit, which would change
+    # the order of positions with (almost) equal weights. These angles do not
+    # depend on the position to flee from, so they are only calculated once
+    diameter = radius * 2 + 1
+    angles = np.array(
+        [
+            [math.atan2(radius - x, radius - y) for x in range(diameter)]
+            for y in range(diameter)
+        ]
+    )
+    angles.flags.writeable = False
+    return angles
+
 
+@lru_cache(maxsize=1024)
+def _get_flight_field(
+    pos: tuple[int, int], radius: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    :return: The flight matrix of get_flight_matrix, and the flat indices of
+             all its positions, sorted by their weight
+    """
     diameter = radius * 2 + 1
 
     p1 = (radius, radius)
     p2 = (pos[0] + radius, pos[1] + radius)
 
-    matrix = [
-        [WeightedCoordinate(x, y) for x in range(diameter)] for y in range(diameter)
-    ]
+    y, x = np.indices((diameter, diameter))
 
     # The exact angle of the position that should be fled from, measured from
     # the centre of the matrix
     dangerous_angle = math.atan2((p1[0] - p2[0]), (p1[1] - p2[1]))
+    # Angle from the centre of the matrix to each position
+    current_angle = _get_flight_angles(radius)
+    # Angular distance of the dangerous angle and the current angle
+    distance_ = dangerous_angle - current_angle
 
-    for y in range(len(matrix)):
-        for x in range(len(matrix[0])):
-            # Angle from the centre of the matrix to the currently checked pos
-            current_angle = math.atan2((p1[0] - x), (p1[1] - y))
-            # Angular distance of the dangerous angle and the current angle
-            distance_ = dangerous_angle - current_angle
+    # Distance could be greater than half a turn,
+    # in which case the result is rotated to the other extreme
+    distance_[distance_ > math.pi] -= math.pi * 2
+    distance_[distance_ < -math.pi] += math.pi * 2
 
-            # Distance could be greater than half a turn,
-            # in which case the result is rotated to the other extreme
-            if distance_ > math.pi:
-                distance_ = distance_ - (math.pi * 2)
-            elif distance_ < -math.pi:
-                distance_ = distance_ + (math.pi * 2)
+    weights = ((p2[0] - x) ** 2 + (p2[1] - y) ** 2) ** 0.5
+    weights *= np.abs(distance_ / math.pi)
 
-            matrix[y][x].weight = distance(p2, (x, y))
-            matrix[y][x].weight *= abs(distance_ / math.pi)
+    weights[radius, radius] = float("inf")
 
-    matrix[radius][radius].weight = float("inf")
+    # positions with the same weight stay in row-major order
+    order = np.argsort(weights, axis=None, kind="stable")
 
-    return matrix
+    weights.flags.writeable = False
+    order.flags.writeable = False
+    return weights, order
 
 
 def get_sorted_flight_vectors(
     pos: tuple[int, int], radius: int
 ) -> Generator[WeightedCoordinate, None, None]:
-    flight_matrix = get_flight_matrix(pos, radius)
-
-    x = []
-    for row in flight_matrix:
-        for col in row:
-            x.append(col)
+    weights, order = _get_flight_field((round(pos[0]), round(pos[1])), radius)
+    diameter = radius * 2 + 1
 
-    for coord in sorted(x, key=lambda i: i.weight):
-        yield coord
+    for index in order.tolist():
+        y, x = divmod(index, diameter)
+        yield WeightedCoordinate(x, y, weights[y, x].item())
 
 
 def draw_aa_line(
@@ -0,0 +1,109 @@
+import unittest
+
+import pygame
+
+from src.groups import CollisionSpriteGroup
+from src.npc.bases.ai_behaviour import AIBehaviour
+from src.npc.bases.ai_behaviour_base import AIState
+from src.npc.batch_motion import BatchMotion
+from src.sprites.base import Sprite
+
+
+class PathEntity(AIBehaviour):
+    def __init__(self, path: list[tuple[float, float]]):
+        Sprite.__init__(self, (0, 0), pygame.Surface((48, 48)))
+        AIBehaviour.__init__(self, None)
+        self._current_hitbox = pygame.FRect(4, 20, 40, 24)
+        self.hitbox_rect = self._current_hitbox.copy()
+        self.last_hitbox_rect = self.hitbox_rect.copy()
+        self.collision_sprites = CollisionSpriteGroup()
+        self.is_colliding = False
+        self.direction = pygame.Vector2()
+        self.speed = 150
+        self.pf_path = list(path)
+        self.pf_state = AIState.MOVING
+
+    def animate(self, dt: float):
+        pass
+
+
+class TestBatchMotion(unittest.TestCase):
+    path = [(1.5, 0.5), (2.5, 1.5), (2.5, 3.5), (0.5, 1.5)]
+
+    def tearDown(self):
+        PathEntity.pf_motion = None
+
+    def test_moves_like_update_moving(self):
+        single = PathEntity(self.path)
+        batched = PathEntity(self.path)
+        motion = BatchMotion()
+
+        frames = 0
+        while single.pf_state == AIState.MOVING and frames < 600:
+            frames += 1
+            PathEntity.pf_motion = None
+            single.move(1 / 60)
+            PathEntity.pf_motion = motion
+            batched.move(1 / 60)
+            self.assertEqual(len(motion), 1)
+            motion.update()
+
+            self.assertEqual(len(motion), 0)
+            self.assertEqual(batched.rect.topleft, single.rect.topleft)
+            self.assertEqual(batched.direction, single.direction)
+            self.assertEqual(batched.pf_path, single.pf_path)
+            self.assertEqual(batched.pf_state, single.pf_state)
+
+        self.assertEqual(batched.pf_state, AIState.IDLE)
+        self.assertEqual(batched.pf_path, [])
+
+    def test_aborted_paths_are_not_moved(self):
+        entity = PathEntity(self.path)
+        motion = BatchMotion()
+        PathEntity.pf_motion = motion
+        entity.move(1 / 60)
+        entity.abort_path()
+        position = entity.rect.topleft
+
+        motion.update()
+        self.assertEqual(entity.rect.topleft, position)
+
+    def test_new_paths_are_picked_up(self):
+        single = PathEntity(self.path)
+        batched = PathEntity(self.path)
+        motion = BatchMotion()
+
+        for frame in range(120):
+            if frame == 30:
+                # a path replaced or extended after the Entity has been pushed
+                for entity in (single, batched):
+                    entity.pf_path = [(0.5, 0.5), (3.5, 0.5)]
+            if frame == 60:
+                for entity in (single, batched):
+                    entity.pf_path.append((3.5, 2.5))
+            PathEntity.pf_motion = None
+            single.move(1 / 60)
+            PathEntity.pf_motion = motion
+            batched.move(1 / 60)
+            motion.update()
+
+            self.assertEqual(batched.rect.topleft, single.rect.topleft)
+            self.assertEqual(batched.pf_path, single.pf_path)
+
+    def test_rows_are_kept_until_cleared(self):
+        # more Entities than the arrays initially have rows for
+        entities = [PathEntity(self.path) for _ in range(20)]
+        motion = BatchMotion()
+        PathEntity.pf_motion = motion
+        for _ in range(10):
+            for entity in entities:
+                entity.move(1 / 60)
+            motion.update()
+        self.assertEqual(motion._entities, entities)
+
+        motion.clear()
+        self.assertEqual(motion._entities, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
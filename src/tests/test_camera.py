@@ -0,0 +1,48 @@
+import unittest
+
+import pygame
+
+from src.camera import Camera
+from src.settings import SCREEN_HEIGHT, SCREEN_WIDTH
+from src.sprites.base import Sprite
+
+
+class TestCameraInterpolation(unittest.TestCase):
+    def setUp(self):
+        self.camera = Camera(SCREEN_WIDTH * 4, SCREEN_HEIGHT * 4)
+        self.target = Sprite((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.Surface((8, 8)))
+        self.camera.update(self.target)
+        self.offset = pygame.Vector2(self.camera.state.topleft)
+
+    def test_frames_lie_between_updates(self):
+        self.target.rect.x += 20
+        self.camera.update(self.target)
+
+        self.camera.interpolate(0)
+        self.assertEqual(
+            self.camera.apply(self.target).topleft,
+            self.target.rect.move(self.offset).topleft,
+        )
+        self.camera.interpolate(0.5)
+        self.assertEqual(
+            self.camera.apply(self.target).topleft,
+            self.target.rect.move(self.offset - (10, 0)).topleft,
+        )
+        self.camera.interpolate(1)
+        self.assertEqual(
+            self.camera.apply(self.target).topleft,
+            self.target.rect.move(self.camera.state.topleft).topleft,
+        )
+
+    def test_jumps_are_not_interpolated(self):
+        self.target.rect.x += SCREEN_WIDTH
+        self.camera.update(self.target)
+        self.camera.interpolate(0.5)
+        self.assertEqual(
+            self.camera.apply(self.target).topleft,
+            self.target.rect.move(self.camera.state.topleft).topleft,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import math
+import random
+import unittest
+from itertools import pairwise
+
+import pygame
+
+from src.npc.bases.ai_behaviour import AIBehaviour
+from src.npc.bases.ai_behaviour_base import AIState
+from src.npc.flow_field import FleeField, FlowField
+from src.npc.pathfinding import (
+    DiagonalMovement,
+    DynamicObstacles,
+    PathFinder,
+    PathfindingGrid,
+)
+from src.settings import SCALED_TILE_SIZE
+from src.sprites.base import Sprite
+
+
+class FieldEntity(AIBehaviour):
+    """AI-controlled Entity that only has what following a FlowField needs."""
+
+    def __init__(self, tile: tuple[int, int]):
+        Sprite.__init__(self, (0, 0), pygame.Surface((1, 1)))
+        AIBehaviour.__init__(self, None)
+        self.hitbox_rect = pygame.FRect(
+            tile[0] * SCALED_TILE_SIZE,
+            tile[1] * SCALED_TILE_SIZE,
+            SCALED_TILE_SIZE,
+            SCALED_TILE_SIZE,
+        )
+
+    def get_tile_pos(self) -> tuple[int, int]:
+        return (
+            int(self.hitbox_rect.centerx / SCALED_TILE_SIZE),
+            int(self.hitbox_rect.centery / SCALED_TILE_SIZE),
+        )
+
+    def animate(self, dt: float):
+        pass
+
+
+class TestFlowField(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.grid = PathfindingGrid(
+            [[int(rng.random() < 0.75) for _ in range(20)] for _ in range(15)]
+        )
+        self.walkable = [
+            (x, y) for y in range(15) for x in range(20) if self.grid.walkable(x, y)
+        ]
+
+    def test_paths_are_shortest_paths(self):
+        for diagonal in DiagonalMovement:
+            finder = PathFinder(diagonal)
+            field = FlowField(self.grid, diagonal)
+            goal = self.walkable[len(self.walkable) // 2]
+            field.set_goals((goal,))
+            for start in self.walkable:
+                shortest = finder.find_path(start, goal, self.grid)
+                path = field.path(start)
+                if start == goal or not shortest:
+                    self.assertEqual(path, [])
+                    continue
+                self.assertEqual(path[-1], goal)
+                self.assertAlmostEqual(
+                    field.costs[start[1] * 20 + start[0]], _cost(shortest)
+                )
+                self.assertAlmostEqual(_cost([start, *path]), _cost(shortest))
+
+    def test_only_recomputed_on_changes(self):
+        field = FlowField(self.grid)
+        self.assertTrue(field.set_goals([(1, 1)]))
+        self.assertFalse(field.set_goals([(1, 1)]))
+        self.assertTrue(field.set_goals([(2, 1)]))
+
+        x, y = self.walkable[0]
+        self.grid.set_walkable(x, y, False)
+        self.assertTrue(field.set_goals([(2, 1)]))
+        self.assertEqual(field.recomputations, 3)
+
+    def test_flee_field_leads_away(self):
+        grid = PathfindingGrid([[1] * 9 for _ in range(9)])
+        field = FleeField(grid, DiagonalMovement.ONLY_WHEN_NO_OBSTACLE, radius=4)
+        field.set_goals([(4, 4)])
+        self.assertEqual(field.path((5, 5)), [(6, 6), (7, 7), (8, 8)])
+        path = field.path((5, 4), 2)
+        self.assertEqual(len(path), 2)
+        distances = [math.dist(tile, (4, 4)) for tile in [(5, 4), *path]]
+        self.assertEqual(distances, sorted(set(distances)))
+        # the field does not reach beyond its radius
+        field.set_goals([(0, 0)])
+        self.assertEqual(field.path((6, 6)), [])
+
+    def test_paths_stop_at_moving_obstacles(self):
+        grid = PathfindingGrid([[1] * 9 for _ in range(9)])
+        field = FleeField(grid, DiagonalMovement.ONLY_WHEN_NO_OBSTACLE, radius=4)
+        field.set_goals([(4, 4)])
+        entity = FieldEntity((5, 5))
+        other = FieldEntity((7, 7))
+        entity.pf_obstacles = DynamicObstacles(9, 9, (entity, other))
+
+        self.assertTrue(entity.create_path_from_flow_field(field))
+        self.assertEqual(entity.pf_path, [(6.5, 6.5)])
+        # the field itself is not recomputed when obstacles move
+        other.hitbox_rect.topleft = (6 * SCALED_TILE_SIZE, 6 * SCALED_TILE_SIZE)
+        entity.pf_obstacles.update()
+        self.assertFalse(field.set_goals([(4, 4)]))
+        # the next step is blocked, so the Entity waits for its next decision
+        self.assertFalse(entity.create_path_from_flow_field(field))
+        self.assertEqual(entity.pf_state, AIState.MOVING)
+        self.assertEqual(entity.pf_path, [])
+
+
+def _cost(path: list[tuple[int, int]]) -> float:
+    return sum(math.dist(a, b) for a, b in pairwise(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+import pygame
+
+from src.groups import CollisionSpriteGroup
+from src.sprites.base import Sprite
+
+
+class MovingSprite(Sprite):
+    stationary = False
+
+
+class TestCollisionSpriteGroup(unittest.TestCase):
+    def setUp(self):
+        self.group = CollisionSpriteGroup()
+        self.surf = pygame.Surface((64, 64))
+
+    def test_nearby_sprites_in_insertion_order(self):
+        far = Sprite((5000, 5000), self.surf, (self.group,))
+        second = Sprite((64, 0), self.surf, (self.group,))
+        first = Sprite((0, 0), self.surf, (self.group,))
+        nearby = self.group.get_nearby_sprites(pygame.FRect(32, 0, 64, 64))
+        self.assertEqual(nearby, [second, first])
+        self.assertNotIn(far, nearby)
+
+    def test_moving_sprites_are_updated(self):
+        sprite = MovingSprite((0, 0), self.surf, (self.group,))
+        self.assertEqual(self.group.get_nearby_sprites(sprite.hitbox_rect), [sprite])
+
+        sprite.hitbox_rect.topleft = (3000, 3000)
+        self.group.update_moving_sprites()
+        self.assertEqual(self.group.get_nearby_sprites(pygame.FRect(0, 0, 64, 64)), [])
+        self.assertEqual(
+            self.group.get_nearby_sprites(pygame.FRect(3000, 3000, 1, 1)), [sprite]
+        )
+
+    def test_empty_keeps_persistent_sprites(self):
+        persistent = Sprite((0, 0), self.surf)
+        self.group.add_persistent(persistent)
+        Sprite((0, 0), self.surf, (self.group,))
+        self.group.empty()
+        self.assertEqual(
+            self.group.get_nearby_sprites(pygame.FRect(0, 0, 64, 64)), [persistent]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
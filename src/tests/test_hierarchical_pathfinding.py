@@ -0,0 +1,125 @@
+import gc
+import math
+import random
+import unittest
+import weakref
+from itertools import pairwise
+
+import pygame
+
+from src.npc.hierarchical_pathfinding import ClusterGraph, HierarchicalPathFinder
+from src.npc.pathfinding import (
+    DiagonalMovement,
+    DynamicObstacles,
+    PathFinder,
+    PathfindingGrid,
+)
+from src.settings import SCALED_TILE_SIZE
+from src.sprites.base import Sprite
+
+
+def path_cost(
+    path: list[tuple[int, int]], grid: PathfindingGrid, diagonal: DiagonalMovement
+) -> float:
+    """:return: Cost of the path, or -1 if it is not a valid path on the grid"""
+    cost = 0
+    for (x, y), (next_x, next_y) in pairwise(path):
+        dx, dy = next_x - x, next_y - y
+        if not grid.walkable(next_x, next_y) or max(abs(dx), abs(dy)) != 1:
+            return -1
+        if dx and dy:
+            if diagonal == DiagonalMovement.NEVER:
+                return -1
+            if not grid.walkable(x + dx, y) or not grid.walkable(x, y + dy):
+                return -1
+        cost += math.hypot(dx, dy)
+    return cost
+
+
+class TestHierarchicalPathFinder(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def test_long_paths_are_valid_and_almost_shortest(self):
+        for _ in range(20):
+            width, height = self.rng.randint(10, 40), self.rng.randint(10, 40)
+            grid = PathfindingGrid(
+                [
+                    [int(self.rng.random() < 0.8) for _ in range(width)]
+                    for _ in range(height)
+                ]
+            )
+            for diagonal in DiagonalMovement:
+                finder = PathFinder(diagonal)
+                hierarchical_finder = HierarchicalPathFinder(
+                    diagonal, cluster_size=5, min_distance=10
+                )
+                for _ in range(10):
+                    start = (self.rng.randrange(width), self.rng.randrange(height))
+                    end = (self.rng.randrange(width), self.rng.randrange(height))
+                    shortest = finder.find_path(start, end, grid)
+                    path = hierarchical_finder.find_path(start, end, grid)
+                    self.assertEqual(bool(path), bool(shortest))
+                    if not path:
+                        continue
+                    self.assertEqual((path[0], path[-1]), (start, end))
+                    cost = path_cost(path, grid, diagonal)
+                    self.assertGreaterEqual(cost, 0)
+                    self.assertLessEqual(
+                        cost, 1.5 * path_cost(shortest, grid, diagonal)
+                    )
+
+    def test_paths_avoid_obstacles(self):
+        grid = PathfindingGrid([[1] * 20 for _ in range(3)])
+        obj = Sprite((0, 0), pygame.Surface((1, 1)))
+        obj.hitbox_rect = pygame.FRect(
+            10 * SCALED_TILE_SIZE, 0, SCALED_TILE_SIZE, 2 * SCALED_TILE_SIZE
+        )
+        obstacles = DynamicObstacles(20, 3, (obj,))
+
+        finder = HierarchicalPathFinder(cluster_size=5, min_distance=0)
+        path = finder.find_path((0, 0), (19, 0), grid, obstacles)
+        self.assertNotIn((10, 0), path)
+        self.assertNotIn((10, 1), path)
+        self.assertEqual(path_cost(path, grid, DiagonalMovement.NEVER), 23)
+
+
+class TestClusterGraph(unittest.TestCase):
+    def setUp(self):
+        self.grid = PathfindingGrid([[1] * 20 for _ in range(20)])
+        self.graph = ClusterGraph(self.grid, 5)
+
+    def test_only_changed_clusters_are_rebuilt(self):
+        self.assertEqual(self.graph.rebuilt_clusters, 16)
+
+        # the tile is inside its cluster, so no transitions change
+        self.grid.set_walkable(7, 7, False)
+        self.graph.refresh()
+        self.assertEqual(self.graph.rebuilt_clusters, 17)
+
+        # the tile lies on the border of two clusters
+        self.grid.set_walkable(4, 2, False)
+        self.graph.refresh()
+        self.assertEqual(self.graph.rebuilt_clusters, 19)
+
+    def test_paths_follow_changes(self):
+        finder = HierarchicalPathFinder(cluster_size=5, min_distance=0)
+        finder.prepare(self.grid)
+        for y in range(19):
+            self.grid.set_walkable(10, y, False)
+        path = finder.find_path((0, 0), (19, 0), self.grid)
+        self.assertIn((10, 19), path)
+        self.assertEqual(path_cost(path, self.grid, DiagonalMovement.NEVER), 57)
+
+    def test_graphs_do_not_keep_their_grid_alive(self):
+        finder = HierarchicalPathFinder(cluster_size=5, min_distance=0)
+        finder.prepare(self.grid)
+        grid = weakref.ref(self.grid)
+        del self.grid
+        gc.collect()
+        self.assertIsNone(grid())
+        self.assertEqual(len(finder._graphs), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
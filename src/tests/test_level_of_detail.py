@@ -0,0 +1,114 @@
+import unittest
+
+import pygame
+
+from src.level_of_detail import LevelOfDetail, mark_on_screen
+
+
+class FakeEntity(pygame.sprite.Sprite):
+    """Stand-in for an AI-controlled Entity that harvests a plant every second."""
+
+    throttle_off_screen = True
+
+    def __init__(self, pos: tuple[int, int]):
+        super().__init__()
+        self.rect = pygame.Rect(pos, (10, 10))
+        self.off_screen = False
+        self.updates = 0
+        self.elapsed = 0.0
+        self.timer = 0.0
+        self.harvested = 0
+
+    def update(self, dt: float):
+        self.updates += 1
+        self.elapsed += dt
+        self.timer += dt
+        while self.timer >= 1:
+            self.timer -= 1
+            self.harvested += 1
+
+
+class TestLevelOfDetail(unittest.TestCase):
+    def setUp(self):
+        self.viewport = pygame.Rect(0, 0, 100, 100)
+        self.lod = LevelOfDetail(4)
+        self.on_screen = FakeEntity((50, 50))
+        self.off_screen = [FakeEntity((500 + i * 20, 500)) for i in range(4)]
+        self.sprites = [self.on_screen, *self.off_screen]
+
+    def run_frames(self, lod: LevelOfDetail, sprites: list[FakeEntity], frames: int):
+        # 0.125 is exact in binary, so that sums of dt do not depend on grouping
+        for _ in range(frames):
+            lod.update(sprites, 0.125, self.viewport)
+
+    def test_off_screen_sprites_are_updated_less_often(self):
+        self.run_frames(self.lod, self.sprites, 40)
+        self.assertEqual(self.on_screen.updates, 40)
+        self.assertFalse(self.on_screen.off_screen)
+        for sprite in self.off_screen:
+            self.assertEqual(sprite.updates, 10)
+            self.assertTrue(sprite.off_screen)
+
+    def test_updates_are_staggered(self):
+        updated = []
+        for _ in range(4):
+            before = [sprite.updates for sprite in self.off_screen]
+            self.lod.update(self.sprites, 0.125, self.viewport)
+            updated.append(
+                sum(
+                    sprite.updates - count
+                    for sprite, count in zip(self.off_screen, before, strict=True)
+                )
+            )
+        self.assertEqual(updated, [1, 1, 1, 1])
+
+    def test_time_is_not_lost(self):
+        self.run_frames(self.lod, self.sprites, 37)
+        # pending time is handed over as soon as a Sprite comes on screen
+        self.viewport.update(0, 0, 1000, 1000)
+        self.run_frames(self.lod, self.sprites, 1)
+        for sprite in self.sprites:
+            self.assertEqual(sprite.elapsed, 4.75)
+
+    def test_outcome_matches_full_updates(self):
+        throttled = [FakeEntity((500, 500 + i * 20)) for i in range(8)]
+        full = [FakeEntity((500, 500 + i * 20)) for i in range(8)]
+        self.run_frames(self.lod, throttled, 400)
+        self.run_frames(LevelOfDetail(1), full, 400)
+        # off-screen Sprites lag behind by less than interval frames
+        self.viewport.update(0, 0, 1000, 1000)
+        self.run_frames(self.lod, throttled, 1)
+        self.run_frames(LevelOfDetail(1), full, 1)
+        self.assertEqual(
+            [sprite.harvested for sprite in throttled],
+            [sprite.harvested for sprite in full],
+        )
+        self.assertLess(
+            sum(sprite.updates for sprite in throttled),
+            sum(sprite.updates for sprite in full),
+        )
+
+    def test_full_updates_clear_off_screen(self):
+        self.run_frames(self.lod, self.sprites, 3)
+        self.lod.interval = 1
+        self.run_frames(self.lod, self.sprites, 1)
+        for sprite in self.off_screen:
+            self.assertFalse(sprite.off_screen)
+            # the time still pending from the throttled frames is handed over
+            self.assertEqual(sprite.elapsed, 0.5)
+
+    def test_reset(self):
+        self.run_frames(self.lod, self.sprites, 3)
+        self.lod.reset()
+        for sprite in self.sprites:
+            mark_on_screen(sprite)
+            self.assertFalse(sprite.off_screen)
+        # time that was pending before the reset is not handed over
+        self.viewport.update(0, 0, 1000, 1000)
+        self.run_frames(self.lod, self.sprites, 1)
+        self.assertEqual(self.on_screen.elapsed, 0.5)
+        self.assertLess(sum(sprite.elapsed for sprite in self.off_screen), 4 * 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+import pygame
+
+from src.npc.hierarchical_pathfinding import HierarchicalPathFinder
+from src.npc.path_cache import PathCache
+from src.npc.pathfinding import (
+    DiagonalMovement,
+    DynamicObstacles,
+    PathFinder,
+    PathfindingGrid,
+)
+from src.settings import SCALED_TILE_SIZE
+from src.sprites.base import Sprite
+
+
+class TestPathCache(unittest.TestCase):
+    def setUp(self):
+        self.grid = PathfindingGrid([[1] * 10 for _ in range(5)])
+        self.finder = PathFinder()
+        self.cache = PathCache(2)
+
+    def test_hits_and_misses(self):
+        path = self.cache.find_path(self.finder, (0, 0), (9, 4), self.grid)
+        self.assertEqual(path, PathFinder().find_path((0, 0), (9, 4), self.grid))
+        expanded_tiles = self.finder.expanded_tiles
+
+        self.assertEqual(
+            self.cache.find_path(self.finder, (0, 0), (9, 4), self.grid), path
+        )
+        self.assertEqual(self.finder.expanded_tiles, expanded_tiles)
+        self.assertEqual(
+            self.cache.find_path(self.finder, (9, 4), (0, 0), self.grid), path[::-1]
+        )
+        # the diagonal movement is part of the key
+        diagonal_finder = PathFinder(DiagonalMovement.ONLY_WHEN_NO_OBSTACLE)
+        self.cache.find_path(diagonal_finder, (0, 0), (9, 4), self.grid)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+        self.assertAlmostEqual(self.cache.hit_rate, 0.5)
+
+    def test_finder_type_is_part_of_the_key(self):
+        self.cache.find_path(self.finder, (0, 0), (9, 4), self.grid)
+        hierarchical_finder = HierarchicalPathFinder(cluster_size=5, min_distance=0)
+        path = self.cache.find_path(hierarchical_finder, (0, 0), (9, 4), self.grid)
+        self.assertEqual(path, hierarchical_finder.find_path((0, 0), (9, 4), self.grid))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+    def test_least_recently_used_paths_are_evicted(self):
+        for end in ((1, 0), (2, 0), (1, 0), (3, 0), (1, 0), (2, 0)):
+            self.cache.find_path(self.finder, (0, 0), end, self.grid)
+        # (2, 0) has been evicted by (3, 0)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 4))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_grid_changes_invalidate_paths(self):
+        self.cache.find_path(self.finder, (0, 0), (9, 0), self.grid)
+        self.grid.set_walkable(5, 0, False)
+        path = self.cache.find_path(self.finder, (0, 0), (9, 0), self.grid)
+        self.assertNotIn((5, 0), path)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_blocked_paths_are_not_reused(self):
+        path = self.cache.find_path(self.finder, (0, 0), (9, 0), self.grid)
+        obj = Sprite((0, 0), pygame.Surface((1, 1)))
+        obj.hitbox_rect = pygame.FRect(5 * SCALED_TILE_SIZE, 0, 1, 1)
+        obstacles = DynamicObstacles(10, 5, (obj,))
+
+        blocked_path = self.cache.find_path(
+            self.finder, (0, 0), (9, 0), self.grid, obstacles
+        )
+        self.assertNotEqual(blocked_path, path)
+        self.assertEqual(self.cache.misses, 2)
+        # the detour is still valid once the obstacle has moved away
+        obstacles.untrack(obj)
+        self.assertEqual(
+            self.cache.find_path(self.finder, (0, 0), (9, 0), self.grid, obstacles),
+            blocked_path,
+        )
+        self.assertEqual(self.cache.hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
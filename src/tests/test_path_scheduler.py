@@ -0,0 +1,93 @@
+import unittest
+from types import SimpleNamespace
+
+import pygame
+
+from src.npc.bases.ai_behaviour_base import AIState
+from src.npc.path_scheduler import PathRequestScheduler
+from src.npc.pathfinding import PathFinder
+
+
+class FakeAI:
+    """Stand-in for an AI-controlled Entity whose searches expand 100 tiles."""
+
+    def __init__(self, name: str, pos: tuple[int, int], log: list[str]):
+        self.name = name
+        self.log = log
+        self.hitbox_rect = pygame.FRect(pos, (1, 1))
+        self.pf_state = AIState.IDLE
+        self.pf_path = []
+        self.pf_finder = PathFinder()
+        self.pf_path_pending = False
+        self.pf_service = None
+        self.completion_funcs = []
+
+    def exit_idle(self):
+        self.log.append(self.name)
+        self.pf_finder.expanded_tiles += 100
+        self.pf_state = AIState.MOVING
+        self.pf_path = [(0.5, 0.5)]
+
+    def on_path_completion(self, func):
+        self.completion_funcs.append(func)
+
+
+class TestPathRequestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.log = []
+        self.focus = FakeAI("player", (0, 0), self.log)
+        self.scheduler = PathRequestScheduler(250, focus=self.focus)
+        self.ais = [FakeAI(str(i), (100 - i * 10, 0), self.log) for i in range(10)]
+
+    def test_budget_and_priorities(self):
+        for ai in self.ais:
+            self.scheduler.request(ai)
+            # requesting again does not add another request
+            self.scheduler.request(ai)
+        self.assertEqual(len(self.scheduler), 10)
+
+        self.scheduler.update()
+        # Entities closest to the focus first, until 250 tiles are expanded
+        self.assertEqual(self.log, ["9", "8", "7"])
+        self.scheduler.update()
+        self.assertEqual(self.log[3:], ["6", "5", "4"])
+
+    def test_at_least_one_request_per_frame(self):
+        self.scheduler.budget = 0
+        for ai in self.ais[:2]:
+            self.scheduler.request(ai)
+        self.scheduler.update()
+        self.assertEqual(self.log, ["1"])
+
+    def test_cancel(self):
+        for ai in self.ais[:3]:
+            self.scheduler.request(ai)
+        self.scheduler.cancel(self.ais[2])
+        self.ais[1].pf_state = AIState.MOVING
+        self.scheduler.update()
+        self.assertEqual(self.log, ["0"])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_on_path_completion(self):
+        def on_path_completion():
+            pass
+
+        self.scheduler.request(self.ais[0], on_path_completion=on_path_completion)
+        self.scheduler.update()
+        self.assertEqual(self.ais[0].completion_funcs, [on_path_completion])
+
+    def test_waits_for_full_path_service(self):
+        service = SimpleNamespace(full=True)
+        for ai in self.ais[:2]:
+            ai.pf_service = service
+            self.scheduler.request(ai)
+        self.scheduler.update()
+        self.assertEqual(self.log, [])
+
+        service.full = False
+        self.scheduler.update()
+        self.assertEqual(self.log, ["1", "0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
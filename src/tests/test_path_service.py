@@ -0,0 +1,130 @@
+import time
+import unittest
+import warnings
+
+import pygame
+
+from src.npc.path_service import PathService
+from src.npc.pathfinding import DynamicObstacles, PathFinder, PathfindingGrid
+from src.settings import SCALED_TILE_SIZE
+from src.sprites.base import Sprite
+
+
+class FakeAI:
+    """Stand-in for an AI-controlled Entity that records the paths it receives."""
+
+    def __init__(self):
+        self.paths = []
+
+    def receive_path(self, path_raw):
+        self.paths.append(path_raw)
+
+
+class TestPathService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = PathService(1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.close()
+
+    def setUp(self):
+        self.grid = PathfindingGrid([[1] * 10 for _ in range(5)])
+        self.ai = FakeAI()
+
+    def wait(self):
+        """Wait until all pending jobs have been handed out."""
+        deadline = time.monotonic() + 30
+        while len(self.service) and time.monotonic() < deadline:
+            self.service.update()
+            time.sleep(0.01)
+        self.assertEqual(len(self.service), 0)
+
+    def test_paths_are_handed_out(self):
+        self.service.submit(self.ai, (0, 0), (9, 4), self.grid, PathFinder())
+        self.assertIn(self.ai, self.service)
+        self.wait()
+        self.assertEqual(
+            self.ai.paths, [PathFinder().find_path((0, 0), (9, 4), self.grid)]
+        )
+
+    def test_stale_jobs_are_discarded(self):
+        self.service.submit(self.ai, (0, 0), (9, 4), self.grid, PathFinder())
+        self.service.cancel(self.ai)
+        self.assertNotIn(self.ai, self.service)
+
+        # only the latest job of an Entity counts
+        self.service.submit(self.ai, (0, 0), (9, 4), self.grid, PathFinder())
+        self.service.submit(self.ai, (0, 0), (1, 0), self.grid, PathFinder())
+        self.wait()
+        time.sleep(0.1)
+        self.service.update()
+        self.assertEqual(self.ai.paths, [[(0, 0), (1, 0)]])
+
+    def test_grid_changes_and_obstacles_are_shared(self):
+        self.service.submit(self.ai, (0, 0), (9, 0), self.grid, PathFinder())
+        self.wait()
+        self.assertEqual(len(self.ai.paths[0]), 10)
+
+        for y in range(4):
+            self.grid.set_walkable(5, y, False)
+        obj = Sprite((0, 0), pygame.Surface((1, 1)))
+        obj.hitbox_rect = pygame.FRect(
+            6 * SCALED_TILE_SIZE, 3 * SCALED_TILE_SIZE, 1, SCALED_TILE_SIZE
+        )
+        obstacles = DynamicObstacles(10, 5, (obj,))
+        self.service.submit(self.ai, (0, 0), (9, 0), self.grid, PathFinder(), obstacles)
+        self.wait()
+        self.assertEqual(
+            self.ai.paths[1],
+            PathFinder().find_path((0, 0), (9, 0), self.grid, obstacles),
+        )
+        self.assertIn((5, 4), self.ai.paths[1])
+        self.assertNotIn((6, 3), self.ai.paths[1])
+
+    def test_job_limit(self):
+        self.service.max_jobs = 2
+        self.service.submit(self.ai, (0, 0), (9, 4), self.grid, PathFinder())
+        self.assertFalse(self.service.full)
+        self.service.submit(FakeAI(), (0, 0), (9, 4), self.grid, PathFinder())
+        self.assertTrue(self.service.full)
+        self.wait()
+        self.assertFalse(self.service.full)
+
+
+class TestBrokenPathService(unittest.TestCase):
+    def test_searches_fall_back_to_main_thread(self):
+        service = PathService(1)
+        grid = PathfindingGrid([[1] * 10 for _ in range(5)])
+        ai = FakeAI()
+        expected = PathFinder().find_path((0, 0), (9, 4), grid)
+
+        # make sure the worker has been started before it is killed
+        service.submit(ai, (0, 0), (9, 4), grid, PathFinder())
+        while len(service):
+            service.update()
+            time.sleep(0.01)
+        for process in list(service._executor._processes.values()):
+            process.kill()
+            process.join()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            service.submit(ai, (0, 0), (9, 4), grid, PathFinder())
+            deadline = time.monotonic() + 30
+            while len(service) and time.monotonic() < deadline:
+                service.update()
+                time.sleep(0.01)
+            service.submit(ai, (0, 0), (9, 4), grid, PathFinder())
+
+        self.assertTrue(service.broken)
+        self.assertEqual(ai.paths, [expected] * 3)
+
+        (shared_grid,) = service._grids.values()
+        service.close()
+        self.assertFalse(shared_grid.release.alive)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import random
+import unittest
+
+import pygame
+from pathfinding.core.diagonal_movement import DiagonalMovement as LegacyDiagonal
+from pathfinding.core.grid import Grid
+from pathfinding.finder.a_star import AStarFinder
+
+from src.npc.pathfinding import (
+    DiagonalMovement,
+    DynamicObstacles,
+    PathFinder,
+    PathfindingGrid,
+)
+from src.settings import SCALED_TILE_SIZE
+from src.sprites.base import Sprite
+
+
+class TestPathFinder(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def random_matrix(self, width: int, height: int) -> list[list[int]]:
+        return [
+            [int(self.rng.random() < 0.7) for _ in range(width)] for _ in range(height)
+        ]
+
+    def test_same_paths_as_pathfinding_package(self):
+        modes = (
+            (DiagonalMovement.NEVER, LegacyDiagonal.never),
+            (
+                DiagonalMovement.ONLY_WHEN_NO_OBSTACLE,
+                LegacyDiagonal.only_when_no_obstacle,
+            ),
+        )
+        for _ in range(50):
+            width, height = self.rng.randint(1, 30), self.rng.randint(1, 30)
+            matrix = self.random_matrix(width, height)
+            legacy_grid = Grid(matrix=matrix)
+            grid = PathfindingGrid(matrix)
+            for diagonal, legacy_diagonal in modes:
+                legacy_finder = AStarFinder(diagonal_movement=legacy_diagonal)
+                finder = PathFinder(diagonal)
+                for _ in range(10):
+                    # the start tile does not need to be walkable
+                    start = (self.rng.randrange(width), self.rng.randrange(height))
+                    end = (self.rng.randrange(width), self.rng.randrange(height))
+                    legacy_grid.cleanup()
+                    legacy_path, _ = legacy_finder.find_path(
+                        legacy_grid.node(*start), legacy_grid.node(*end), legacy_grid
+                    )
+                    self.assertEqual(
+                        finder.find_path(start, end, grid),
+                        [(node.x, node.y) for node in legacy_path],
+                    )
+
+    def test_diagonal_steps_need_free_corners(self):
+        grid = PathfindingGrid([[1, 1], [0, 1]])
+        finder = PathFinder(DiagonalMovement.ONLY_WHEN_NO_OBSTACLE)
+        self.assertEqual(
+            finder.find_path((0, 0), (1, 1), grid), [(0, 0), (1, 0), (1, 1)]
+        )
+
+        grid.set_walkable(0, 1, True)
+        self.assertEqual(finder.find_path((0, 0), (1, 1), grid), [(0, 0), (1, 1)])
+
+    def test_no_path(self):
+        grid = PathfindingGrid([[1, 0, 1]])
+        self.assertEqual(PathFinder().find_path((0, 0), (2, 0), grid), [])
+        with self.assertRaises(IndexError):
+            PathFinder().find_path((0, 0), (3, 0), grid)
+
+    def test_connected(self):
+        legacy_finder = AStarFinder(diagonal_movement=LegacyDiagonal.never)
+        for _ in range(20):
+            width, height = self.rng.randint(1, 15), self.rng.randint(1, 15)
+            grid = PathfindingGrid(self.random_matrix(width, height))
+            for _ in range(30):
+                # the regions have to follow all changes of the grid
+                x, y = self.rng.randrange(width), self.rng.randrange(height)
+                grid.set_walkable(x, y, not grid.walkable(x, y))
+
+                start = (self.rng.randrange(width), self.rng.randrange(height))
+                end = (self.rng.randrange(width), self.rng.randrange(height))
+                legacy_grid = Grid(
+                    matrix=[
+                        [grid.walkable(i, j) for i in range(width)]
+                        for j in range(height)
+                    ]
+                )
+                legacy_path, _ = legacy_finder.find_path(
+                    legacy_grid.node(*start), legacy_grid.node(*end), legacy_grid
+                )
+                self.assertEqual(grid.connected(start, end), bool(legacy_path))
+
+
+class TestDynamicObstacles(unittest.TestCase):
+    def setUp(self):
+        self.grid = PathfindingGrid([[1, 1, 1], [1, 1, 1]])
+        self.obj = Sprite((0, 0), pygame.Surface((1, 1)))
+        self.obj.hitbox_rect = pygame.FRect(
+            SCALED_TILE_SIZE, 0, SCALED_TILE_SIZE, SCALED_TILE_SIZE
+        )
+        self.obstacles = DynamicObstacles(3, 2, (self.obj,))
+
+    def test_paths_avoid_obstacles(self):
+        finder = PathFinder()
+        path = finder.find_path((0, 0), (2, 0), self.grid, self.obstacles)
+        self.assertEqual(path, [(0, 0), (0, 1), (1, 1), (2, 1), (2, 0)])
+        # the grid itself is never modified
+        self.assertTrue(self.grid.walkable(1, 0))
+
+    def test_update(self):
+        self.obj.hitbox_rect.x += SCALED_TILE_SIZE / 2
+        self.obstacles.update()
+        self.assertTrue(self.obstacles.blocked(1, 0))
+        self.assertTrue(self.obstacles.blocked(2, 0))
+
+        self.obstacles.untrack(self.obj)
+        self.assertEqual(self.obstacles.counts, [0] * 6)
+
+    def test_blocked_can_ignore_an_object(self):
+        self.assertFalse(self.obstacles.blocked(1, 0, ignore=self.obj))
+        other = Sprite((0, 0), pygame.Surface((1, 1)))
+        other.hitbox_rect = self.obj.hitbox_rect.copy()
+        self.obstacles.track(other)
+        self.assertTrue(self.obstacles.blocked(1, 0, ignore=self.obj))
+        self.assertFalse(self.obstacles.blocked(0, 0, ignore=self.obj))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import random
+import unittest
+
+import pygame
+
+from src.enums import Layer
+from src.render_queue import RenderQueue
+from src.sprites.base import Sprite
+
+
+class MovingSprite(Sprite):
+    stationary = False
+
+
+class TestRenderQueue(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.surf = pygame.Surface((16, 16))
+        self.queue = RenderQueue()
+        self.sprites = []
+        for _ in range(300):
+            sprite_type = MovingSprite if self.rng.random() < 0.2 else Sprite
+            sprite = sprite_type(
+                (self.rng.randrange(0, 400, 8), self.rng.randrange(0, 400, 8)),
+                self.surf,
+                z=self.rng.choice(list(Layer)),
+            )
+            self.queue.add(sprite)
+            self.sprites.append(sprite)
+
+    def expected_order(self, area: pygame.Rect):
+        sorted_sprites = sorted(self.sprites, key=lambda spr: spr.hitbox_rect.bottom)
+        return [
+            sprite
+            for layer in Layer
+            for sprite in sorted_sprites
+            if sprite.z == layer
+            and (not sprite.stationary or area.colliderect(sprite.rect))
+        ]
+
+    def assert_order(self, area: pygame.Rect):
+        self.queue.refresh()
+        self.assertEqual(self.expected_order(area), list(self.queue.iter_visible(area)))
+
+    def test_order_matches_layer_by_layer_sort(self):
+        self.queue.freeze_stationary()
+        self.assert_order(pygame.Rect(0, 0, 416, 416))
+
+    def test_culls_static_sprites(self):
+        self.queue.freeze_stationary()
+        self.assert_order(pygame.Rect(100, 150, 120, 80))
+
+    def test_moved_sprites_are_repositioned(self):
+        self.queue.freeze_stationary()
+        area = pygame.Rect(0, 0, 416, 416)
+        self.assert_order(area)
+        for _ in range(5):
+            for sprite in self.sprites:
+                if not sprite.stationary:
+                    sprite.hitbox_rect.y = self.rng.randrange(0, 400, 8)
+                    if self.rng.random() < 0.2:
+                        sprite.z = self.rng.choice(list(Layer))
+            self.assert_order(area)
+
+    def test_removed_sprites_are_not_drawn(self):
+        self.queue.freeze_stationary()
+        for sprite in self.sprites[::3]:
+            self.queue.remove(sprite)
+        del self.sprites[::3]
+        self.assert_order(pygame.Rect(0, 0, 416, 416))
@@ -0,0 +1,55 @@
+import unittest
+
+import pygame
+
+from src.enums import Map
+from src.screens.scene_cache import MapScene, SceneCache
+
+
+class TestSceneCache(unittest.TestCase):
+    def setUp(self):
+        self.group = pygame.sprite.Group()
+
+    def create_scene(self, image_size: int) -> MapScene:
+        self.group.empty()
+        sprite = pygame.sprite.Sprite(self.group)
+        sprite.image = pygame.Surface((image_size, image_size), pygame.SRCALPHA)
+        return MapScene.capture(None, (self.group,))
+
+    def test_retain_drops_removed_sprites(self):
+        scene = self.create_scene(8)
+        pygame.sprite.Sprite(self.group).image = pygame.Surface((8, 8))
+        removed = self.group.sprites()[0]
+        removed.kill()
+
+        scene.retain()
+        self.assertNotIn(removed, scene.group_sprites[self.group])
+        self.group.empty()
+        scene.restore()
+        self.assertEqual(0, len(self.group))
+
+    def test_restore_adds_sprites_back(self):
+        scene = self.create_scene(8)
+        sprites = self.group.sprites()
+        scene.retain()
+        self.group.empty()
+        scene.restore()
+        self.assertEqual(sprites, self.group.sprites())
+
+    def test_least_recently_left_scenes_are_evicted(self):
+        # every scene holds a single 32x32 image of 4 KiB
+        cache = SceneCache(memory_budget=2 * 4096)
+        cache.store(Map.FARM, self.create_scene(32))
+        cache.store(Map.TOWN, self.create_scene(32))
+        cache.store(Map.FOREST, self.create_scene(32))
+
+        self.assertEqual(2, len(cache))
+        self.assertNotIn(Map.FARM, cache)
+        self.assertIsNotNone(cache.pop(Map.TOWN))
+        self.assertIsNone(cache.pop(Map.FARM))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_scenes_over_budget_are_not_retained(self):
+        cache = SceneCache(memory_budget=1024)
+        cache.store(Map.FARM, self.create_scene(32))
+        self.assertEqual(0, len(cache))
@@ -0,0 +1,61 @@
+import random
+import sys
+import unittest
+from unittest import mock
+
+import simulate
+from src.settings import AI_LOD_INTERVAL
+
+# enough steps for the NPCs to hoe, plant and water a good part of their fields
+STEPS = 1500
+
+
+def run_simulation(
+    seed: int,
+    steps: int = STEPS,
+    dt: float = simulate.DEFAULT_DT,
+    level_of_detail: bool = False,
+) -> dict:
+    random.seed(seed)
+    game = simulate.HeadlessGame(dt, level_of_detail)
+    for _ in range(steps):
+        game.step()
+    return game.dump_state()
+
+
+def farming_progress(state: dict) -> dict[str, int]:
+    """:return: Number of hoed and watered tiles and of plants on all fields"""
+    return {
+        key: sum(area[key] for area in state["soil"].values())
+        for key in ("hoed", "watered", "plants")
+    }
+
+
+class TestHeadlessGame(unittest.TestCase):
+    def setUp(self):
+        # the assets are looked up relative to the script that was started
+        argv = mock.patch.object(sys, "argv", [simulate.__file__])
+        argv.start()
+        self.addCleanup(argv.stop)
+
+    def test_seeded_runs_are_reproducible(self):
+        first = run_simulation(1)
+        self.assertTrue(any(area["plants"] for area in first["soil"].values()))
+        # nothing of a previously simulated game should carry over
+        run_simulation(2, STEPS // 10)
+        self.assertEqual(first, run_simulation(1))
+
+    def test_level_of_detail_keeps_farming_progress(self):
+        # off-screen NPCs are updated with the dt of AI_LOD_INTERVAL steps at
+        # once, which has to stay below the DEFAULT_DT of the simulation
+        dt = simulate.DEFAULT_DT / AI_LOD_INTERVAL
+        full, throttled = {}, {}
+        for seed in range(1, 4):
+            for totals, level_of_detail in ((full, False), (throttled, True)):
+                state = run_simulation(seed, 2000, dt, level_of_detail)
+                for key, value in farming_progress(state).items():
+                    totals[key] = totals.get(key, 0) + value
+
+        for key, value in full.items():
+            self.assertGreater(value, 0)
+            self.assertAlmostEqual(throttled[key], value, delta=value * 0.15)
@@ -0,0 +1,270 @@
+import unittest
+from types import SimpleNamespace
+
+import pygame
+
+from src.enums import FarmingTool, InventoryResource, Layer, SeedType
+from src.overlay.soil import SoilArea
+from src.settings import SCALED_TILE_SIZE
+
+TILE_TYPES = (
+    "o", "b", "l", "bl", "t", "tb", "tl", "tbr",
+    "r", "br", "lr", "lrb", "tr", "tbl", "lrt", "x",
+)  # fmt: skip
+
+# "#" marks the tiles that are hoed
+FIELD = (
+    "###..#.",
+    "###..#.",
+    "###..#.",
+    ".......",
+    ".###...",
+)
+
+
+class TileLayer:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+    def tiles(self):
+        for y in range(self.height):
+            for x in range(self.width):
+                yield x, y, None
+
+
+def create_area(previous_soil_data: dict | None = None) -> SoilArea:
+    frames = {
+        "soil": {name: pygame.Surface((1, 1)) for name in TILE_TYPES},
+        "soil water": {"0": pygame.Surface((1, 1))},
+        "corn": [pygame.Surface((1, 1)) for _ in range(4)],
+        "tomato": [pygame.Surface((1, 1)) for _ in range(4)],
+    }
+    area = SoilArea(pygame.sprite.Group(), frames)
+    area.create_soil_tiles(TileLayer(len(FIELD[0]), len(FIELD)), previous_soil_data)
+    return area
+
+
+def hoed_positions() -> list[tuple[int, int]]:
+    return [
+        (x, y)
+        for y, row in enumerate(FIELD)
+        for x, char in enumerate(row)
+        if char == "#"
+    ]
+
+
+class TestSoilAutotiling(unittest.TestCase):
+    def test_tile_types(self):
+        area = create_area()
+        for pos in hoed_positions():
+            self.assertTrue(area.hoe(pos))
+
+        expected = {
+            # 3x3 block
+            (0, 0): "tl",
+            (1, 0): "lrt",
+            (2, 0): "tr",
+            (0, 1): "tbr",
+            (1, 1): "x",
+            (2, 1): "tbl",
+            (0, 2): "bl",
+            (1, 2): "lrb",
+            (2, 2): "br",
+            # vertical line
+            (5, 0): "t",
+            (5, 1): "tb",
+            (5, 2): "b",
+            # horizontal line
+            (1, 4): "l",
+            (2, 4): "lr",
+            (3, 4): "r",
+            # untilled tiles
+            (3, 0): "r",
+            (4, 0): "l",
+            (6, 1): "r",
+            (4, 3): "o",
+        }
+        for pos, tile_type in expected.items():
+            self.assertEqual(area.determine_tile_type(pos), tile_type, pos)
+
+        soil_frames = area.level_frames["soil"]
+        self.assertIs(area.tiles[(1, 1)].image, soil_frames["x"])
+        self.assertEqual(area.pf_weight((3, 0)), 1)
+        self.assertEqual(area.pf_weight((4, 3)), 0)
+        self.assertEqual(area.pf_weight((1, 1)), 0)
+
+    def test_unhoeing_updates_neighbours(self):
+        area = create_area()
+        for pos in hoed_positions():
+            area.hoe(pos)
+
+        tile = area.tiles[(1, 1)]
+        self.assertTrue(area.unhoe((1, 1)))
+        self.assertFalse(tile.alive())
+        self.assertNotIn((1, 1), area.tiles)
+        self.assertEqual(area.determine_tile_type((1, 0)), "lr")
+        self.assertEqual(area.determine_tile_type((0, 1)), "tb")
+        self.assertEqual(area.determine_tile_type((1, 1)), "x")
+        self.assertEqual(area.pf_weight((1, 1)), 1)
+        self.assertIs(area.tiles[(1, 0)].image, area.level_frames["soil"]["lr"])
+
+    def test_loading_matches_hoeing(self):
+        hoed = create_area()
+        for pos in hoed_positions():
+            hoed.hoe(pos)
+
+        saved = {
+            pos: SimpleNamespace(watered=False, plant_info=None)
+            for pos in hoed_positions()
+        }
+        seedling = SimpleNamespace(plant_type=SeedType.CORN, age=0)
+        saved[(0, 0)] = SimpleNamespace(watered=False, plant_info=seedling)
+        grown = SimpleNamespace(plant_type=SeedType.TOMATO, age=3)
+        saved[(1, 0)] = SimpleNamespace(watered=True, plant_info=grown)
+        loaded = create_area(saved)
+
+        self.assertTrue((loaded.hoed == hoed.hoed).all())
+        self.assertEqual(loaded.tiles.keys(), hoed.tiles.keys())
+        soil_frames = loaded.level_frames["soil"]
+        for pos in loaded.positions(loaded.farmable):
+            self.assertEqual(
+                loaded.determine_tile_type(pos), hoed.determine_tile_type(pos), pos
+            )
+            self.assertEqual(loaded.pf_weight(pos), hoed.pf_weight(pos), pos)
+        for pos, tile in loaded.tiles.items():
+            tile_type = loaded.determine_tile_type(pos)
+            self.assertIs(tile.image, soil_frames[tile_type])
+
+        # plants continue growing from the age they were saved at
+        self.assertEqual(loaded.plant_age[loaded.index((0, 0))], 0)
+        self.assertEqual(loaded.plant_age[loaded.index((1, 0))], 3)
+        self.assertEqual(loaded.plants[(0, 0)].age, 0)
+        self.assertEqual(loaded.plants[(1, 0)].age, 3)
+        self.assertTrue(loaded.plants[(1, 0)].harvestable)
+        self.assertEqual(loaded.harvestable_tiles, {(1, 0)})
+        # grown plants are drawn as Sprites of their own
+        self.assertIn(loaded.plants[(1, 0)], loaded.all_sprites)
+        self.assertNotIn(loaded.plants[(0, 0)], loaded.all_sprites)
+
+
+class TestSoilState(unittest.TestCase):
+    def test_tile_indexes(self):
+        area = create_area()
+        plant = (0, 0), FarmingTool.TOMATO_SEED, lambda resource, amount: True
+        self.assertEqual(len(area.untilled_tiles), len(FIELD) * len(FIELD[0]))
+        self.assertFalse(area.tiles)
+
+        area.hoe((0, 0))
+        area.hoe((1, 0))
+        self.assertEqual(area.unplanted_tiles, {(0, 0), (1, 0)})
+        self.assertNotIn((0, 0), area.untilled_tiles)
+        self.assertTrue(area.plant(*plant))
+        self.assertFalse(area.plant(*plant))
+        self.assertEqual(area.unplanted_tiles, {(1, 0)})
+        self.assertEqual(area.unwatered_tiles, {(0, 0)})
+        self.assertEqual(area.planted_types[SeedType.TOMATO], 1)
+        self.assertEqual(area.planted_types[SeedType.CORN], 0)
+        self.assertEqual(
+            area.positions_in_row(area.untilled, 0),
+            [(x, 0) for x in range(2, len(FIELD[0]))],
+        )
+        self.assertEqual(area.positions_in_row(area.untilled, -1), [])
+
+    def test_harvest(self):
+        area = create_area()
+        area.hoe((0, 0))
+        area.plant((0, 0), FarmingTool.TOMATO_SEED, lambda resource, amount: True)
+        harvested = []
+        for _ in range(5):
+            self.assertFalse(area.harvestable_tiles)
+            area.water((0, 0))
+            area.advance_day()
+        self.assertEqual(area.harvestable_tiles, {(0, 0)})
+
+        plant = area.tiles[(0, 0)].plant
+        self.assertTrue(
+            area.harvest(
+                (0, 0),
+                lambda resource, amount: harvested.append((resource, amount)),
+                lambda sprite: None,
+            )
+        )
+        self.assertEqual(harvested, [(InventoryResource.TOMATO, 3)])
+        self.assertFalse(plant.alive())
+        self.assertFalse(area.harvestable_tiles)
+        self.assertEqual(area.unplanted_tiles, {(0, 0)})
+
+
+class TestSoilDayRollover(unittest.TestCase):
+    def test_advance_day(self):
+        area = create_area()
+        watered, dry = (0, 0), (1, 0)
+        for pos in (watered, dry):
+            area.hoe(pos)
+            area.plant(pos, FarmingTool.CORN_SEED, lambda resource, amount: True)
+        area.water(watered)
+        area.water((2, 0))
+        self.assertEqual(area.unwatered_tiles, {dry})
+        self.assertEqual(area.renderer.water_frames.keys(), {watered})
+
+        area.advance_day()
+        self.assertEqual(area.tiles[watered].plant.age, 1)
+        self.assertEqual(area.tiles[dry].plant.age, 0)
+        self.assertFalse(any(tile.watered for tile in area.tiles.values()))
+        self.assertEqual(area.unwatered_tiles, {watered, dry})
+        self.assertFalse(area.renderer.water_frames)
+
+        area.water(watered)
+        self.assertEqual(area.unwatered_tiles, {dry})
+
+
+class TestSoilRenderer(unittest.TestCase):
+    def pixel(self, area: SoilArea, pos: tuple[int, int]):
+        renderer = area.renderer
+        x = pos[0] * SCALED_TILE_SIZE - int(renderer.rect.left)
+        y = pos[1] * SCALED_TILE_SIZE - int(renderer.rect.top)
+        return tuple(renderer.image.get_at((x, y)))
+
+    def test_redraws_dirty_tiles(self):
+        area = create_area()
+        soil, water = (200, 100, 0, 255), (0, 0, 255, 255)
+        for surface in area.level_frames["soil"].values():
+            surface.fill(soil)
+        area.level_frames["soil water"]["0"].fill(water)
+        renderer = area.renderer
+        self.assertIn(renderer, area.all_sprites)
+        self.assertIsNone(renderer._surface)
+
+        area.hoe((0, 0))
+        renderer.refresh()
+        self.assertEqual(self.pixel(area, (0, 0)), soil)
+        self.assertEqual(self.pixel(area, (1, 0)), (0, 0, 0, 0))
+        self.assertNotIn(area.tiles[(0, 0)], area.all_sprites)
+
+        area.hoe((1, 0))
+        area.water((1, 0))
+        self.assertIn((1, 0), renderer._dirty)
+        renderer.refresh()
+        self.assertFalse(renderer._dirty)
+        self.assertEqual(self.pixel(area, (1, 0)), water)
+
+        area.advance_day()
+        renderer.refresh()
+        self.assertEqual(self.pixel(area, (1, 0)), soil)
+
+    def test_grown_plants_are_sprites(self):
+        area = create_area()
+        area.hoe((0, 0))
+        area.plant((0, 0), FarmingTool.CORN_SEED, lambda resource, amount: True)
+        plant = area.plants[(0, 0)]
+        self.assertNotIn(plant, area.all_sprites)
+
+        while plant.z == Layer.PLANT:
+            area.water((0, 0))
+            area.advance_day()
+        self.assertIn(plant, area.all_sprites)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import gc
+import math
+import unittest
+
+import pygame
+
+from src.support import (
+    LazyMapDict,
+    ScaledSurfaceCache,
+    distance,
+    get_flight_matrix,
+    get_sorted_flight_vectors,
+)
+
+
+class TestScaledSurfaceCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ScaledSurfaceCache()
+        self.surf = pygame.Surface((16, 16))
+
+    def test_scaled_surface_is_shared(self):
+        first = self.cache.get(self.surf, 4)
+        second = self.cache.get(self.surf, 4)
+        self.assertIs(first, second)
+        self.assertEqual((64, 64), first.get_size())
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+        self.assertEqual(first.get_pitch() * first.get_height(), self.cache.bytes)
+
+    def test_entries_are_keyed_by_scale(self):
+        self.assertIsNot(self.cache.get(self.surf, 2), self.cache.get(self.surf, 4))
+        self.assertEqual(2, self.cache.misses)
+
+    def test_entries_are_dropped_with_their_source(self):
+        self.cache.get(self.surf, 4)
+        del self.surf
+        gc.collect()
+        self.assertEqual(0, len(self.cache))
+        self.assertEqual(0, self.cache.bytes)
+
+
+def legacy_flight_matrix(pos: tuple[int, int], radius: int) -> list[list[float]]:
+    """Pure Python version of get_flight_matrix, as it was before using NumPy."""
+    diameter = radius * 2 + 1
+
+    p1 = (radius, radius)
+    p2 = (pos[0] + radius, pos[1] + radius)
+
+    matrix = [[0.0] * diameter for _ in range(diameter)]
+
+    dangerous_angle = math.atan2((p1[0] - p2[0]), (p1[1] - p2[1]))
+
+    for y in range(diameter):
+        for x in range(diameter):
+            current_angle = math.atan2((p1[0] - x), (p1[1] - y))
+            distance_ = dangerous_angle - current_angle
+
+            if distance_ > math.pi:
+                distance_ = distance_ - (math.pi * 2)
+            elif distance_ < -math.pi:
+                distance_ = distance_ + (math.pi * 2)
+
+            matrix[y][x] = distance(p2, (x, y)) * abs(distance_ / math.pi)
+
+    matrix[radius][radius] = float("inf")
+
+    return matrix
+
+
+class TestFlightMatrix(unittest.TestCase):
+    def test_same_as_legacy_implementation(self):
+        for radius in (1, 3, 5):
+            for pos_x in range(-8, 9):
+                for pos_y in range(-8, 9):
+                    pos = (pos_x, pos_y)
+                    legacy = legacy_flight_matrix(pos, radius)
+                    self.assertEqual(get_flight_matrix(pos, radius).tolist(), legacy)
+
+                    # positions with equal weights keep their row-major order
+                    expected = sorted(
+                        (
+                            (x, y)
+                            for y in range(len(legacy))
+                            for x in range(len(legacy))
+                        ),
+                        key=lambda c: legacy[c[1]][c[0]],
+                    )
+                    vectors = get_sorted_flight_vectors(pos, radius)
+                    self.assertEqual([(c.x, c.y) for c in vectors], expected)
+
+    def test_matrices_are_cached(self):
+        matrix = get_flight_matrix((3, -2), 5)
+        self.assertIs(get_flight_matrix((3.2, -1.8), 5), matrix)
+        self.assertFalse(matrix.flags.writeable)
+
+
+class TestLazyMapDict(unittest.TestCase):
+    def setUp(self):
+        # none of these files exist, so accessing any map would fail
+        self.maps = LazyMapDict({"farm": "farm.tmx", "town": "town.tmx"})
+
+    def test_maps_are_not_parsed_on_creation(self):
+        self.assertEqual(["farm", "town"], list(self.maps))
+        self.assertIn("farm", self.maps)
+        self.assertFalse(self.maps.is_loaded("farm"))
+
+    def test_unknown_maps(self):
+        self.assertNotIn("bathhouse", self.maps)
+        self.assertIsNone(self.maps.get("bathhouse"))
+        self.assertIsNone(self.maps.prefetch(["bathhouse"]))
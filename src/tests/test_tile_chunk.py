@@ -0,0 +1,125 @@
+import unittest
+
+import pygame
+
+from src.enums import Layer
+from src.groups import AllSprites
+from src.settings import SCALE_FACTOR, SCALED_TILE_SIZE, TILE_CHUNK_SIZE, TILE_SIZE
+from src.sprites.tile_chunk import TileChunkLayer, tile_chunk_cache
+
+
+class TestTileChunkLayer(unittest.TestCase):
+    def setUp(self):
+        self.group = pygame.sprite.Group()
+        self.layer = TileChunkLayer(self.group, 0)
+        self.red = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        self.red.fill("red")
+        self.blue = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        self.blue.fill("blue")
+
+    def test_tiles_are_grouped_into_chunks(self):
+        self.layer.set_tile((0, 0), self.red)
+        self.layer.set_tile((TILE_CHUNK_SIZE - 1, 3), self.red)
+        self.layer.set_tile((TILE_CHUNK_SIZE, 3), self.red)
+        self.assertEqual(2, len(self.group))
+        self.assertEqual({(0, 0), (1, 0)}, set(self.layer.chunks))
+
+    def test_baked_image_is_scaled(self):
+        self.layer.set_tile((1, 2), self.red)
+        chunk = self.layer.chunks[(0, 0)]
+        chunk.bake()
+        self.assertEqual((SCALED_TILE_SIZE, SCALED_TILE_SIZE), chunk.image.get_size())
+        self.assertEqual(
+            (SCALED_TILE_SIZE, 2 * SCALED_TILE_SIZE),
+            (
+                chunk.rect.x + chunk._image_offset[0],
+                chunk.rect.y + chunk._image_offset[1],
+            ),
+        )
+
+    def test_chunk_is_invalidated_when_tiles_change(self):
+        self.layer.set_tile((0, 0), self.red)
+        self.layer.set_tile((TILE_CHUNK_SIZE, 0), self.red)
+        for chunk in self.layer.chunks.values():
+            chunk.bake()
+
+        self.layer.set_tile((1, 0), self.blue)
+        self.assertTrue(self.layer.chunks[(0, 0)]._dirty)
+        self.assertFalse(self.layer.chunks[(1, 0)]._dirty)
+
+        chunk = self.layer.chunks[(0, 0)]
+        chunk.bake()
+        self.assertEqual(
+            pygame.Color("blue"), chunk.image.get_at((SCALED_TILE_SIZE, 0))
+        )
+
+        self.layer.set_tile((0, 0), None)
+        chunk.bake()
+        self.assertEqual((SCALED_TILE_SIZE, SCALED_TILE_SIZE), chunk.image.get_size())
+        self.assertEqual(SCALED_TILE_SIZE, chunk.rect.x + chunk._image_offset[0])
+
+    def test_oversized_tiles_extend_rect(self):
+        tall = pygame.Surface((TILE_SIZE, 3 * TILE_SIZE))
+        self.layer.set_tile((0, TILE_CHUNK_SIZE - 1), tall)
+        chunk = self.layer.chunks[(0, 0)]
+        self.assertEqual(
+            chunk.area.bottom + 2 * TILE_SIZE * SCALE_FACTOR, chunk.rect.bottom
+        )
+        self.assertEqual(chunk.area.bottom, chunk.hitbox_rect.bottom)
+
+    def test_oversized_tiles_are_drawn_after_freezing(self):
+        # AllSprites draws onto the display surface
+        pygame.display.set_mode((64, 64))
+        self.addCleanup(pygame.display.quit)
+        all_sprites = AllSprites()
+        layer = TileChunkLayer(all_sprites, Layer.GROUND)
+        layer.set_tile((0, TILE_CHUNK_SIZE - 1), self.red)
+        all_sprites.index_stationary_sprites()
+
+        tall = pygame.Surface((TILE_SIZE, 3 * TILE_SIZE))
+        layer.set_tile((0, TILE_CHUNK_SIZE - 1), tall)
+        chunk = layer.chunks[(0, 0)]
+        below = pygame.Rect(0, chunk.area.bottom + SCALED_TILE_SIZE, 8, 8)
+        self.assertIn(chunk, list(all_sprites._render_queue.iter_visible(below)))
+
+
+class TestTileChunkCache(unittest.TestCase):
+    def setUp(self):
+        tile_chunk_cache.clear()
+        self.memory_budget = tile_chunk_cache.memory_budget
+        self.layer = TileChunkLayer(pygame.sprite.Group(), 0)
+        tile = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        for x in range(3):
+            self.layer.set_tile((x * TILE_CHUNK_SIZE, 0), tile)
+        self.chunks = list(self.layer.chunks.values())
+
+    def tearDown(self):
+        tile_chunk_cache.memory_budget = self.memory_budget
+        tile_chunk_cache.clear()
+
+    def test_least_recently_drawn_chunks_are_released(self):
+        # every baked chunk holds a single scaled tile
+        tile_chunk_cache.memory_budget = 2 * SCALED_TILE_SIZE**2 * 4
+        first, second, third = self.chunks
+        first.bake()
+        second.bake()
+        tile_chunk_cache.touch(first)
+        third.bake()
+
+        self.assertEqual(2, len(tile_chunk_cache))
+        self.assertTrue(second._dirty)
+        self.assertEqual((0, 0), second.image.get_size())
+        self.assertFalse(first._dirty)
+        self.assertLessEqual(tile_chunk_cache.bytes, tile_chunk_cache.memory_budget)
+
+    def test_collected_chunks_are_forgotten(self):
+        for chunk in self.chunks:
+            chunk.bake()
+        self.assertEqual(3, len(tile_chunk_cache))
+        self.layer.chunks.clear()
+        for chunk in self.chunks:
+            chunk.kill()
+        del chunk
+        self.chunks.clear()
+        self.assertEqual(0, len(tile_chunk_cache))
+        self.assertEqual(0, tile_chunk_cache.bytes)
@@ -0,0 +1,40 @@
+import unittest
+
+from src.overlay.game_time import GameTime
+from src.timer import SimulatedClock, Timer, get_ticks, use_clock
+
+
+class TestSimulatedClock(unittest.TestCase):
+    def setUp(self):
+        self.clock = SimulatedClock()
+        use_clock(self.clock)
+
+    def tearDown(self):
+        use_clock(None)
+
+    def test_timers_follow_the_clock(self):
+        finished = []
+        timer = Timer(500, func=lambda: finished.append(get_ticks()))
+        self.clock.advance(1)
+        timer.activate()
+
+        self.clock.advance(0.25)
+        timer.update()
+        self.assertAlmostEqual(timer.get_progress(), 0.5)
+        self.assertEqual(finished, [])
+
+        self.clock.advance(0.25)
+        timer.update()
+        self.assertEqual(finished, [1500])
+        self.assertFalse(timer)
+
+    def test_game_time_follows_the_clock(self):
+        game_time = GameTime()
+        for _ in range(60):
+            self.clock.advance(game_time.seconds_per_game_minute + 0.01)
+            game_time.update()
+        self.assertEqual(game_time.get_time(), (13, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,48 @@
 import pygame
 
 
+class SimulatedClock:
+    """
+    Clock that only advances when told to, so that the game can be simulated
+    faster than real time. While a SimulatedClock is in use (see use_clock),
+    all Timers and the in-game clock follow it instead of the real time.
+
+    Attributes:
+        ticks: Simulated time (in milliseconds)
+    """
+
+    ticks: float
+
+    def __init__(self, ticks: float = 0):
+        self.ticks = ticks
+
+    def advance(self, dt: float):
+        """:param dt: Simulated time (in seconds) that has passed"""
+        self.ticks += dt * 1000
+
+
+_clock: SimulatedClock | None = None
+
+
+def use_clock(clock: SimulatedClock | None):
+    """
+    :param clock: SimulatedClock that should be used from now on, or None to
+                  go back to the real time
+    """
+    global _clock
+    _clock = clock
+
+
+def get_ticks() -> float:
+    """
+    :return: Number of milliseconds since pygame.init() was called, or the
+             ticks of the SimulatedClock that is currently in use
+    """
+    if _clock is not None:
+        return _clock.ticks
+    return pygame.time.get_ticks()
+
+
 class Timer:
     def __init__(self, duration, repeat=False, autostart=False, func=None):
         self.duration = duration
@@ -19,7 +61,7 @@ class Timer:
     def activate(self):
         self.active = True
         self.finished = False
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = get_ticks()
 
     def deactivate(self):
         self.active = False
@@ -31,12 +73,12 @@ class Timer:
     def get_progress(self) -> float:
         """returns a value between 0 and 1 that shows the timers progress
         1 means duration finshed"""
-        curr = pygame.time.get_ticks()
+        curr = get_ticks()
         return (curr - self.start_time) / self.duration if self.active else 0
 
     def update(self):
         if self.active:
-            if pygame.time.get_ticks() - self.start_time >= self.duration:
+            if get_ticks() - self.start_time >= self.duration:
                 if self.func and self.start_time != 0:
                     self.func()
                 self.deactivate()